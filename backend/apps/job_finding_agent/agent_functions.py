@@ -142,7 +142,12 @@ def retrieve_jobs_from_ids(state: MultiJobEvaluationState):
     ids = state.get('job_ids', [])
     # Flatten the list of lists and remove duplicates.
     ids = list(set(item for sublist in ids for item in sublist))
-    
+
+    # Keep one posting per near-duplicate cluster, so each role is evaluated only once.
+    representatives = {}
+    for job_id, cluster_id in Job.objects.filter(id__in=ids).order_by('id').values_list('id', 'cluster_id'):
+        representatives.setdefault(cluster_id or job_id, job_id)
+    ids = list(representatives.values())
 
     jobs_qs = list(
         Job.objects.filter(id__in=ids).values_list(
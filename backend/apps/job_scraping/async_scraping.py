@@ -0,0 +1,613 @@
+import asyncio
+import logging
+import time
+import traceback
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from asgiref.sync import sync_to_async
+
+from config.settings import (
+    SCRAPER_MAX_CONCURRENCY_PER_HOST,
+    SCRAPER_REQUESTS_PER_SECOND,
+    SCRAPER_BURST,
+    SCRAPER_PAGE_WINDOW,
+    SCRAPER_STAGE_WORKERS,
+    SCRAPER_QUEUE_MAXSIZE,
+    SCRAPER_STATS_INTERVAL,
+    SCRAPER_PARSE_PROCESSES,
+    SCRAPER_REGION_IDS,
+)
+from .jobs_functions import (
+    build_search_url,
+    get_listing_page,
+    fetch_job_page,
+    JOB_NOT_MODIFIED,
+    insert_jobinfo_orm,
+    get_scraped_links_orm,
+    parse_job_id,
+)
+from .http_session import commit_cached
+from .job_writers import JobBulkWriter
+from .parse_pool import create_parse_pool, parse_and_clean
+from .run_state import ScrapeCheckpoint, start_sitemap_run, finish_sitemap_run
+from .seen_index import open_seen_index
+from .sitemap_discovery import discover_job_links
+from .watermark import PublicationWatermark
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter, for asyncio (`acquire`) or blocking (`wait`) callers.
+
+    Tokens are refilled continuously at `rate` tokens per second up to `capacity`.
+    Each request consumes one token; callers wait when the bucket is empty.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self):
+        """
+        Wait until a token is available and consume it.
+        """
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def wait(self):
+        """
+        Blocking version of `acquire`, for a single synchronous caller. Not to be mixed with
+        `acquire` on the same bucket.
+        """
+        self._refill()
+        if self._tokens < 1:
+            time.sleep((1 - self._tokens) / self.rate)
+            self._refill()
+        self._tokens -= 1
+
+class HostThrottle:
+    """
+    Per-host politeness controls: a concurrency cap and a token-bucket rate limit.
+
+    A semaphore and a bucket are created lazily for every host seen, so requests
+    against different hosts never wait on each other.
+    """
+    def __init__(self, max_concurrency=SCRAPER_MAX_CONCURRENCY_PER_HOST, requests_per_second=SCRAPER_REQUESTS_PER_SECOND, burst=SCRAPER_BURST):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._semaphores = {}
+        self._buckets = {}
+
+    @asynccontextmanager
+    async def slot(self, url):
+        """
+        Hold a request slot for the host of `url` for the duration of the block.
+        """
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+            self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+
+        async with self._semaphores[host]:
+            await self._buckets[host].acquire()
+            yield
+
+class StageStats:
+    """
+    Counters for one pipeline stage: items processed and failed, time spent working,
+    and the depth of the queue feeding the stage.
+    """
+    def __init__(self, name, workers, queue=None):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def record(self, seconds, ok=True):
+        self.busy_seconds += seconds
+        if ok:
+            self.processed += 1
+        else:
+            self.failed += 1
+
+    def sample_queue(self):
+        if self.queue is not None:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def summary(self, elapsed):
+        """
+        One-line summary: queue depth, throughput and utilisation (share of worker time spent busy).
+        """
+        depth = f"{self.queue.qsize()}/{self.queue.maxsize} (max {self.max_queue_depth})" if self.queue is not None else "-"
+        throughput = self.processed / elapsed if elapsed > 0 else 0.0
+        utilisation = self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0
+        return (
+            f"{self.name}: workers={self.workers} queue={depth} processed={self.processed} failed={self.failed} "
+            f"throughput={throughput:.2f}/s utilisation={utilisation:.0%}"
+        )
+
+class ScrapePipeline:
+    """
+    Staged scraping pipeline: discovery -> detail fetch -> parse/clean -> DB writer.
+
+    Stages are connected by bounded asyncio queues, so a slow stage applies backpressure
+    to the stages before it instead of letting work pile up in memory. Each stage has its
+    own worker count, and per-stage statistics are logged every `stats_interval` seconds
+    and at the end of the run, which shows which stage is the bottleneck.
+
+    Args:
+        throttle (HostThrottle): Politeness controls applied to every detail fetch.
+        workers (dict, optional): Worker count overrides per stage (`fetch`, `parse`, `write`).
+        queue_maxsize (int): Capacity of each queue between stages.
+        stats_interval (float): Seconds between statistics log lines.
+        writer (JobBulkWriter, optional): Batched writer used by the write stage.
+        checkpoint (ScrapeCheckpoint, optional): Run state updated with the outcome of every link.
+        seen (SeenJobLinks, optional): Seen-ID index the committed jobs are recorded in.
+        parse_processes (int): Worker processes for the parse stage. With 0, pages are parsed in
+                               threads, which the GIL limits to about one core.
+        region_ids (Collection[int], optional): Only store jobs of these regions (jobs without a
+                                                region are kept). By default every job is stored.
+        skipped (SeenIdIndex, optional): Index the IDs of the jobs dropped by `region_ids` are recorded in.
+    """
+    def __init__(
+        self,
+        throttle,
+        workers=None,
+        queue_maxsize=SCRAPER_QUEUE_MAXSIZE,
+        stats_interval=SCRAPER_STATS_INTERVAL,
+        writer=None,
+        checkpoint=None,
+        seen=None,
+        parse_processes=SCRAPER_PARSE_PROCESSES,
+        region_ids=None,
+        skipped=None,
+    ):
+        self.throttle = throttle
+        self.checkpoint = checkpoint
+        self.region_ids = set(region_ids) if region_ids is not None else None
+        self.skipped = skipped
+        # With a checkpoint, links are marked done only once their job is committed.
+        self.writer = writer or JobBulkWriter(on_flush=[
+            checkpoint.mark_jobs_done if checkpoint else None,
+            seen.record if seen else None,
+            commit_cached,
+        ])
+        self.workers = dict(SCRAPER_STAGE_WORKERS, **(workers or {}))
+        self.parse_processes = parse_processes
+        self._parse_pool = None
+        if parse_processes:
+            # One parse task in flight per process keeps the whole pool busy.
+            self.workers["parse"] = max(self.workers["parse"], parse_processes)
+        self.stats_interval = stats_interval
+
+        self.fetch_queue = asyncio.Queue(maxsize=queue_maxsize)
+        self.parse_queue = asyncio.Queue(maxsize=queue_maxsize)
+        self.write_queue = asyncio.Queue(maxsize=queue_maxsize)
+
+        self.stats = {
+            "discover": StageStats("discover", 1),
+            "fetch": StageStats("fetch", self.workers["fetch"], self.fetch_queue),
+            "parse": StageStats("parse", self.workers["parse"], self.parse_queue),
+            "write": StageStats("write", self.workers["write"], self.write_queue),
+        }
+        self._start_time = None
+
+    def log_stats(self, final=False):
+        elapsed = time.monotonic() - self._start_time
+        prefix = "Final" if final else "Progress"
+        for stage in self.stats.values():
+            logging.info(f"[SCRAPE_PIPELINE] {prefix} after {elapsed:.1f}s - {stage.summary(elapsed)}")
+
+    async def _monitor(self):
+        next_log = time.monotonic() + self.stats_interval
+        while True:
+            await asyncio.sleep(0.5)
+            for stage in self.stats.values():
+                stage.sample_queue()
+            if time.monotonic() >= next_log:
+                self.log_stats()
+                next_log += self.stats_interval
+
+    async def _mark_done(self, link):
+        if self.checkpoint:
+            await sync_to_async(self.checkpoint.mark_done)([link])
+
+    async def _mark_failed(self, link, error):
+        if self.checkpoint:
+            await sync_to_async(self.checkpoint.mark_failed)(link, error)
+
+    async def _drop_out_of_region(self, clean_info):
+        """
+        Remove the jobs outside `region_ids` from `clean_info`, recording their IDs in `skipped`.
+        """
+        if self.region_ids is None:
+            return clean_info
+        kept, dropped = [], []
+        for job in clean_info:
+            (kept if job.get("regionID") is None or job["regionID"] in self.region_ids else dropped).append(job)
+        if dropped:
+            logging.debug(f"[SCRAPE_PIPELINE] Skipping {len(dropped)} job(s) outside the scraped regions.")
+            if self.skipped is not None:
+                await asyncio.to_thread(self.skipped.record, [job["id"] for job in dropped])
+        return kept
+
+    async def _discover(self, links):
+        async for link in links:
+            self.stats["discover"].record(0.0)
+            await self.fetch_queue.put(link)
+
+    async def _fetch_worker(self):
+        while True:
+            link = await self.fetch_queue.get()
+            start = time.monotonic()
+            ok = False
+            try:
+                async with self.throttle.slot(link):
+                    content = await asyncio.to_thread(fetch_job_page, link)
+                if content == JOB_NOT_MODIFIED:
+                    await self._mark_done(link)
+                    ok = True
+                elif content:
+                    await self.parse_queue.put((link, content))
+                    ok = True
+                else:
+                    await self._mark_failed(link, "Failed to fetch the job page")
+            except Exception as e:
+                logging.error(f"[SCRAPE_PIPELINE] Error fetching job link {link}: {e}")
+                logging.debug(traceback.format_exc())
+                await self._mark_failed(link, e)
+            finally:
+                self.stats["fetch"].record(time.monotonic() - start, ok)
+                self.fetch_queue.task_done()
+
+    async def _parse_worker(self):
+        while True:
+            link, content = await self.parse_queue.get()
+            start = time.monotonic()
+            ok = False
+            try:
+                if self._parse_pool is not None:
+                    clean_info = await asyncio.get_running_loop().run_in_executor(self._parse_pool, parse_and_clean, content, link)
+                else:
+                    clean_info = await asyncio.to_thread(parse_and_clean, content, link)
+                if clean_info:
+                    clean_info = await self._drop_out_of_region(clean_info)
+                    if clean_info:
+                        await self.write_queue.put((link, clean_info))
+                    else:
+                        await self._mark_done(link)
+                    ok = True
+                else:
+                    logging.warning(f"[SCRAPE_PIPELINE] No job info found for {link}. Skipping.")
+                    await self._mark_failed(link, "No job info found")
+            except Exception as e:
+                logging.error(f"[SCRAPE_PIPELINE] Error parsing job link {link}: {e}")
+                logging.debug(traceback.format_exc())
+                await self._mark_failed(link, e)
+            finally:
+                self.stats["parse"].record(time.monotonic() - start, ok)
+                self.parse_queue.task_done()
+
+    async def _write_worker(self):
+        # The pending get is kept across wake-ups rather than cancelled on timeout: a get cancelled
+        # just as it takes an item loses that item, and its missing task_done hangs `join`.
+        get = None
+        try:
+            while True:
+                if get is None:
+                    get = asyncio.ensure_future(self.write_queue.get())
+                # Wake up at least once per flush interval so a partial batch is not held back when input slows down.
+                done, _ = await asyncio.wait({get}, timeout=self.writer.flush_interval)
+                if not done:
+                    if self.writer.flush_due():
+                        await sync_to_async(self.writer.flush)()
+                    continue
+                link, clean_info = get.result()
+                get = None
+
+                start = time.monotonic()
+                ok = False
+                try:
+                    # Database writes go through Django's thread-sensitive executor so they are serialized on one connection.
+                    await sync_to_async(insert_jobinfo_orm)(clean_info, self.writer)
+                    ok = True
+                    logging.info(f"[SCRAPE_PIPELINE] Successfully processed job from {link}.")
+                except Exception as e:
+                    logging.error(f"[SCRAPE_PIPELINE] Error storing job link {link}: {e}")
+                    logging.debug(traceback.format_exc())
+                    await self._mark_failed(link, e)
+                finally:
+                    self.stats["write"].record(time.monotonic() - start, ok)
+                    self.write_queue.task_done()
+        finally:
+            if get is not None:
+                get.cancel()
+
+    async def run(self, links):
+        """
+        Run every stage until `links` is exhausted and all queues are drained.
+
+        Args:
+            links (AsyncIterator[str]): Job detail links produced by the discovery stage.
+
+        Returns:
+            int: The number of jobs written.
+        """
+        self._start_time = time.monotonic()
+        if self.parse_processes:
+            self._parse_pool = create_parse_pool(self.parse_processes)
+            logging.info(f"[SCRAPE_PIPELINE] Parsing in {self.parse_processes} worker processes.")
+        tasks = [asyncio.create_task(self._monitor())]
+        for name, worker in (("fetch", self._fetch_worker), ("parse", self._parse_worker), ("write", self._write_worker)):
+            tasks.extend(asyncio.create_task(worker()) for _ in range(self.workers[name]))
+
+        try:
+            await self._discover(links)
+            # Queues are drained in stage order, so each join only returns once upstream work is done.
+            await self.fetch_queue.join()
+            await self.parse_queue.join()
+            await self.write_queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=True, cancel_futures=True)
+                self._parse_pool = None
+            await sync_to_async(self.writer.flush)()
+            self.log_stats(final=True)
+
+        return self.stats["write"].processed
+
+async def _fetch_links(throttle, page_number, published_since):
+    async with throttle.slot(build_search_url(page_number, published_since)):
+        return await asyncio.to_thread(get_listing_page, page_number, published_since)
+
+async def paginated_links(
+    throttle,
+    max_pages,
+    published_since,
+    page_window=SCRAPER_PAGE_WINDOW,
+    checkpoint=None,
+    scraped_links=None,
+    watermark=None,
+):
+    """
+    Discovery stage for the paginated search: yield new job links, `page_window` result pages at a time.
+
+    Discovery stops at the first page that is empty or only contains already-scraped
+    links, exactly like the sequential version. With a checkpoint, the links left over by
+    an interrupted run are yielded first, discovery resumes after the last recorded page,
+    and every page's new links are recorded before they are yielded; a page that cannot be
+    fetched stops discovery and interrupts the checkpoint, so the run is resumed from it.
+    With a watermark, discovery also stops at the first page whose postings are all older
+    than it. Full sweeps walk every page of the window, but still stop at a page that only
+    repeats links listed earlier in the run, and also yield the links of stored jobs so
+    edited postings are refetched.
+    """
+    if scraped_links is None:
+        scraped_links = await sync_to_async(get_scraped_links_orm)()
+    first_page = 1
+    listed_links = set()
+
+    if checkpoint:
+        first_page = checkpoint.start_page
+        for link in await sync_to_async(checkpoint.resumable_links)():
+            scraped_links.add(link)
+            yield link
+
+    for window_start in range(first_page, max_pages + 1, page_window):
+        page_numbers = list(range(window_start, min(window_start + page_window, max_pages + 1)))
+        logging.info(f"[SCRAPE_AND_STORE_JOBS_ASYNC] Scraping pages {page_numbers[0]} to {page_numbers[-1]}...")
+
+        pages = await asyncio.gather(
+            *(_fetch_links(throttle, page_number, published_since) for page_number in page_numbers)
+        )
+
+        # Keep the pages up to the first exhausted one, preserving the sequential stop condition.
+        for page_number, page in zip(page_numbers, pages):
+            if page is None:
+                logging.error(f"[SCRAPE_AND_STORE_JOBS_ASYNC] Page {page_number} could not be fetched. Stopping discovery.")
+                if checkpoint:
+                    await sync_to_async(checkpoint.interrupt)(f"page {page_number} could not be fetched")
+                return
+            job_links, publication_dates = page
+            full_sweep = watermark is not None and watermark.full_sweep
+            if not job_links or (scraped_links.issuperset(job_links) and not full_sweep):
+                logging.info(f"[SCRAPE_AND_STORE_JOBS_ASYNC] No new links found on page {page_number}. Stopping discovery.")
+                return
+            if watermark and watermark.page_exhausted(publication_dates):
+                logging.info(f"[SCRAPE_AND_STORE_JOBS_ASYNC] Postings on page {page_number} are older than the watermark. Stopping discovery.")
+                return
+            if listed_links.issuperset(job_links):
+                logging.info(f"[SCRAPE_AND_STORE_JOBS_ASYNC] Page {page_number} only repeats links listed earlier. Stopping discovery.")
+                return
+            page_links = [link for link in dict.fromkeys(job_links) if link not in listed_links]
+            listed_links.update(page_links)
+            # Full sweeps also refetch stored jobs, so edited postings are updated.
+            new_links = page_links if full_sweep else [link for link in page_links if link not in scraped_links]
+            if checkpoint:
+                await sync_to_async(checkpoint.record_page)(page_number, new_links, [parse_job_id(link) for link in new_links])
+            for link in new_links:
+                scraped_links.add(link)
+                yield link
+
+async def sitemap_links(changed_since=None, scraped_links=None, skipped=None, errors=None):
+    """
+    Discovery stage for the sitemap mode: yield links for new (or changed) jobs listed in the sitemaps.
+    The arguments are those of `discover_job_links`.
+    """
+    if scraped_links is None:
+        scraped_links = await sync_to_async(get_scraped_links_orm)()
+    logging.info(f"[SCRAPE_SITEMAP_JOBS_ASYNC] Loaded {len(scraped_links)} known job IDs.")
+
+    # The sitemap stream is blocking, so every step of the generator runs in a worker thread.
+    iterator = discover_job_links(scraped_links.index, changed_since, skipped_ids=skipped, errors=errors)
+    while True:
+        link = await asyncio.to_thread(next, iterator, None)
+        if link is None:
+            return
+        yield link
+
+async def scrape_and_store_jobs_orm_async(
+    max_pages=100,
+    published_since=3,
+    max_concurrency_per_host=SCRAPER_MAX_CONCURRENCY_PER_HOST,
+    requests_per_second=SCRAPER_REQUESTS_PER_SECOND,
+    burst=SCRAPER_BURST,
+    page_window=SCRAPER_PAGE_WINDOW,
+    workers=None,
+    resume=True,
+    parse_processes=SCRAPER_PARSE_PROCESSES,
+):
+    """
+    Asyncio version of `scrape_and_store_jobs_orm`, built on `ScrapePipeline`.
+
+    Result pages are fetched `page_window` at a time and the detail pages they link
+    to are fetched concurrently. Instead of sleeping a fixed 5 s per page, every
+    request goes through a per-host concurrency cap and token bucket, which bounds
+    the request rate seen by Jobup while keeping all slots busy.
+
+    Args:
+        max_pages (int): Maximum number of pages to scrape.
+        published_since (int): The number of days since publication to filter job postings.
+        max_concurrency_per_host (int): Maximum simultaneous requests per host.
+        requests_per_second (float): Sustained request rate allowed per host.
+        burst (int): Number of requests that may be issued back to back.
+        page_window (int): Number of result pages fetched concurrently.
+        workers (dict, optional): Worker count overrides per pipeline stage.
+        resume (bool): Resume an interrupted run instead of starting over from page 1.
+        parse_processes (int): Worker processes for the parse stage (0 parses in threads).
+
+    Returns:
+        int: The number of jobs inserted or updated.
+    """
+    logging.info(
+        f"[SCRAPE_AND_STORE_JOBS_ASYNC] Starting concurrent job scraping: max_concurrency_per_host={max_concurrency_per_host}, "
+        f"requests_per_second={requests_per_second}, burst={burst}, page_window={page_window}."
+    )
+    start_time = time.monotonic()
+
+    throttle = HostThrottle(max_concurrency_per_host, requests_per_second, burst)
+    checkpoint = await sync_to_async(ScrapeCheckpoint.start)("concurrent", max_pages, published_since, resume)
+    watermark = await sync_to_async(PublicationWatermark.load)(build_search_url(1, published_since))
+    scraped_links = await sync_to_async(get_scraped_links_orm)()
+    writer = JobBulkWriter(on_flush=[checkpoint.mark_jobs_done, scraped_links.record, watermark.observe_jobs, commit_cached])
+    pipeline = ScrapePipeline(throttle, workers=workers, writer=writer, checkpoint=checkpoint, parse_processes=parse_processes)
+    inserted_jobs_counter = await pipeline.run(
+        paginated_links(throttle, max_pages, published_since, page_window, checkpoint, scraped_links, watermark)
+    )
+    # An interrupted run stays open, to be resumed, and does not move the watermark.
+    if not checkpoint.interrupted:
+        await sync_to_async(checkpoint.finish)()
+        await sync_to_async(watermark.commit)()
+    scraped_links.close()
+
+    elapsed_time = time.monotonic() - start_time
+    logging.info(
+        f"[SCRAPE_AND_STORE_JOBS_ASYNC] Job scraping process completed. Inserted {inserted_jobs_counter} jobs "
+        f"in {elapsed_time:.2f} seconds."
+    )
+    return inserted_jobs_counter
+
+async def scrape_sitemap_jobs_orm_async(
+    changed_since=None,
+    max_concurrency_per_host=SCRAPER_MAX_CONCURRENCY_PER_HOST,
+    requests_per_second=SCRAPER_REQUESTS_PER_SECOND,
+    burst=SCRAPER_BURST,
+    workers=None,
+    parse_processes=SCRAPER_PARSE_PROCESSES,
+):
+    """
+    Discover jobs from the Jobup sitemaps instead of paginating the search results, and
+    fetch only the new or modified postings through `ScrapePipeline`.
+
+    Known jobs are refetched when their sitemap lastmod is newer than the start of the last
+    completed sitemap run; a run during which a sitemap failed is not completed. The sitemaps
+    list every region, so the jobs outside `SCRAPER_REGION_IDS` are dropped after parsing and
+    remembered in the `sitemap_skipped` seen-ID index, so that they are only fetched again
+    when their lastmod changes.
+
+    Args:
+        changed_since (datetime, optional): Refetch known jobs whose sitemap lastmod is newer than
+                                            this instead. The run is still recorded.
+        max_concurrency_per_host (int): Maximum simultaneous requests per host.
+        requests_per_second (float): Sustained request rate allowed per host.
+        burst (int): Number of requests that may be issued back to back.
+        workers (dict, optional): Worker count overrides per pipeline stage.
+        parse_processes (int): Worker processes for the parse stage (0 parses in threads).
+
+    Returns:
+        int: The number of jobs inserted or updated.
+    """
+    logging.info("[SCRAPE_SITEMAP_JOBS_ASYNC] Starting sitemap-driven job scraping.")
+    start_time = time.monotonic()
+
+    run, last_run_started_at = await sync_to_async(start_sitemap_run)()
+    changed_since = changed_since or last_run_started_at
+    throttle = HostThrottle(max_concurrency_per_host, requests_per_second, burst)
+    scraped_links = await sync_to_async(get_scraped_links_orm)()
+    skipped = open_seen_index("sitemap_skipped")
+    pipeline = ScrapePipeline(
+        throttle,
+        workers=workers,
+        seen=scraped_links,
+        parse_processes=parse_processes,
+        region_ids=SCRAPER_REGION_IDS,
+        skipped=skipped,
+    )
+    errors = []
+    inserted_jobs_counter = await pipeline.run(sitemap_links(changed_since, scraped_links, skipped, errors))
+    await sync_to_async(finish_sitemap_run)(run, complete=not errors)
+    scraped_links.close()
+    skipped.close()
+
+    elapsed_time = time.monotonic() - start_time
+    logging.info(
+        f"[SCRAPE_SITEMAP_JOBS_ASYNC] Sitemap scraping completed. Inserted {inserted_jobs_counter} of "
+        f"{pipeline.stats['discover'].processed} discovered jobs in {elapsed_time:.2f} seconds."
+    )
+    return inserted_jobs_counter
+
+def scrape_sitemap_jobs_orm(changed_since=None, **kwargs):
+    """
+    Synchronous entry point for `scrape_sitemap_jobs_orm_async`, for use from management commands.
+
+    Args:
+        changed_since (datetime, optional): Refetch known jobs whose sitemap lastmod is newer than this,
+                                            instead of the start of the last completed sitemap run.
+        **kwargs: Throttling options forwarded to `scrape_sitemap_jobs_orm_async`.
+
+    Returns:
+        int: The number of jobs inserted or updated.
+    """
+    return asyncio.run(scrape_sitemap_jobs_orm_async(changed_since=changed_since, **kwargs))
+
+def scrape_and_store_jobs_orm_concurrent(max_pages=100, published_since=3, **kwargs):
+    """
+    Synchronous entry point for `scrape_and_store_jobs_orm_async`, for use from management commands.
+
+    Args:
+        max_pages (int): Maximum number of pages to scrape.
+        published_since (int): The number of days since publication to filter job postings.
+        **kwargs: Throttling options forwarded to `scrape_and_store_jobs_orm_async`.
+
+    Returns:
+        int: The number of jobs inserted or updated.
+    """
+    return asyncio.run(scrape_and_store_jobs_orm_async(max_pages=max_pages, published_since=published_since, **kwargs))
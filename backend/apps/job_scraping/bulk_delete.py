@@ -0,0 +1,100 @@
+import logging
+from collections import Counter
+
+from django.db import models, router, transaction
+from django.db.models import signals
+
+from config.settings import DELETE_CHUNK_SIZE
+
+def chunked(values, size=DELETE_CHUNK_SIZE):
+    """
+    Split `values` into lists of at most `size` items, e.g. to keep the `__in` lookups of a
+    large batch below SQLite's bound-variable limit.
+    """
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _has_delete_listeners(model):
+    return signals.pre_delete.has_listeners(model) or signals.post_delete.has_listeners(model)
+
+def _delete_rows(queryset, counts, chunk_size):
+    """
+    Delete the rows of `queryset` and, first, the rows referencing them.
+
+    Rows of models without reverse relations are removed with a single DELETE; the rows of
+    other models are deleted by primary key, `chunk_size` at a time, after their own
+    referencing rows. Reverse relations are handled as Django's collector would:
+    `CASCADE` deletes, `SET_NULL` clears the foreign key and `DO_NOTHING` is left to the
+    database. Anything else (`PROTECT`, `RESTRICT`, `SET_DEFAULT`, `SET`, many-to-many
+    relations, multi-table inheritance or delete signal receivers) goes through Django's
+    collector.
+    """
+    model = queryset.model
+    relations = [relation for relation in model._meta.related_objects if relation.on_delete is not models.DO_NOTHING]
+    unsupported = [
+        relation for relation in relations
+        if relation.on_delete not in (models.CASCADE, models.SET_NULL)
+        or relation.many_to_many
+        or relation.field.target_field != model._meta.pk
+    ]
+
+    if unsupported or model._meta.parents or _has_delete_listeners(model):
+        deleted, per_model = queryset.delete()
+        counts.update(per_model)
+        return
+
+    if not relations:
+        counts[model._meta.label] += queryset._raw_delete(queryset.db)
+        return
+
+    for pks in chunked(queryset.values_list("pk", flat=True), chunk_size):
+        for relation in relations:
+            related = relation.related_model._base_manager.using(queryset.db).filter(**{f"{relation.field.name}__in": pks})
+            if relation.on_delete is models.SET_NULL:
+                related.update(**{relation.field.name: None})
+            else:
+                _delete_rows(related, counts, chunk_size)
+        counts[model._meta.label] += model._base_manager.using(queryset.db).filter(pk__in=pks)._raw_delete(queryset.db)
+
+def bulk_delete(model, pks, chunk_size=DELETE_CHUNK_SIZE):
+    """
+    Delete the `model` rows with the given primary keys, `chunk_size` at a time.
+
+    Every chunk is deleted in its own short transaction, so a large deletion never binds
+    more variables than SQLite allows in one statement and never holds the write lock for
+    long. Rows referencing the deleted ones (e.g. the `UserJobFitEvaluation` of a `Job`)
+    are deleted or updated with one statement per relation and chunk, instead of being
+    loaded and deleted one by one by Django's collector.
+
+    Args:
+        model (type): The model class.
+        pks (iterable): Primary keys of the rows to delete.
+        chunk_size (int): Rows deleted per transaction.
+
+    Returns:
+        tuple: The total number of rows deleted and a dict with the count per model, like `QuerySet.delete()`.
+    """
+    db = router.db_for_write(model)
+    counts = Counter()
+    for chunk in chunked(dict.fromkeys(pks), chunk_size):
+        with transaction.atomic(using=db):
+            _delete_rows(model._base_manager.using(db).filter(pk__in=chunk), counts, chunk_size)
+    counts = {label: count for label, count in counts.items() if count}
+    logging.info(f"[BULK_DELETE] Deleted {counts.get(model._meta.label, 0)} {model.__name__} rows ({sum(counts.values())} in total).")
+    return sum(counts.values()), counts
+
+def delete_sqlite_rows(conn, table, column, values, chunk_size=DELETE_CHUNK_SIZE):
+    """
+    Delete the rows of `table` whose `column` is in `values`, `chunk_size` values per statement
+    and transaction, with a raw sqlite3 connection.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    deleted = 0
+    for chunk in chunked(values, chunk_size):
+        with conn:
+            cursor = conn.execute(f"DELETE FROM {table} WHERE {column} IN ({','.join('?' * len(chunk))})", chunk)
+            deleted += cursor.rowcount
+    return deleted
@@ -1,15 +1,21 @@
 import sqlite3
 import requests
 import logging
+from datetime import date
 from urllib.parse import urlparse
 
-from config.settings import DATABASES
+from config.settings import DATABASES, JOBUP_BASE_URL, CHROMA_DELETE_BATCH_SIZE, CLEAN_EXPIRED_JOBS_FIRST
 from backend.settings import JOB_ADS_EMBEDDINGS_PATH
 
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
 
 from .models import Job
+from .bulk_delete import bulk_delete, delete_sqlite_rows
+from .http_session import get_session, invalidate_cached
+from .link_checker import validate_job_links
+from .link_schedule import jobs_due_for_check, record_link_checks
+from .seen_index import forget_seen_ids
 
 def get_ids_to_delete(sqlite_path=DATABASES['jobs']):
     """
@@ -62,6 +68,8 @@ def get_ids_to_delete(sqlite_path=DATABASES['jobs']):
     start_time = time.time()
     logging.info("[GET_IDS_TO_DELETE] Starting links check.")    
     
+    session = get_session("link_checker")
+
     conn = sqlite3.connect(sqlite_path)
     cursor = conn.cursor()
 
@@ -79,9 +87,9 @@ def get_ids_to_delete(sqlite_path=DATABASES['jobs']):
                 logging.warning(f"[GET_IDS_TO_DELETE] Invalid URL detected: ID={job_id}, URL='{link}'")
                 
                 # Try the fallback Jobup URL
-                jobup_link = f"https://www.jobup.ch/en/jobs/detail/{job_id}/?source=vacancy_search"
+                jobup_link = f"{JOBUP_BASE_URL}/en/jobs/detail/{job_id}/?source=vacancy_search"
                 try:
-                    response = requests.head(jobup_link, timeout=10)
+                    response = session.head(jobup_link, timeout=10)
                     if response.status_code < 400:
                         logging.info(f"[GET_IDS_TO_DELETE] Fallback link is valid: ID={job_id}, URL={jobup_link}")
                         continue  # Skip to the next job since the fallback worked
@@ -95,7 +103,7 @@ def get_ids_to_delete(sqlite_path=DATABASES['jobs']):
 
             # Check the original link with a HEAD request
             try:
-                response = requests.head(link, timeout=10)
+                response = session.head(link, timeout=10)
                 if response.status_code < 400:
                     logging.info(f"[GET_IDS_TO_DELETE] Link is valid: ID={job_id}, URL={link}")
                 else:
@@ -106,7 +114,7 @@ def get_ids_to_delete(sqlite_path=DATABASES['jobs']):
                 logging.warning(f"[GET_IDS_TO_DELETE] SSL error for URL: {link}, attempting with verify=False. Error: {ssl_error}")
                 try:
                     # Retry with SSL verification disabled
-                    response = requests.head(link, timeout=10, verify=False)
+                    response = session.head(link, timeout=10, verify=False)
                     if response.status_code < 400:
                         logging.info(f"[GET_IDS_TO_DELETE] Link is valid with verify=False: ID={job_id}, URL={link}")
                     else:
@@ -154,23 +162,59 @@ def clean_sqlite_database(sqlite_path=DATABASES['jobs'], ids_to_delete=[]):
         return
     
     conn = sqlite3.connect(DATABASES['jobs'])
-    cursor = conn.cursor()
 
     try:
-        placeholders = ','.join(['?'] * len(ids_to_delete))
-        query = f"DELETE FROM jobs WHERE id IN ({placeholders})"
-        cursor.execute(query, ids_to_delete)
-        conn.commit()
-        logging.info(f"[CLEAN_SQLITE_DATABASE] Deleted {cursor.rowcount} rows from the table.")
+        # Chunked, so that neither SQLite's bound-variable limit nor a long write lock is hit.
+        deleted_count = delete_sqlite_rows(conn, "jobs", "id", ids_to_delete)
+        invalidate_cached(ids_to_delete)
+        forget_seen_ids("jobs_sqlite", ids_to_delete)
+        logging.info(f"[CLEAN_SQLITE_DATABASE] Deleted {deleted_count} rows from the table.")
     except sqlite3.Error as e:
         logging.error(f"[CLEAN_SQLITE_DATABASE] An error occurred while deleting rows: {e}")
     finally:
         conn.close()
         logging.info("[CLEAN_SQLITE_DATABASE] Database cleanup complete.")
 
+def delete_chroma_ids(vector_store, ids_to_delete, batch_size=CHROMA_DELETE_BATCH_SIZE, log_prefix="[DELETE_CHROMA_IDS]"):
+    """
+    Delete entries from a Chroma vector store in batches of `batch_size` IDs, one delete call per batch.
+
+    When a batch fails, it is split in halves that are retried separately, so a bad ID
+    only costs the deletion of itself and the remaining IDs are still deleted.
+
+    Args:
+        vector_store (Chroma): The vector store to delete from.
+        ids_to_delete (list): The IDs to delete.
+        batch_size (int): Maximum IDs per delete call.
+        log_prefix (str): Prefix of the log lines.
+
+    Returns:
+        list: The IDs that could not be deleted.
+    """
+    failed = []
+
+    def delete_batch(batch):
+        try:
+            vector_store.delete(ids=batch)
+            logging.debug(f"{log_prefix} Deleted {len(batch)} entries from Chroma.")
+        except Exception as e:
+            if len(batch) == 1:
+                logging.error(f"{log_prefix} Error deleting Chroma ID: {batch[0]}, Error: {e}")
+                failed.append(batch[0])
+                return
+            logging.warning(f"{log_prefix} Deleting a batch of {len(batch)} Chroma IDs failed, splitting it: {e}")
+            middle = len(batch) // 2
+            delete_batch(batch[:middle])
+            delete_batch(batch[middle:])
+
+    ids_to_delete = list(ids_to_delete)
+    for start in range(0, len(ids_to_delete), batch_size):
+        delete_batch(ids_to_delete[start:start + batch_size])
+    return failed
+
 def clean_chroma_database(chroma_path=DATABASES['job_ads_embeddings'], ids_to_delete = []):
     """
-    Deletes vector store entries one by one, logging success and failure.
+    Deletes vector store entries in batches (see `delete_chroma_ids`), logging failures.
 
     Parameters:
     ----------
@@ -197,14 +241,9 @@ def clean_chroma_database(chroma_path=DATABASES['job_ads_embeddings'], ids_to_de
         persist_directory=chroma_path,
     )
 
-    for id in ids_to_delete:
-        try:
-            vector_store.delete(id)
-            logging.info(f"[CLEAN_CHROMA_DATABASE] Deleted Chroma ID: {id}")
-        except Exception as e:
-            logging.error(f"[CLEAN_CHROMA_DATABASE] Error deleting Chroma ID: {id}, Error: {e}")
-    
-    logging.info(f'[CLEAN_CHROMA_DATABASE] Deleted {len(ids_to_delete)} entries from the Chroma database.')
+    failed = delete_chroma_ids(vector_store, ids_to_delete, log_prefix="[CLEAN_CHROMA_DATABASE]")
+
+    logging.info(f'[CLEAN_CHROMA_DATABASE] Deleted {len(ids_to_delete) - len(failed)} entries from the Chroma database, {len(failed)} failed.')
     logging.info(f"[CLEAN_CHROMA_DATABASE] Chroma database cleanup complete.")
 
 def clean_databases(sqlite_path=DATABASES['jobs'], chroma_path=DATABASES['job_ads_embeddings']):
@@ -268,7 +307,30 @@ def clean_databases(sqlite_path=DATABASES['jobs'], chroma_path=DATABASES['job_ad
 
     logging.info(f"[CLEAN_DATABASES] SQLITE and CHROMA Database cleanup complete.")
 
-def get_ids_to_delete_orm():
+def get_expired_ids_orm(today=None):
+    """
+    Identify jobs that expired according to their own data, without any network request:
+    jobs whose `publicationEndDate` is before today.
+
+    `publicationEndDate` holds ISO 8601 strings, so a plain string comparison against
+    today's date, served by the column's index, selects the end dates of earlier days
+    (whatever their time and UTC offset) and keeps the jobs ending today. Empty end dates
+    are not considered expired.
+
+    `isActive` alone does not retire a job: a page that does not carry the flag is stored
+    as inactive, so inactive jobs that have not ended are left to the link checks.
+
+    Args:
+        today (date, optional): Defaults to the current date.
+
+    Returns:
+        list: The IDs of the expired jobs.
+    """
+    cutoff = (today or date.today()).isoformat()
+    expired = Job.objects.filter(publicationEndDate__gt="", publicationEndDate__lt=cutoff).values_list("id", flat=True)
+    return list(expired)
+
+def get_ids_to_delete_orm(check_all=False, expired_first=CLEAN_EXPIRED_JOBS_FIRST):
     """
     Identify job IDs with invalid or unreachable URLs using Django ORM.
 
@@ -278,6 +340,18 @@ def get_ids_to_delete_orm():
     If both the original and fallback URLs are invalid or unreachable, the job ID
     is marked for deletion.
 
+    The links are checked concurrently, with global and per-host concurrency limits
+    (see `validate_job_links_async`). Check results are stored per job and only the links
+    due for revalidation are checked (see `jobs_due_for_check` and `revalidation_ttl`).
+
+    With `expired_first`, jobs that expired according to their own data (see
+    `get_expired_ids_orm`) are retired first with a single query, and only the other jobs
+    go on to the link checks.
+
+    Args:
+        check_all (bool): Check every job's link, ignoring the stored results.
+        expired_first (bool): Retire jobs past their end date without checking their link.
+
     Returns:
         list: A list of job IDs corresponding to invalid or unreachable URLs.
     """
@@ -285,48 +359,18 @@ def get_ids_to_delete_orm():
     start_time = time.time()
     logging.info("[GET_IDS_TO_DELETE_ORM] Starting URL validation using Django ORM.")
 
-    ids_to_delete = []
-    # Retrieve job id and externalUrl using Django ORM.
-    jobs = Job.objects.values_list("id", "externalUrl")
-    
-    for job_id, link in jobs:
-        try:
-            # If link is missing or doesn't have a valid scheme, try the fallback URL.
-            if not link or not urlparse(link).scheme:
-                logging.warning(f"[GET_IDS_TO_DELETE_ORM] Invalid URL for job ID: {job_id}, URL: {link}")
-                fallback = f"https://www.jobup.ch/en/jobs/detail/{job_id}/?source=vacancy_search"
-                try:
-                    response = requests.head(fallback, timeout=10)
-                    if response.status_code < 400:
-                        # Fallback URL is valid, so skip deletion.
-                        logging.info(f"[GET_IDS_TO_DELETE_ORM] Fallback URL is valid: ID={job_id}, URL={fallback}")
-                        continue
-                    else:
-                        ids_to_delete.append(job_id)
-                except requests.RequestException as e:
-                    logging.error(f"[GET_IDS_TO_DELETE_ORM] Error checking fallback URL: ID={job_id}, URL={fallback}, Error={e}")
-                    ids_to_delete.append(job_id)
-                continue  # Move on to the next job
+    expired_ids = get_expired_ids_orm() if expired_first else []
+    if expired_first:
+        logging.info(f"[GET_IDS_TO_DELETE_ORM] {len(expired_ids)} jobs are past their end date.")
+
+    # Retrieve the id and externalUrl of the jobs due for a check using Django ORM.
+    expired = set(expired_ids)
+    jobs = [job for job in jobs_due_for_check(check_all=check_all) if job[0] not in expired]
+    logging.info(f"[GET_IDS_TO_DELETE_ORM] {len(jobs)} of {Job.objects.count()} job links are due for a check.")
+    ids_to_delete = expired_ids + record_link_checks(jobs, validate_job_links(jobs))
 
-            # Validate the provided URL.
-            response = requests.head(link, timeout=10)
-            if response.status_code >= 400:
-                ids_to_delete.append(job_id)
-        except requests.exceptions.SSLError:
-            try:
-                # Retry with SSL verification disabled.
-                response = requests.head(link, timeout=10, verify=False)
-                if response.status_code >= 400:
-                    ids_to_delete.append(job_id)
-            except requests.RequestException as e:
-                logging.error(f"[GET_IDS_TO_DELETE_ORM] Error checking URL with verify=False: ID={job_id}, URL={link}, Error={e}")
-                ids_to_delete.append(job_id)
-        except requests.RequestException as e:
-            logging.error(f"[GET_IDS_TO_DELETE_ORM] Error checking URL: ID={job_id}, URL={link}, Error={e}")
-            ids_to_delete.append(job_id)
-    
     elapsed_time = time.time() - start_time
-    logging.info(f"[GET_IDS_TO_DELETE_ORM] Found {len(ids_to_delete)} jobs with invalid URLs out of {len(jobs)}.")
+    logging.info(f"[GET_IDS_TO_DELETE_ORM] Found {len(ids_to_delete)} jobs with invalid URLs out of {len(jobs)} checked.")
     logging.info(f"[GET_IDS_TO_DELETE_ORM] Ending links check. Duration: {elapsed_time:.2f} seconds.")
     return ids_to_delete
 
@@ -353,16 +397,11 @@ def clean_chroma_database_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH, ids_to_dele
         persist_directory=chroma_path,
     )
 
-    for job_id in ids_to_delete:
-        try:
-            vector_store.delete(job_id)
-            logging.info(f"[CLEAN_CHROMA_DATABASE_ORM] Deleted document with ID: {job_id} from Chroma.")
-        except Exception as e:
-            logging.error(f"[CLEAN_CHROMA_DATABASE_ORM] Error deleting document {job_id} from Chroma: {e}")
-    
-    logging.info(f"[CLEAN_CHROMA_DATABASE_ORM] Completed cleaning Chroma with {len(ids_to_delete)} deletions.")
+    failed = delete_chroma_ids(vector_store, ids_to_delete, log_prefix="[CLEAN_CHROMA_DATABASE_ORM]")
+
+    logging.info(f"[CLEAN_CHROMA_DATABASE_ORM] Completed cleaning Chroma with {len(ids_to_delete) - len(failed)} deletions, {len(failed)} failed.")
 
-def clean_databases_orm(chroma_path):
+def clean_databases_orm(chroma_path, check_all_links=False):
     """
     Clean up both the Job database (using Django ORM) and the Chroma vector store
     by removing job postings with invalid or unreachable URLs.
@@ -374,6 +413,7 @@ def clean_databases_orm(chroma_path):
 
     Args:
         chroma_path (str): The persistent directory for the Chroma vector store.
+        check_all_links (bool): Check every job's link, not only the ones due for revalidation.
 
     Returns:
         None
@@ -381,11 +421,15 @@ def clean_databases_orm(chroma_path):
     logging.info("[CLEAN_DATABASES_ORM] Starting cleanup of Job database and Chroma vector store.")
 
     # Retrieve invalid job IDs.
-    ids_to_delete = get_ids_to_delete_orm()
+    ids_to_delete = get_ids_to_delete_orm(check_all=check_all_links)
     
     if ids_to_delete:
         # Delete job entries using Django ORM.
-        deleted_count, _ = Job.objects.filter(id__in=ids_to_delete).delete()
+        deleted_count, _ = bulk_delete(Job, ids_to_delete)
+        # A deleted job's cached page no longer counts as stored, so it is ingested again if relisted.
+        invalidate_cached(ids_to_delete)
+        # Keeps the scrapers' seen-ID index in sync, so it is not rebuilt on their next start.
+        forget_seen_ids("jobs", ids_to_delete)
         logging.info(f"[CLEAN_DATABASES_ORM] Deleted {deleted_count} Job entries from the database.")
     else:
         logging.info("[CLEAN_DATABASES_ORM] No Job entries to delete from the database.")
@@ -406,7 +450,9 @@ def clean_jobs_orm():
     """
     ids_to_delete = get_ids_to_delete_orm()
     if ids_to_delete:
-        deleted_count, _ = Job.objects.filter(id__in=ids_to_delete).delete()
+        deleted_count, _ = bulk_delete(Job, ids_to_delete)
+        invalidate_cached(ids_to_delete)
+        forget_seen_ids("jobs", ids_to_delete)
         logging.info(f"[CLEAN_JOBS_ORM] Deleted {deleted_count} Job entries from the database.")
         return deleted_count
     else:
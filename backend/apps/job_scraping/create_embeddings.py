@@ -4,12 +4,16 @@ import sqlite3
 from config.settings import DATABASES
 from backend.settings import JOB_ADS_EMBEDDINGS_PATH
 from langchain_core.documents import Document
+import hashlib
 import logging
 import traceback
 
 # Django ORM imports
 from django.db.models import Value, CharField
 from django.db.models.functions import Concat
+from .bulk_delete import chunked
+from .clean_jobs_db import delete_chroma_ids
+from .dedup import assign_missing_clusters, cluster_representatives
 from .models import Job
 
 def embed_jobs(chroma_path = JOB_ADS_EMBEDDINGS_PATH, sqlite_path=DATABASES['jobs']):
@@ -101,10 +105,33 @@ def embed_jobs(chroma_path = JOB_ADS_EMBEDDINGS_PATH, sqlite_path=DATABASES['job
             pass
 
 
+def compute_embedding_hash(content, company_name, job_title):
+    """
+    Hash everything a job contributes to its Chroma entry: the embedded text and its metadata.
+
+    Args:
+        content (str): The text that is embedded.
+        company_name (str): The company name stored as metadata.
+        job_title (str): The job title stored as metadata.
+
+    Returns:
+        str: The hex SHA-256 digest.
+    """
+    payload = "\x1f".join([content or "", company_name or "", job_title or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 def embed_jobs_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH):
     """
     Embed new or updated job ads using Django ORM and store them in the Chroma vector store.
 
+    A job is (re-)embedded when it is missing from Chroma or when the hash of its embedding
+    input differs from the `embedding_hash` recorded at its last embed. Jobs already in
+    Chroma without a recorded hash (embedded before hashes existed) are adopted as they are.
+
+    Near-duplicate postings are embedded once per cluster: only the cluster representative
+    is kept in Chroma, so similarity search returns (and the fit evaluation runs on) one
+    posting per cluster. Jobs that have no cluster yet are clustered first.
+
     Args:
         chroma_path (str): Path to the Chroma persistent store directory.
     """
@@ -122,6 +149,11 @@ def embed_jobs_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH):
         )
         logging.info("[EMBED_JOBS_ORM] Chroma vector store initialized successfully.")
 
+        try:
+            assign_missing_clusters()
+        except Exception as e:
+            logging.warning(f"[EMBED_JOBS_ORM] Failed to cluster unclustered jobs, embedding them individually: {e}")
+
         # Retrieve jobs from the database using Django ORM.
         # Concatenate template_title and template_lead to form the content.
         jobs_qs = Job.objects.annotate(
@@ -131,25 +163,59 @@ def embed_jobs_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH):
                 "template_lead",
                 output_field=CharField()
             )
-        ).values("id", "company_name", "template_title", "content")
+        ).values("id", "company_name", "template_title", "content", "embedding_hash", "cluster_id")
         all_jobs = list(jobs_qs)
-        logging.info(f"[EMBED_JOBS_ORM] Retrieved {len(all_jobs)} job ads from the database.")
+        representatives = cluster_representatives(all_jobs)
+        logging.info(
+            f"[EMBED_JOBS_ORM] Retrieved {len(all_jobs)} job ads from the database, "
+            f"{len(all_jobs) - len(representatives)} of them near-duplicates."
+        )
 
         # Retrieve existing IDs from the vector store.
         try:
-            existing_data = vector_store.get(include=["documents"])
+            existing_data = vector_store.get(include=[])
             existing_ids = set(existing_data.get("ids", []))
         except Exception as e:
             logging.warning(f"[EMBED_JOBS_ORM] Failed to retrieve existing IDs from Chroma: {e}")
             existing_ids = set()
         logging.info(f"[EMBED_JOBS_ORM] Retrieved {len(existing_ids)} existing job IDs from Chroma.")
 
-        # Filter for new jobs (those not already embedded).
-        new_jobs = [job for job in all_jobs if job["id"] not in existing_ids]
-        logging.info(f"[EMBED_JOBS_ORM] Found {len(new_jobs)} new job ads to embed.")
+        # Drop the embeddings of jobs that became near-duplicates of another representative.
+        stale_duplicates = [job["id"] for job in all_jobs if job["id"] not in representatives and job["id"] in existing_ids]
+        if stale_duplicates:
+            failed = set(delete_chroma_ids(vector_store, stale_duplicates, log_prefix="[EMBED_JOBS_ORM]"))
+            removed = [job_id for job_id in stale_duplicates if job_id not in failed]
+            for chunk in chunked(removed):
+                Job.objects.filter(id__in=chunk).update(embedding_hash=None)
+            logging.info(f"[EMBED_JOBS_ORM] Removed {len(removed)} near-duplicate job ads from Chroma.")
+            if failed:
+                logging.warning(f"[EMBED_JOBS_ORM] Failed to remove {len(failed)} near-duplicate job ads from Chroma.")
+
+        # Select new jobs and jobs whose embedding input changed since their last embed.
+        jobs_to_embed = []
+        adopted_hashes = {}
+        for job in all_jobs:
+            if job["id"] not in representatives:
+                continue
+            job["input_hash"] = compute_embedding_hash(job["content"], job["company_name"], job["template_title"])
+            if job["id"] not in existing_ids:
+                jobs_to_embed.append(job)
+            elif job["embedding_hash"] is None:
+                adopted_hashes[job["id"]] = job["input_hash"]
+            elif job["embedding_hash"] != job["input_hash"]:
+                jobs_to_embed.append(job)
+        logging.info(
+            f"[EMBED_JOBS_ORM] Found {len(jobs_to_embed)} new or changed job ads to embed, "
+            f"{len(representatives) - len(jobs_to_embed) - len(adopted_hashes)} unchanged."
+        )
+
+        if adopted_hashes:
+            record_embedding_hashes(adopted_hashes)
+            logging.info(f"[EMBED_JOBS_ORM] Recorded embedding hashes for {len(adopted_hashes)} previously embedded jobs.")
 
         documents = []
-        for job in new_jobs:
+        embedded_hashes = {}
+        for job in jobs_to_embed:
             try:
                 doc_meta = {
                     "company_name": job.get("company_name") or "",
@@ -161,6 +227,7 @@ def embed_jobs_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH):
                     id=job.get("id"),
                 )
                 documents.append(document)
+                embedded_hashes[job["id"]] = job["input_hash"]
                 logging.debug(f"[EMBED_JOBS_ORM] Queued job '{job.get('template_title')}' with ID: {job.get('id')} for embedding.")
             except Exception as e:
                 logging.error(f"[EMBED_JOBS_ORM] Error processing job ID {job.get('id')}: {e}")
@@ -168,7 +235,9 @@ def embed_jobs_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH):
 
         if documents:
             try:
-                vector_store.add_documents(documents=documents)
+                # Chroma upserts by ID, so changed jobs replace their previous embedding.
+                vector_store.add_documents(documents=documents, ids=[document.id for document in documents])
+                record_embedding_hashes(embedded_hashes)
                 logging.info(f"[EMBED_JOBS_ORM] Successfully embedded {len(documents)} job ads.")
             except Exception as e:
                 logging.error(f"[EMBED_JOBS_ORM] Failed to add documents to Chroma: {e}")
@@ -179,3 +248,16 @@ def embed_jobs_orm(chroma_path = JOB_ADS_EMBEDDINGS_PATH):
     except Exception as e:
         logging.error(f"[EMBED_JOBS_ORM] Embedding process failed: {e}")
         logging.debug(traceback.format_exc())
+
+def record_embedding_hashes(hashes):
+    """
+    Store the embedding-input hash of freshly embedded jobs.
+
+    Args:
+        hashes (dict): Job ID -> embedding-input hash.
+    """
+    Job.objects.bulk_update(
+        [Job(id=job_id, embedding_hash=input_hash) for job_id, input_hash in hashes.items()],
+        ["embedding_hash"],
+        batch_size=500,
+    )
@@ -0,0 +1,237 @@
+import hashlib
+import logging
+import re
+import threading
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+
+from config.settings import JOB_DEDUP_NUM_PERM, JOB_DEDUP_BANDS, JOB_DEDUP_SHINGLE_SIZE, JOB_DEDUP_THRESHOLD, DELETE_CHUNK_SIZE
+from .bulk_delete import chunked
+from .models import Job, JobMinHash, JobLshBucket
+
+_WORD_PATTERN = re.compile(r"\w+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_min_hasher = None
+_min_hasher_lock = threading.Lock()
+
+def job_text(title, lead):
+    """
+    Text compared for near-duplicate detection: the job title and its description.
+    """
+    return f"{title or ''}\n{lead or ''}"
+
+def shingle_hashes(text, size=JOB_DEDUP_SHINGLE_SIZE):
+    """
+    Hash the distinct word shingles of `text` to 32-bit integers.
+
+    Args:
+        text (str): The text to shingle; compared case-insensitively.
+        size (int): Words per shingle. Texts shorter than that form a single shingle.
+
+    Returns:
+        numpy.ndarray: The shingle hashes (uint64), empty if the text has no words.
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))} if words else set()
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little") for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+class MinHasher:
+    """
+    MinHash signatures and their LSH buckets.
+
+    Each of the `num_perm` permutations is a universal hash `(a * x + b) mod p` of the
+    32-bit shingle hashes, and the signature keeps the minimum of each one. The share of
+    equal positions in two signatures estimates the Jaccard similarity of the shingle sets.
+    The signature is cut into `bands` bands, each hashed into a bucket: two jobs share a
+    bucket with high probability when their similarity is above roughly
+    `(1 / bands) ** (bands / num_perm)` (0.71 with the defaults), and rarely below.
+
+    Args:
+        num_perm (int): Permutations per signature.
+        bands (int): LSH bands; must divide `num_perm`.
+        shingle_size (int): Words per shingle.
+        seed (int): Seed of the permutations. Stored signatures are only comparable with the same seed.
+    """
+    def __init__(self, num_perm=JOB_DEDUP_NUM_PERM, bands=JOB_DEDUP_BANDS, shingle_size=JOB_DEDUP_SHINGLE_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"The number of bands ({bands}) must divide the number of permutations ({num_perm}).")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MAX_HASH, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MAX_HASH, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        """
+        Returns:
+            numpy.ndarray | None: The signature (uint32), or None if the text has no words.
+        """
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        # a, b and the hashes are below 2**32, so a * x + b cannot overflow 64 bits.
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def buckets(self, signature):
+        """
+        Returns:
+            list: One `(band, bucket)` pair per band, the bucket being a signed 64-bit hash of the band's rows.
+        """
+        return [
+            (band, int.from_bytes(
+                hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).digest(),
+                "little",
+                signed=True,
+            ))
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(signature, other):
+        """
+        Estimated Jaccard similarity of the texts behind two signatures.
+        """
+        return float(np.count_nonzero(signature == other)) / len(signature)
+
+def get_min_hasher():
+    """
+    Return the process-wide MinHasher configured from the settings.
+    """
+    global _min_hasher
+    with _min_hasher_lock:
+        if _min_hasher is None:
+            _min_hasher = MinHasher()
+        return _min_hasher
+
+def _load_signature(value):
+    return np.frombuffer(bytes(value), dtype="<u4").astype(np.uint32)
+
+def assign_clusters(jobs, hasher=None):
+    """
+    Sign `jobs`, index them in the LSH buckets and assign each one to a near-duplicate cluster.
+
+    A job joins the cluster of its most similar candidate (an indexed job sharing at least
+    one bucket with it) when their estimated Jaccard similarity reaches
+    `JOB_DEDUP_THRESHOLD`, and founds a cluster named after its own ID otherwise. Jobs
+    earlier in `jobs` are candidates for the later ones. Previous signatures and buckets of
+    the given jobs are replaced.
+
+    Args:
+        jobs (list): Dicts with the `id`, `template_title` and `template_lead` of each job.
+        hasher (MinHasher, optional): Defaults to the process-wide one.
+
+    Returns:
+        dict: Job ID -> cluster ID.
+    """
+    hasher = hasher or get_min_hasher()
+    signatures = {
+        job["id"]: hasher.signature(job_text(job.get("template_title"), job.get("template_lead")))
+        for job in jobs
+    }
+    job_buckets = {job_id: hasher.buckets(signature) for job_id, signature in signatures.items() if signature is not None}
+
+    # Indexed jobs sharing a bucket with any job of the batch, and their signatures. A batch
+    # has `bands` buckets per job, so they are looked up in chunks that stay below SQLite's
+    # bound-variable limit; the batch's own previous buckets are skipped in Python.
+    bucket_members = defaultdict(set)
+    keys = {bucket for buckets in job_buckets.values() for _, bucket in buckets}
+    for chunk in chunked(keys, DELETE_CHUNK_SIZE):
+        for band, bucket, job_id in JobLshBucket.objects.filter(bucket__in=chunk).values_list("band", "bucket", "job_id"):
+            if job_id not in signatures:
+                bucket_members[(band, bucket)].add(job_id)
+    candidate_ids = {job_id for members in bucket_members.values() for job_id in members}
+    known = {}
+    for chunk in chunked(candidate_ids, DELETE_CHUNK_SIZE):
+        for job_id, signature, cluster_id in (
+            JobMinHash.objects.filter(job_id__in=chunk).values_list("job_id", "signature", "job__cluster_id")
+        ):
+            known[job_id] = (_load_signature(signature), cluster_id or job_id)
+
+    clusters = {}
+    for job_id, signature in signatures.items():
+        if signature is None:
+            clusters[job_id] = job_id
+            continue
+
+        best, best_similarity = None, 0.0
+        candidates = {member for key in job_buckets[job_id] for member in bucket_members[key]}
+        for candidate in sorted(candidates):
+            if candidate not in known:
+                continue
+            similarity = hasher.similarity(signature, known[candidate][0])
+            if similarity >= JOB_DEDUP_THRESHOLD and similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        clusters[job_id] = known[best][1] if best else job_id
+        known[job_id] = (signature, clusters[job_id])
+        for key in job_buckets[job_id]:
+            bucket_members[key].add(job_id)
+
+    with transaction.atomic():
+        for chunk in chunked(signatures, DELETE_CHUNK_SIZE):
+            JobLshBucket.objects.filter(job_id__in=chunk).delete()
+            JobMinHash.objects.filter(job_id__in=chunk).delete()
+        JobMinHash.objects.bulk_create(
+            [JobMinHash(job_id=job_id, signature=signature.astype("<u4").tobytes()) for job_id, signature in signatures.items() if signature is not None],
+            batch_size=500,
+        )
+        JobLshBucket.objects.bulk_create(
+            [JobLshBucket(job_id=job_id, band=band, bucket=bucket) for job_id, buckets in job_buckets.items() for band, bucket in buckets],
+            batch_size=1000,
+        )
+        Job.objects.bulk_update([Job(id=job_id, cluster_id=cluster_id) for job_id, cluster_id in clusters.items()], ["cluster_id"], batch_size=500)
+
+    duplicates = sum(1 for job_id, cluster_id in clusters.items() if cluster_id != job_id)
+    if duplicates:
+        logging.info(f"[ASSIGN_CLUSTERS] {duplicates} of {len(clusters)} jobs are near-duplicates of an indexed job.")
+    return clusters
+
+def assign_missing_clusters(batch_size=500):
+    """
+    Cluster the jobs that have no cluster yet, oldest first, e.g. jobs ingested before
+    near-duplicate detection or whose clustering failed at write time.
+
+    Returns:
+        int: The number of jobs clustered.
+    """
+    clustered = 0
+    while True:
+        jobs = list(
+            Job.objects.filter(cluster_id__isnull=True)
+            .order_by("initialPublicationDate", "id")
+            .values("id", "template_title", "template_lead")[:batch_size]
+        )
+        if not jobs:
+            break
+        assign_clusters(jobs)
+        clustered += len(jobs)
+    if clustered:
+        logging.info(f"[ASSIGN_MISSING_CLUSTERS] Clustered {clustered} jobs.")
+    return clustered
+
+def cluster_representatives(jobs):
+    """
+    Pick the job standing for each cluster: the job that founded it while it exists,
+    otherwise the member with the smallest ID. Jobs without a cluster stand for themselves.
+
+    Args:
+        jobs (iterable): Dicts with the `id` and `cluster_id` of each job.
+
+    Returns:
+        set: The IDs of the representatives.
+    """
+    members = defaultdict(list)
+    for job in jobs:
+        members[job["cluster_id"] or job["id"]].append(job["id"])
+    return {cluster_id if cluster_id in job_ids else min(job_ids) for cluster_id, job_ids in members.items()}
@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+class CachedResponse:
+    """
+    Minimal response object returned by `HttpCache.get`.
+
+    It exposes the attributes the scraper reads from `requests.Response` (`status_code`,
+    `content`, `text`, `headers`, `url`) plus `not_modified`, which is True when the body
+    is identical to a committed cached copy, either because the server answered 304 or
+    because the body digest did not change.
+    """
+    def __init__(self, url, status_code, content, headers=None, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.not_modified = not_modified
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+class HttpCache:
+    """
+    Persistent HTTP cache keyed by URL, used to issue conditional GET requests.
+
+    For every URL the index stores the `ETag`, `Last-Modified`, a SHA-256 digest of the body
+    and the last access time. Bodies are stored zlib-compressed in one file per URL. When the
+    total stored size exceeds `max_bytes`, least recently used entries are evicted.
+
+    A body fetched with a `commit_key` (e.g. the job ID of a detail page) is stored
+    uncommitted: it is only reported as `not_modified` once `commit` is called with its key,
+    i.e. once whatever was derived from it is stored, and `invalidate` reverts that when the
+    stored result is deleted. A body whose processing failed is processed again by the next
+    fetch, however often the page stays the same.
+
+    Args:
+        cache_dir (str): Directory holding the index database and the body files.
+        max_bytes (int): Maximum total size of the stored (compressed) bodies.
+    """
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.bodies_dir = os.path.join(cache_dir, "bodies")
+        os.makedirs(self.bodies_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                digest TEXT,
+                size INTEGER,
+                last_access REAL,
+                commit_key TEXT,
+                committed INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # Indexes created before commit keys existed get the columns; their entries start uncommitted.
+        existing_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "commit_key" not in existing_columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN commit_key TEXT")
+        if "committed" not in existing_columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN committed INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_commit_key ON entries (commit_key)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _body_path(self, url):
+        return os.path.join(self.bodies_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _lookup(self, url):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, digest, committed FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+
+    def _read_body(self, url):
+        try:
+            with open(self._body_path(url), "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def _touch(self, url, response=None):
+        with self._lock:
+            if response is None:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            else:
+                self._conn.execute(
+                    "UPDATE entries SET etag = ?, last_modified = ?, last_access = ? WHERE url = ?",
+                    (response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time(), url),
+                )
+            self._conn.commit()
+
+    def _store(self, url, response, digest, commit_key=None):
+        compressed = zlib.compress(response.content)
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            with open(self._body_path(url), "wb") as f:
+                f.write(compressed)
+            self._conn.execute(
+                '''
+                INSERT OR REPLACE INTO entries (url, etag, last_modified, digest, size, last_access, commit_key, committed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''',
+                (
+                    url, response.headers.get("ETag"), response.headers.get("Last-Modified"), digest,
+                    len(compressed), time.time(), commit_key, int(commit_key is None),
+                ),
+            )
+            self._conn.commit()
+            self._total_bytes += len(compressed) - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """
+        Delete least recently used entries until the cache is back under 90% of its cap.
+        Must be called with the lock held.
+        """
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        rows = self._conn.execute("SELECT url, size FROM entries ORDER BY last_access").fetchall()
+        for url, size in rows:
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(self._body_path(url))
+            except OSError:
+                pass
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._total_bytes -= size
+            evicted += 1
+        self._conn.commit()
+        logging.info(f"[HTTP_CACHE] Evicted {evicted} entries. Cache size is now {self._total_bytes} bytes.")
+
+    def _set_committed(self, keys, committed):
+        with self._lock:
+            cursor = self._conn.executemany(
+                "UPDATE entries SET committed = ? WHERE commit_key = ?", [(committed, key) for key in dict.fromkeys(keys)]
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def commit(self, keys):
+        """
+        Mark the bodies fetched for `keys` as processed, so identical bodies are reported as
+        `not_modified` from now on.
+
+        Args:
+            keys (Iterable[str]): Commit keys, e.g. the IDs of the jobs that are now stored.
+
+        Returns:
+            int: The number of entries committed.
+        """
+        return self._set_committed(keys, 1)
+
+    def invalidate(self, keys):
+        """
+        Undo `commit` for `keys`, e.g. after their jobs were deleted, so their bodies are
+        processed again by the next fetch even if they did not change.
+
+        Returns:
+            int: The number of entries invalidated.
+        """
+        return self._set_committed(keys, 0)
+
+    def get(self, session, url, commit_key=None, **kwargs):
+        """
+        Perform a conditional GET for `url` through `session`, using and updating the cache.
+
+        Args:
+            session (requests.Session): The session used to send the request.
+            url (str): The URL to fetch.
+            commit_key (str, optional): Stores a new body uncommitted under this key (see `commit`).
+                                        Without it, bodies are committed as soon as they are stored.
+            **kwargs: Extra arguments forwarded to `session.get`.
+
+        Returns:
+            CachedResponse: The response. On a 304, the cached body is returned with status 200,
+                            and `not_modified=True` if the entry is committed.
+        """
+        entry = self._lookup(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            etag, last_modified, _, _ = entry
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            body = self._read_body(url)
+            if body is not None:
+                self._touch(url)
+                logging.debug(f"[HTTP_CACHE] 304 Not Modified, served from cache: {url}")
+                return CachedResponse(url, 200, body, response.headers, not_modified=bool(entry[3]))
+            # The body file is gone: retry without validators.
+            headers.pop("If-None-Match", None)
+            headers.pop("If-Modified-Since", None)
+            response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code != 200:
+            return CachedResponse(url, response.status_code, response.content, response.headers)
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        unchanged = bool(entry) and entry[2] == digest
+        if unchanged:
+            # The server ignored the validators but the body is unchanged: keep the stored copy.
+            self._touch(url, response)
+        else:
+            self._store(url, response, digest, commit_key)
+        return CachedResponse(url, 200, response.content, response.headers, not_modified=unchanged and bool(entry[3]))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,215 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import (
+    HTTP_USER_AGENT,
+    HTTP_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_HOST_POOL_SIZES,
+    HTTP_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_RETRY_STATUSES,
+    HTTP_MAX_RETRY_AFTER,
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+)
+from .http_cache import HttpCache
+
+DEFAULT_HEADERS = {
+    "User-Agent": HTTP_USER_AGENT,
+}
+
+# Retry policies per session profile. The link checker retries less, and waits less on
+# `Retry-After`, because every retry delays the whole cleaning run, and a dead link is the
+# expected outcome.
+SESSION_PROFILES = {
+    "scraper": {"retries": HTTP_RETRIES, "backoff_factor": HTTP_BACKOFF_FACTOR, "max_retry_after": HTTP_MAX_RETRY_AFTER},
+    "link_checker": {"retries": 1, "backoff_factor": HTTP_BACKOFF_FACTOR, "max_retry_after": 10},
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_http_cache = None
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default timeout to requests that do not specify one.
+    """
+    def __init__(self, *args, timeout=HTTP_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+def build_retry(retries=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR, max_retry_after=HTTP_MAX_RETRY_AFTER):
+    """
+    Build the retry policy used by the session adapters.
+
+    Connection errors and retryable status codes (429, 5xx) are retried with exponential
+    backoff, honouring `Retry-After` up to `max_retry_after` seconds, so a server asking
+    for hours cannot stall a worker thread. The final response is returned instead of
+    raising, so callers keep checking `status_code` as before.
+
+    Args:
+        retries (int): Maximum number of retries.
+        backoff_factor (float): Backoff factor between retries.
+        max_retry_after (int): Longest sleep in seconds taken from a `Retry-After` header.
+
+    Returns:
+        Retry: The urllib3 retry policy.
+    """
+    return Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        retry_after_max=max_retry_after,
+        raise_on_status=False,
+    )
+
+def build_session(
+    retries=HTTP_RETRIES,
+    backoff_factor=HTTP_BACKOFF_FACTOR,
+    max_retry_after=HTTP_MAX_RETRY_AFTER,
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    host_pool_sizes=HTTP_HOST_POOL_SIZES,
+    timeout=HTTP_TIMEOUT,
+):
+    """
+    Create a requests session with keep-alive connection pooling, default headers and retries.
+
+    Args:
+        retries (int): Maximum number of retries per request.
+        backoff_factor (float): Backoff factor between retries.
+        max_retry_after (int): Longest sleep in seconds taken from a `Retry-After` header.
+        pool_connections (int): Number of per-host pools kept alive.
+        pool_maxsize (int): Keep-alive connections per host for hosts without a dedicated pool.
+        host_pool_sizes (dict): URL prefix -> pool size, for hosts that need more connections.
+        timeout (float): Default timeout applied to requests without an explicit timeout.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    retry = build_retry(retries, backoff_factor, max_retry_after)
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+        timeout=timeout,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Longer prefixes take precedence over the generic adapters mounted above.
+    for prefix, size in (host_pool_sizes or {}).items():
+        session.mount(prefix, TimeoutHTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=retry, timeout=timeout))
+
+    return session
+
+def get_session(profile="scraper"):
+    """
+    Return the process-wide session for `profile`, creating it on first use.
+
+    The session is shared by all threads so that connections to a host are reused
+    across the whole run instead of being re-established for every URL.
+
+    Args:
+        profile (str): One of the keys of `SESSION_PROFILES`.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    session = _sessions.get(profile)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        if profile not in _sessions:
+            _sessions[profile] = build_session(**SESSION_PROFILES[profile])
+            logging.debug(f"[HTTP_SESSION] Created pooled session for profile '{profile}'.")
+        return _sessions[profile]
+
+def get_http_cache():
+    """
+    Return the process-wide on-disk HTTP cache, or None if caching is disabled.
+
+    Returns:
+        HttpCache | None: The shared cache.
+    """
+    global _http_cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+
+    with _sessions_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES)
+            logging.debug(f"[HTTP_SESSION] Opened HTTP cache at {HTTP_CACHE_DIR}.")
+        return _http_cache
+
+def cached_get(url, profile="scraper", commit_key=None, cache=True, **kwargs):
+    """
+    GET `url` through the shared session, with conditional requests against the HTTP cache.
+
+    The returned response has a `not_modified` attribute that is True when the body is the
+    same as the cached copy, so callers can skip re-parsing it. With a `commit_key`, that
+    only holds once the key was passed to `commit_cached`.
+
+    Args:
+        url (str): The URL to fetch.
+        profile (str): The session profile to use.
+        commit_key (str, optional): Key under which a new body waits for `commit_cached`, e.g. the job ID.
+        cache (bool): Use the HTTP cache. Pass False for pages that change on every fetch
+                      (e.g. search result pages), which would only fill the cache.
+        **kwargs: Extra arguments forwarded to `session.get`.
+
+    Returns:
+        CachedResponse | requests.Response: The response.
+    """
+    session = get_session(profile)
+    http_cache = get_http_cache() if cache else None
+    if http_cache is None:
+        response = session.get(url, **kwargs)
+        response.not_modified = False
+        return response
+    return http_cache.get(session, url, commit_key=commit_key, **kwargs)
+
+def commit_cached(keys):
+    """
+    Commit the cached bodies fetched for `keys` (see `HttpCache.commit`). Meant as an
+    `on_flush` hook of a job writer, with the IDs of the committed jobs.
+    """
+    cache = get_http_cache()
+    if cache is not None:
+        cache.commit(keys)
+
+def invalidate_cached(keys):
+    """
+    Invalidate the cached bodies fetched for `keys` (see `HttpCache.invalidate`), e.g. with
+    the IDs of deleted jobs.
+    """
+    cache = get_http_cache()
+    if cache is not None:
+        cache.invalidate(keys)
+
+def close_sessions():
+    """
+    Close every shared session and release their pooled connections.
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -6,7 +6,8 @@ import xml.etree.ElementTree as ET
 import time
 import re
 from bs4 import BeautifulSoup
-from config.settings import DATABASES
+from config.settings import DATABASES, JOBUP_BASE_URL, SCRAPER_PAGE_DELAY
+from .http_session import get_session
 
 def get_industries():    
     # Use a `with` statement for safe connection handling
@@ -28,10 +29,12 @@ def get_industries():
         #conn.commit()
 
         # Sitemap URL
-        url = "https://www.jobup.ch/sitemaps/sitemap.industry.xml.gz"
+        url = f"{JOBUP_BASE_URL}/sitemaps/sitemap.industry.xml.gz"
+
+        session = get_session()
 
         # Download and decompress the sitemap
-        response = requests.get(url)
+        response = session.get(url)
         if response.status_code == 200:
             with gzip.GzipFile(fileobj=io.BytesIO(response.content)) as f:
                 sitemap_xml = f.read()
@@ -47,18 +50,14 @@ def get_industries():
                 if "industry=" in url_tag.find("ns:loc", namespace).text
             ]
 
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-
             # Loop through the industry URLs and fetch their corresponding names
             for url in industry_urls:
                 industry_id = url.split("industry=")[1].split("&")[0]  # Extract industry ID
                 lang = "FR" if "/fr/" in url else "EN"  # Determine language from URL
 
                 # Fetch the page content to extract the industry name
-                time.sleep(5)  # Delay to avoid rate-limiting
-                page_response = requests.get(url, headers=headers)
+                time.sleep(SCRAPER_PAGE_DELAY)  # Delay to avoid rate-limiting
+                page_response = session.get(url)
                 if page_response.status_code == 200:
                     soup = BeautifulSoup(page_response.text, "html.parser")
                     title_tag = soup.find("title")
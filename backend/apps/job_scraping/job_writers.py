@@ -0,0 +1,246 @@
+import logging
+import sqlite3
+import time
+import traceback
+
+from django.db import transaction
+
+from config.settings import JOB_WRITER_BATCH_SIZE, JOB_WRITER_FLUSH_INTERVAL, JOB_DEDUP_ENABLED
+from .dedup import assign_clusters
+from .models import Job
+from .normalizer import JOB_FIELD_NAMES, compute_content_hash
+
+# Every ingested column except the primary key is overwritten when a job already exists,
+# which matches the `defaults` previously passed to `update_or_create`. `embedding_hash`
+# is owned by the embedding step and never touched here.
+JOB_UPDATE_FIELDS = [name for name in JOB_FIELD_NAMES if name != "id"] + ["content_hash"]
+
+# Schema of the `jobs` table used by the legacy SQLite pipeline.
+JOBS_TABLE_SCHEMA = {
+    'id': 'TEXT PRIMARY KEY',
+    'externalUrl': 'TEXT',
+    'logo': 'TEXT',
+    'company_id': 'TEXT',
+    'company_name': 'TEXT',
+    'contact_firstName': 'TEXT',
+    'contact_lastName': 'TEXT',
+    'headhunterApplicationAllowed': 'BOOLEAN',
+    'initialPublicationDate': 'TEXT',
+    'isActive': 'BOOLEAN',
+    'isPaid': 'BOOLEAN',
+    'language_skills': 'TEXT',
+    'postalCode': 'TEXT',
+    'city': 'TEXT',
+    'cantonCode': 'TEXT',
+    'countryCode': 'TEXT',
+    'publicationDate': 'TEXT',
+    'publicationEndDate': 'TEXT',
+    'skills': 'TEXT',
+    'synonym': 'TEXT',
+    'template_lead': 'TEXT',
+    'template_title': 'TEXT',
+    'industry': 'INTEGER',
+    'regionID': 'INTEGER',
+    'employmentPositionIds': 'INTEGER',
+    'employmentTypeIds': 'INTEGER',
+    'employmentGrades': 'TEXT'
+}
+
+class BatchedJobWriter:
+    """
+    Base class for writers that buffer job rows and write them in batches.
+
+    A batch is flushed when it reaches `batch_size` rows, or on `add` once `flush_interval`
+    seconds have passed since the last flush. Callers must call `flush` (or use the writer
+    as a context manager) at the end. Subclasses implement `_write(rows)`, which must write
+    all rows in one transaction or raise.
+
+    Args:
+        batch_size (int): Number of rows buffered before a flush.
+        flush_interval (float): Maximum age in seconds of a buffered batch.
+        on_flush (Callable[[list], None] | list, optional): Called with the IDs of the jobs committed
+                                                            by each flush. A list of callables is called in order.
+    """
+    log_prefix = "[BATCHED_JOB_WRITER]"
+
+    def __init__(self, batch_size=JOB_WRITER_BATCH_SIZE, flush_interval=JOB_WRITER_FLUSH_INTERVAL, on_flush=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = [on_flush] if callable(on_flush) else [hook for hook in on_flush or [] if hook]
+        self.written = 0
+        self.failed = 0
+        self._buffer = {}
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, fields):
+        """
+        Buffer one job row, flushing if the batch is full or due.
+
+        Args:
+            fields (dict): Column values, including `id`.
+        """
+        # Keyed by ID: a job seen twice in a batch is written once, with its latest values.
+        self._buffer[fields["id"]] = fields
+        if len(self._buffer) >= self.batch_size or self.flush_due():
+            self.flush()
+
+    def flush_due(self):
+        return bool(self._buffer) and time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self):
+        """
+        Write the buffered rows in one transaction.
+
+        If the batch fails as a whole, the rows are retried one by one so a single bad
+        row does not drop the rest of the batch.
+
+        Returns:
+            int: The number of rows written.
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return 0
+
+        rows = list(self._buffer.values())
+        self._buffer = {}
+        start = time.monotonic()
+        try:
+            self._write(rows)
+            written_ids = [row["id"] for row in rows]
+        except Exception as e:
+            logging.error(f"{self.log_prefix} Batch write of {len(rows)} jobs failed, retrying row by row: {e}")
+            logging.debug(traceback.format_exc())
+            written_ids = []
+            for row in rows:
+                try:
+                    self._write([row])
+                    written_ids.append(row["id"])
+                except Exception as e:
+                    self.failed += 1
+                    logging.error(f"{self.log_prefix} Error inserting job {row.get('id')}: {e}")
+
+        self.written += len(written_ids)
+        logging.info(f"{self.log_prefix} Wrote {len(written_ids)} jobs in {time.monotonic() - start:.3f} seconds.")
+        if written_ids:
+            for hook in self.on_flush:
+                hook(written_ids)
+        return len(written_ids)
+
+    def close(self):
+        self.flush()
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+class JobBulkWriter(BatchedJobWriter):
+    """
+    Upsert job rows in batches with the Django ORM.
+
+    Each flush issues a single `INSERT ... ON CONFLICT (id) DO UPDATE` through
+    `bulk_create(update_conflicts=True)` inside one transaction, instead of a SELECT plus
+    an INSERT/UPDATE (each auto-committed) per job.
+
+    Rows whose `content_hash` matches the stored one are skipped: the stored hashes of a
+    batch are read with one query, and unchanged jobs are neither rewritten nor flagged for
+    re-embedding. They still count as written for the `on_flush` hook.
+
+    Changed rows are then assigned to their near-duplicate cluster. A clustering failure
+    does not fail the batch: the jobs are left without a cluster and picked up by the
+    next embedding run.
+    """
+    log_prefix = "[JOB_BULK_WRITER]"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.unchanged = 0
+
+    def _write(self, rows):
+        for row in rows:
+            if not row.get("content_hash"):
+                row["content_hash"] = compute_content_hash(row)
+
+        with transaction.atomic():
+            stored_hashes = dict(
+                Job.objects.filter(id__in=[row["id"] for row in rows]).values_list("id", "content_hash")
+            )
+            changed = [row for row in rows if stored_hashes.get(row["id"]) != row["content_hash"]]
+            if changed:
+                Job.objects.bulk_create(
+                    [Job(**row) for row in changed],
+                    update_conflicts=True,
+                    unique_fields=["id"],
+                    update_fields=JOB_UPDATE_FIELDS,
+                )
+
+        self.unchanged += len(rows) - len(changed)
+        if len(changed) < len(rows):
+            logging.debug(f"{self.log_prefix} Skipped {len(rows) - len(changed)} unchanged jobs.")
+
+        if changed and JOB_DEDUP_ENABLED:
+            try:
+                assign_clusters(changed)
+            except Exception as e:
+                logging.error(f"{self.log_prefix} Near-duplicate clustering failed for {len(changed)} jobs: {e}")
+                logging.debug(traceback.format_exc())
+
+class SqliteJobWriter(BatchedJobWriter):
+    """
+    Write job rows to the legacy SQLite `jobs` table over one long-lived connection.
+
+    The schema is created and checked for missing columns once, when the writer is opened,
+    and the database is switched to WAL mode. Each flush is a single `executemany` of
+    `INSERT OR REPLACE` statements in one transaction, so a run pays one fsync per batch
+    instead of one connection, schema check and commit per job.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        batch_size (int): Number of rows buffered before a flush.
+        flush_interval (float): Maximum age in seconds of a buffered batch.
+        on_flush (Callable[[list], None] | list, optional): Called with the IDs of the jobs committed by each flush.
+    """
+    log_prefix = "[SQLITE_JOB_WRITER]"
+
+    def __init__(self, db_path, batch_size=JOB_WRITER_BATCH_SIZE, flush_interval=JOB_WRITER_FLUSH_INTERVAL, on_flush=None):
+        super().__init__(batch_size, flush_interval, on_flush)
+        self.db_path = db_path
+        self.columns = list(JOBS_TABLE_SCHEMA.keys())
+        self._insert_query = f'''
+            INSERT OR REPLACE INTO jobs ({', '.join(self.columns)})
+            VALUES ({', '.join(['?' for _ in self.columns])})
+        '''
+
+        self._conn = sqlite3.connect(db_path, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only syncs at checkpoints while staying safe against corruption.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        cursor = self._conn.cursor()
+        columns_sql = ",\n".join(f"{column} {column_type}" for column, column_type in JOBS_TABLE_SCHEMA.items())
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS jobs (\n{columns_sql}\n)")
+
+        # Check and add any missing columns
+        cursor.execute("PRAGMA table_info(jobs)")
+        existing_columns = {row[1] for row in cursor.fetchall()}
+        for column, column_type in JOBS_TABLE_SCHEMA.items():
+            if column not in existing_columns:
+                cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+                logging.debug(f"{self.log_prefix} Added missing column '{column}' to 'jobs' table.")
+        self._conn.commit()
+
+    def _write(self, rows):
+        with self._conn:
+            self._conn.executemany(self._insert_query, [[row.get(column) for column in self.columns] for row in rows])
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
@@ -6,11 +6,72 @@ import re
 import time
 import traceback
 import xml.etree.ElementTree as ET
+from contextlib import nullcontext
+from itertools import islice
 import pandas as pd
-from config.settings import DATABASES
+from config.settings import DATABASES, JOBUP_BASE_URL, SCRAPER_PAGE_DELAY, SCRAPER_LEASE_BATCH_SIZE, SCRAPER_WORKER_POLL_INTERVAL, SCRAPER_WORKER_IDLE_TIMEOUT, SCRAPER_REGION_IDS, SCRAPER_REQUESTS_PER_SECOND
 import logging
 import json
+from django.db import connection
 from .models import Job
+from .job_writers import JobBulkWriter, SqliteJobWriter
+from .normalizer import JOB_FIELDS, normalize_job, compute_content_hash, source_spec
+from .run_state import ScrapeCheckpoint
+from .http_session import cached_get, commit_cached
+from .page_archive import get_page_archive
+from .react_state import extract_react_query_state, select_react_query_state
+from .seen_index import SeenJobLinks, load_seen_index, table_marker
+from .work_queue import WorkQueue
+from .watermark import PublicationWatermark, parse_publication_date
+
+# Returned by get_job_info when the page is unchanged since it was last fetched.
+JOB_NOT_MODIFIED = "not_modified"
+
+JOB_ID_PATTERN = re.compile(r"/jobs/detail/([^/?#]+)")
+
+# The parts of the React Query state read by `clean_json`: the job fields of every query's data.
+JOB_STATE_SPEC = {"queries": [{"state": {"data": source_spec(JOB_FIELDS)}}]}
+
+def build_job_link(job_id):
+    """
+    Build the canonical Jobup detail link for a job ID, as stored in the scraped links set.
+
+    Args:
+        job_id (str): The Jobup job ID.
+
+    Returns:
+        str: The job detail URL.
+    """
+    return f"{JOBUP_BASE_URL}/en/jobs/detail/{job_id}/?source=vacancy_search"
+
+def parse_job_id(link):
+    """
+    Extract the job ID from a Jobup detail link, whatever its language prefix or query string.
+
+    Args:
+        link (str): A Jobup job detail URL.
+
+    Returns:
+        str | None: The job ID, or None if the link is not a detail link.
+    """
+    match = JOB_ID_PATTERN.search(link)
+    return match.group(1) if match else None
+
+def build_search_url(page_number, published_since):
+    """
+    Build the Jobup search results URL for a given page.
+
+    Args:
+        page_number (int): The page number of the search results.
+        published_since (int): The number of days since the job was published.
+
+    Returns:
+        str: The search results URL.
+    """
+    page_number_str = str(page_number)
+    published_since_str = str(published_since)
+    regions = "".join(f"&region={region_id}" for region_id in SCRAPER_REGION_IDS)
+    return f"{JOBUP_BASE_URL}/en/jobs/?page={page_number_str}&publication-date={published_since_str}{regions}&term="
 
 def get_links(page_number, published_since):
     """
@@ -21,112 +82,222 @@ def get_links(page_number, published_since):
         published_since (int): The number of days since the job was published.
     
     Returns:
-        list: A list of job links on the specified page.
+        list | None: A list of job links on the specified page, or None if the page could not be fetched.
+    """
+    page = get_listing_page(page_number, published_since)
+    return page[0] if page is not None else None
+
+def extract_listing_dates(content):
+    """
+    Collect the publication date of every job listed in a search results page's React Query state.
+
+    Args:
+        content (bytes | str): The raw search results page.
+
+    Returns:
+        dict: Job ID -> publication date (`publicationDate`, else `initialPublicationDate`).
+    """
+    state = extract_react_query_state(content)
+    dates = {}
+    stack = [state] if state else []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            job_id = node.get("id") or node.get("job_id")
+            published = node.get("publicationDate") or node.get("initialPublicationDate")
+            if isinstance(job_id, str) and published:
+                dates.setdefault(job_id, parse_publication_date(published))
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return dates
+
+def get_listing_page(page_number, published_since):
+    """
+    Get the job links of a search results page, with the publication date of each posting.
+
+    Args:
+        page_number (int): The page number to fetch job links from.
+        published_since (int): The number of days since the job was published.
+
+    Returns:
+        tuple | None: `(links, dates)`, the job links on the page and the publication date of
+                      each link, None where the page did not show it. `([], [])` past the last
+                      page of results (an empty page or a 404); None if the page could not be
+                      fetched or parsed, so that callers can tell a failure from the end of
+                      the results.
     """
-    
     logging.info(f"[GET_LINKS] Starting to fetch job links for page {page_number} published since {published_since} days.")
 
-    page_number_str = str(page_number)
-    published_since_str = str(published_since)
-    url = f"https://www.jobup.ch/en/jobs/?page={page_number_str}&publication-date={published_since_str}&region=33&region=34&region=40&region=42&region=52&region=57&term="
-    
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/91.0.4472.124 Safari/537.36"
-        )
-    }
-    
+    url = build_search_url(page_number, published_since)
+
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        # Result pages change with every new posting, so they are not worth caching.
+        response = cached_get(url, cache=False, timeout=10)
     except requests.RequestException as e:
         logging.error(f"[GET_LINKS] RequestException: Unable to fetch the page for page_number={page_number}. Error: {e}")
-        return []
+        return None
     
     if response.status_code == 200:
         logging.info(f"[GET_LINKS] Successfully fetched page {page_number} with status code 200.")
         try:
             soup = BeautifulSoup(response.text, "html.parser")
-            job_links = ["https://www.jobup.ch"+a["href"] for a in soup.select('a[data-cy="job-link"]')]
+            job_links = [JOBUP_BASE_URL+a["href"] for a in soup.select('a[data-cy="job-link"]')]
             logging.info(f"[GET_LINKS] Extracted {len(job_links)} job links from page {page_number}.")
-            return job_links
         except Exception as e:
             logging.error(f"[GET_LINKS] Error parsing the HTML for page_number={page_number}. Error: {e}")
-            return []
+            return None
+        listing_dates = extract_listing_dates(response.content)
+        return job_links, [listing_dates.get(parse_job_id(link)) for link in job_links]
+    elif response.status_code == 404:
+        logging.info(f"[GET_LINKS] Page {page_number} does not exist (status code 404).")
+        return [], []
     else:
         logging.error(f"[GET_LINKS] Failed to fetch links from page {page_number}. Status code: {response.status_code}")
-        return []
+        return None
     
-def get_job_info(link):
+def fetch_job_page(link):
     """
-    Extract job information from a Jobup job posting URL.
+    Fetch the raw content of a Jobup job posting page.
 
     Args:
         link (str): The URL of the Jobup job posting.
 
-    Returns:
-        dict | None: A dictionary containing the extracted job information,
-                     or None if something went wrong.
-    """
-    logging.info(f"[GET_JOB_INFO] Starting job info extraction for link: {link}")
+    Changed pages are also appended to the raw page archive when it is enabled.
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/91.0.4472.124 Safari/537.36"
-        )
-    }
+    The page is cached under its job ID and only reported unchanged once that job was
+    committed (the job writers' `on_flush` hooks include `commit_cached`), so a page whose
+    parse or write failed is processed again by the next fetch.
 
+    Returns:
+        bytes | str | None: The raw page content, JOB_NOT_MODIFIED if the page is unchanged
+                            since its job was last stored, or None if something went wrong.
+    """
     try:
-        response = requests.get(link, headers=headers)
+        response = cached_get(link, commit_key=parse_job_id(link))
     except requests.RequestException as e:
         logging.error(f"[GET_JOB_INFO] RequestException: Unable to fetch the page for link={link}. Error: {e}")
         return None
 
     if response.status_code == 200:
         logging.info(f"[GET_JOB_INFO] Successfully fetched page with status code 200 for link: {link}")
-        soup = BeautifulSoup(response.text, "html.parser")
-        script_tags = soup.find_all("script")
-
-        target_script = None
-        # Look for the script containing __REACT_QUERY_STATE__
-        for script in script_tags:
-            # script.string can be None if it's an external script or has no direct text
-            if script.string and "__REACT_QUERY_STATE__" in script.string:
-                target_script = script.string
-                logging.info("[GET_JOB_INFO] Found script containing __REACT_QUERY_STATE__.")
-                break
+        if response.not_modified:
+            logging.info(f"[GET_JOB_INFO] Page unchanged since its job was stored, skipping parsing for link: {link}")
+            return JOB_NOT_MODIFIED
 
-        if not target_script:
-            logging.warning("[GET_JOB_INFO] Script containing __REACT_QUERY_STATE__ not found in the HTML.")
-            return None
+        archive = get_page_archive()
+        if archive is not None:
+            try:
+                archive.append(parse_job_id(link), link, response.content)
+            except Exception as e:
+                logging.error(f"[GET_JOB_INFO] Failed to archive page for link={link}. Error: {e}")
+        return response.content
 
-        match = re.search(r"__REACT_QUERY_STATE__ = ({.*});", target_script)
-        if not match:
-            logging.warning("[GET_JOB_INFO] __REACT_QUERY_STATE__ object pattern not found in the script content.")
-            return None
+    else:
+        logging.error(f"[GET_JOB_INFO] Non-200 status code received. code={response.status_code}, link={link}")
+        return None
 
-        script_content = match.group(1)
-        # Replace occurrences of 'undefined' with 'null' to make it valid JSON
-        script_content = re.sub(r"\bundefined\b", "null", script_content)
+def parse_job_page(content, link):
+    """
+    Extract the __REACT_QUERY_STATE__ object from the raw content of a job posting page.
 
-        try:
-            react_query_state = json.loads(script_content)
-            logging.info(f"[GET_JOB_INFO] Successfully parsed __REACT_QUERY_STATE__ for link: {link}")
-            return react_query_state
-        except json.JSONDecodeError as e:
-            logging.error(f"[GET_JOB_INFO] JSONDecodeError: Failed to parse JSON after replacement for link={link}. Error: {e}")
-            return None
+    Only the parts `clean_json` reads (`JOB_STATE_SPEC`) are decoded, by the selective
+    decoder. The full raw byte extractor and then the BeautifulSoup path are the fallbacks.
 
-    else:
-        logging.error(f"[GET_JOB_INFO] Non-200 status code received. code={response.status_code}, link={link}")
+    Args:
+        content (bytes): The raw page content.
+        link (str): The URL of the job posting, for logging.
+
+    Returns:
+        dict | None: The parsed React query state (only its job fields when decoded selectively),
+                     or None if something went wrong.
+    """
+    react_query_state = select_react_query_state(content, JOB_STATE_SPEC)
+    if react_query_state is not None:
+        logging.info(f"[GET_JOB_INFO] Successfully decoded the job fields of __REACT_QUERY_STATE__ for link: {link}")
+        return react_query_state
+
+    react_query_state = extract_react_query_state(content)
+    if react_query_state is not None:
+        logging.info(f"[GET_JOB_INFO] Successfully extracted __REACT_QUERY_STATE__ from raw content for link: {link}")
+        return react_query_state
+
+    logging.info(f"[GET_JOB_INFO] Raw extraction failed, falling back to BeautifulSoup parsing for link: {link}")
+    return parse_react_query_state_bs4(content.decode("utf-8", errors="replace"), link)
+
+def get_job_info(link):
+    """
+    Extract job information from a Jobup job posting URL.
+
+    Args:
+        link (str): The URL of the Jobup job posting.
+
+    Returns:
+        dict | str | None: A dictionary containing the extracted job information,
+                           JOB_NOT_MODIFIED if the page is unchanged since the last fetch,
+                           or None if something went wrong.
+    """
+    logging.info(f"[GET_JOB_INFO] Starting job info extraction for link: {link}")
+
+    content = fetch_job_page(link)
+    if content is None or content == JOB_NOT_MODIFIED:
+        return content
+    return parse_job_page(content, link)
+
+def parse_react_query_state_bs4(html, link):
+    """
+    Parse the __REACT_QUERY_STATE__ object out of a job page using BeautifulSoup.
+
+    This is the original, slower extraction path, kept as a fallback for pages the raw
+    extractor in `react_state` cannot handle.
+
+    Args:
+        html (str): The HTML of the job posting page.
+        link (str): The URL of the job posting, for logging.
+
+    Returns:
+        dict | None: The parsed React query state, or None if something went wrong.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    script_tags = soup.find_all("script")
+
+    target_script = None
+    # Look for the script containing __REACT_QUERY_STATE__
+    for script in script_tags:
+        # script.string can be None if it's an external script or has no direct text
+        if script.string and "__REACT_QUERY_STATE__" in script.string:
+            target_script = script.string
+            logging.info("[GET_JOB_INFO] Found script containing __REACT_QUERY_STATE__.")
+            break
+
+    if not target_script:
+        logging.warning("[GET_JOB_INFO] Script containing __REACT_QUERY_STATE__ not found in the HTML.")
+        return None
+
+    match = re.search(r"__REACT_QUERY_STATE__ = ({.*});", target_script)
+    if not match:
+        logging.warning("[GET_JOB_INFO] __REACT_QUERY_STATE__ object pattern not found in the script content.")
+        return None
+
+    script_content = match.group(1)
+    # Replace occurrences of 'undefined' with 'null' to make it valid JSON
+    script_content = re.sub(r"\bundefined\b", "null", script_content)
+
+    try:
+        react_query_state = json.loads(script_content)
+        logging.info(f"[GET_JOB_INFO] Successfully parsed __REACT_QUERY_STATE__ for link: {link}")
+        return react_query_state
+    except json.JSONDecodeError as e:
+        logging.error(f"[GET_JOB_INFO] JSONDecodeError: Failed to parse JSON after replacement for link={link}. Error: {e}")
         return None
 
 def clean_json(raw_json, link):
     """
-    Extract relevant fields from the raw JSON object and format them for insertion into SQLite.
+    Extract relevant fields from the raw JSON object and format them for insertion into the database.
+
+    Every entry is normalized by `normalize_job`, so the returned dictionaries are keyed by the
+    `Job` model fields (which are also the columns of the legacy SQLite table) and can be
+    written by both insert paths as they are.
 
     Args:
         raw_json (dict): Raw JSON object from web scraping.
@@ -147,59 +318,9 @@ def clean_json(raw_json, link):
 
         if data:
             logging.debug(f"[CLEAN_JSON] Processing query {idx} with data for link: {link}")
-            # Extract fields with safe handling for empty lists and dictionaries
-            contacts = data.get('contacts', [{}])
-            contact_firstName = contacts[0].get('firstName', '') if contacts else ''
-            contact_lastName = contacts[0].get('lastName', '') if contacts else ''
-            
-            locations = data.get('locations', [{}])
-            location_postalCode = locations[0].get('postalCode', '') if locations else ''
-            location_city = locations[0].get('city', '') if locations else ''
-            location_cantonCode = locations[0].get('cantonCode', '') if locations else ''
-            location_countryCode = locations[0].get('countryCode', '') if locations else ''
-
-            # Format list fields into comma-separated strings
-            employment_grades = ", ".join(map(str, data.get('employmentGrades', [])))
-            employment_position_ids = ", ".join(data.get('employmentPositionIds', []))
-            employment_type_ids = ", ".join(data.get('employmentTypeIds', []))
-
-            # Handle languageSkills (list of dictionaries)
-            language_skills = data.get('languageSkills', [])
-            formatted_language_skills = ", ".join(
-                [f"{skill.get('language', '')} (Level {skill.get('level', '')})" for skill in language_skills]
-            )
-
-            # Clean and format the data
-            cleaned_entry = {
-                'id': data.get('id'),
-                'externalUrl': data.get('applicationOptions', {}).get('externalUrl', ''),
-                'logo': data.get('logo', ''),
-                'company_id': data.get('company', {}).get('id', ''),
-                'company_name': data.get('company', {}).get('name', ''),
-                'contact_firstName': contact_firstName,
-                'contact_lastName': contact_lastName,
-                'headhunterApplicationAllowed': data.get('headhunterApplicationAllowed', False),
-                'initialPublicationDate': data.get('initialPublicationDate', ''),
-                'isActive': data.get('isActive', False),
-                'isPaid': data.get('isPaid', False),
-                'language_skills': formatted_language_skills,  # Formatted list of dictionaries
-                'locations_postalCode': location_postalCode,
-                'locations_city': location_city,
-                'locations_cantonCode': location_cantonCode,
-                'locations_countryCode': location_countryCode,
-                'publicationDate': data.get('publicationDate', ''),
-                'publicationEndDate': data.get('publicationEndDate', ''),
-                'skills': ", ".join(data.get('skills', [])),  # Format list into a comma-separated string
-                'synonym': data.get('synonym', ''),
-                'template_lead': data.get('template', {}).get('lead', ''),
-                'template_title': data.get('title', ''),
-                'template_text': data.get('template', {}).get('text', ''),
-                'industry': data.get('industry', ''),
-                'regionID': data.get('regionId', ''),
-                'employmentGrades': employment_grades,
-                'employmentPositionIds': employment_position_ids,
-                'employmentTypeIds': employment_type_ids
-            }
+            # Flatten, convert and strip HTML in one pass over the compiled field spec
+            cleaned_entry = normalize_job(data)
+            cleaned_entry['content_hash'] = compute_content_hash(cleaned_entry)
 
             # Validate critical fields
             if not cleaned_entry['id']:
@@ -217,348 +338,127 @@ def clean_json(raw_json, link):
     logging.info(f"[CLEAN_JSON] Completed cleaning JSON for link: {link}. Total cleaned entries: {len(cleaned_data)}.")
     return cleaned_data
 
-def insert_jobinfo_orm(clean_data):
+def insert_jobinfo_orm(clean_data, writer=None):
     """
     Insert or update job entries using Django ORM.
+
+    Rows are upserted in batches by a `JobBulkWriter`. When no writer is given, a local
+    one is used and flushed before returning, so all entries are written in one transaction.
     Parameters:
-        clean_data (list of dict): Cleaned job data where each entry is a dictionary containing field-value pairs.
+        clean_data (list of dict): Cleaned job data as returned by `clean_json`, keyed by `Job` field names.
+        writer (JobBulkWriter, optional): A long-lived writer shared across calls. The caller flushes it.
     """
     logging.info("[INSERT_JOBINFO_ORM] Starting insertion of cleaned job data into database.")
-    
+
+    local_writer = writer is None
+    if local_writer:
+        writer = JobBulkWriter()
+
     for job in clean_data:
         job_id = job.get("id")
         if not job_id:
             logging.warning("[INSERT_JOBINFO_ORM] Skipping job entry without 'id'.")
-            number_of_jobs -= 1
             continue
 
-        # Extract and clean language_skills if needed
-        language_skills_list = job.get("language_skills", [])
-        language_skills_str = ", ".join(
-            [
-                f"{skill.get('language', '')} (Level {skill.get('level', '')})"
-                for skill in language_skills_list if isinstance(skill, dict)
-            ]
-        )
-
-        # Extract and clean skills if needed
-        skills_list = job.get("skills", [])
-        skills_str = ", ".join(skills_list)
-
-        # Clean template fields (remove HTML tags)
-        template_lead_text = job.get("template_lead") or ""
-        template_lead = BeautifulSoup(template_lead_text, "html.parser").get_text(strip=True)
-        template_text_text = job.get("template_text") or ""
-        template_text = BeautifulSoup(template_text_text, "html.parser").get_text(strip=True)
-        combined_template = f"{template_lead}\n\n{template_text}".strip()
-
-        # Convert industry value: if it's an empty string, set to None; else try to convert to int.
-        industry_value = job.get("industry")
-        if isinstance(industry_value, str):
-            industry_value = industry_value.strip()
-        if industry_value == "":
-            industry_value = None
-        else:
-            try:
-                industry_value = int(industry_value)
-            except ValueError:
-                industry_value = None  # Or handle it as needed
-
-        # Convert  employmentPositionIds: if it's an empty string, set to None; else try to convert to int.
-        employmentPositionIds_value = job.get("employmentPositionIds")
-        if isinstance(employmentPositionIds_value, str):
-            employmentPositionIds_value = employmentPositionIds_value.strip()
-        if employmentPositionIds_value == "":
-            employmentPositionIds_value = None
-        else:
-            try:
-                employmentPositionIds_value = int(employmentPositionIds_value)
-            except ValueError:
-                employmentPositionIds_value = None  # Or handle it as needed
-            
-        
-        # Convert  employmentTypeIds: if it's an empty string, set to None; else try to convert to int.
-        employmentTypeIds_value = job.get("employmentTypeIds")
-        if isinstance(employmentTypeIds_value, str):
-            employmentTypeIds_value = employmentTypeIds_value.strip()
-        if employmentTypeIds_value == "":
-            employmentTypeIds_value = None
-        else:
-            try:
-                employmentTypeIds_value = int(employmentTypeIds_value)
-            except ValueError:
-                employmentTypeIds_value = None  # Or handle it as needed
-            
-        # Convert  regionID: if it's an empty string, set to None; else try to convert to int.
-        regionID_value = job.get("regionID")
-        if isinstance(regionID_value, str):
-            regionID_value = regionID_value.strip()
-        if regionID_value == "":
-            regionID_value = None
-        else:
-            try:
-                regionID_value = int(regionID_value)
-            except ValueError:
-                regionID_value = None  # Or handle it as needed
-        
         try:
-            Job.objects.update_or_create(
-                id=job_id,
-                defaults={
-                    "externalUrl": job.get("externalUrl"),
-                    "logo": job.get("logo"),
-                    "company_id": job.get("company_id"),
-                    "company_name": job.get("company_name"),
-                    "contact_firstName": job.get("contact_firstName"),
-                    "contact_lastName": job.get("contact_lastName"),
-                    "headhunterApplicationAllowed": job.get("headhunterApplicationAllowed", False),
-                    "initialPublicationDate": job.get("initialPublicationDate"),
-                    "isActive": job.get("isActive", False),
-                    "isPaid": job.get("isPaid", False),
-                    "language_skills": language_skills_str,
-                    "postalCode": job.get("postalCode"),
-                    "city": job.get("city"),
-                    "cantonCode": job.get("cantonCode"),
-                    "countryCode": job.get("countryCode"),
-                    "publicationDate": job.get("publicationDate"),
-                    "publicationEndDate": job.get("publicationEndDate"),
-                    "skills": skills_str,
-                    "synonym": job.get("synonym"),
-                    "template_lead": combined_template,
-                    "template_title": job.get("template_title"),
-                    "industry": industry_value,
-                    "regionID": regionID_value,
-                    "employmentPositionIds": employmentPositionIds_value,
-                    "employmentTypeIds": employmentTypeIds_value,
-                    "employmentGrades": job.get("employmentGrades"),
-                },
-            )
-            logging.debug(f"[INSERT_JOBINFO_ORM] Inserted/updated job ID: {job_id}")
+            writer.add(job)
+            logging.debug(f"[INSERT_JOBINFO_ORM] Queued job ID: {job_id}")
         except Exception as e:
             logging.error(f"[INSERT_JOBINFO_ORM] Error inserting job {job_id}: {e}")
 
+    if local_writer:
+        writer.flush()
+
 
-def insert_jobinfo_sqlite(clean_data, db_path=DATABASES['jobs']):
+def insert_jobinfo_sqlite(clean_data, db_path=DATABASES['jobs'], writer=None):
     """
     Inserts cleaned job data into a SQLite database, adding new columns dynamically if they don't exist.
-    Removes HTML tags from template_lead and template_text and appends template_text to template_lead.
+
+    Rows are written in batches by a `SqliteJobWriter`. When no writer is given, a local one
+    is opened on `db_path` and closed before returning.
 
     Parameters:
-        clean_data (list of dict): Cleaned job data where each entry is a dictionary containing field-value pairs.
+        clean_data (list of dict): Cleaned job data as returned by `clean_json`, keyed by column names.
         db_path (str): Path to the SQLite database file.
+        writer (SqliteJobWriter, optional): A long-lived writer shared across calls. The caller closes it.
     """
     logging.info("[INSERT_JOBINFO_SQLITE] Starting insertion of cleaned job data into SQLite database.")
-    
-    # Connect to the SQLite database
-    conn = sqlite3.connect(db_path, timeout=10)
-    cursor = conn.cursor()
-
-    # Define the desired table schema
-    table_schema = {
-        'id': 'TEXT PRIMARY KEY',
-        'externalUrl': 'TEXT',
-        'logo': 'TEXT',
-        'company_id': 'TEXT',
-        'company_name': 'TEXT',
-        'contact_firstName': 'TEXT',
-        'contact_lastName': 'TEXT',
-        'headhunterApplicationAllowed': 'BOOLEAN',
-        'initialPublicationDate': 'TEXT',
-        'isActive': 'BOOLEAN',
-        'isPaid': 'BOOLEAN',
-        'language_skills': 'TEXT',
-        'postalCode': 'TEXT',
-        'city': 'TEXT',
-        'cantonCode': 'TEXT',
-        'countryCode': 'TEXT',
-        'publicationDate': 'TEXT',
-        'publicationEndDate': 'TEXT',
-        'skills': 'TEXT',
-        'synonym': 'TEXT',
-        'template_lead': 'TEXT',
-        'template_title': 'TEXT',
-        'industry': 'INTEGER',
-        'regionID': 'INTEGER',
-        'employmentPositionIds': 'INTEGER',
-        'employmentTypeIds': 'INTEGER',
-        'employmentGrades': 'TEXT'
-    }
-
-    # Create the table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id TEXT PRIMARY KEY,
-            externalUrl TEXT,
-            logo TEXT,
-            company_id TEXT,
-            company_name TEXT,
-            contact_firstName TEXT,
-            contact_lastName TEXT,
-            headhunterApplicationAllowed BOOLEAN,
-            initialPublicationDate TEXT,
-            isActive BOOLEAN,
-            isPaid BOOLEAN,
-            language_skills TEXT,
-            postalCode TEXT,
-            city TEXT,
-            cantonCode TEXT,
-            countryCode TEXT,
-            publicationDate TEXT,
-            publicationEndDate TEXT,
-            skills TEXT,
-            synonym TEXT,
-            template_lead TEXT,
-            template_title TEXT,
-            industry INTEGER,
-            regionID INTEGER,
-            employmentPositionIds INTEGER,
-            employmentTypeIds INTEGER,
-            employmentGrades TEXT
-        )
-    ''')
-
-    # Check and add any missing columns dynamically
-    cursor.execute("PRAGMA table_info(jobs)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
-    for column, column_type in table_schema.items():
-        if column not in existing_columns:
-            cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
-            logging.debug(f"[INSERT_JOBINFO_SQLITE] Added missing column '{column}' to 'jobs' table.")
-
-    # Prepare the insert query dynamically based on the schema
-    insert_query = f'''
-        INSERT OR REPLACE INTO jobs ({', '.join(table_schema.keys())})
-        VALUES ({', '.join(['?' for _ in table_schema])})
-    '''
-
-    # Insert data into the database
-    for job in clean_data:
-        job_id = job.get("id")
-        if not job_id:
-            logging.warning("[INSERT_JOBINFO_SQLITE] Skipping job entry without 'id'.")
-            continue
 
-        try:
-            # Extract and clean `language_skills`
-            language_skills_list = job.get("language_skills", [])
-            language_skills_str = ", ".join(
-                [
-                    f"{skill.get('language', '')} (Level {skill.get('level', '')})"
-                    for skill in language_skills_list if isinstance(skill, dict)
-                ]
-            )
-
-            # Extract and clean `skills`
-            skills_list = job.get("skills", [])
-            skills_str = ", ".join(skills_list)
-
-            # Clean and combine template fields
-            template_lead_text = job.get("template_lead") or "" # Handle None values
-            template_lead = BeautifulSoup(template_lead_text, "html.parser").get_text(strip=True)
-            template_text_text = job.get("template_text") or "" # Handle None values
-            template_text = BeautifulSoup(template_text_text, "html.parser").get_text(strip=True)
-
-            combined_template = f"{template_lead}\n\n{template_text}".strip()
-
-            # Convert table_schema.keys() to a list to allow indexing
-            schema_keys = list(table_schema.keys())
-
-            # Prepare data for insertion
-            row_data = [
-                job.get(column, None) for column in schema_keys
-            ]
-            row_data[schema_keys.index("language_skills")] = language_skills_str
-            row_data[schema_keys.index("skills")] = skills_str
-            row_data[schema_keys.index("template_lead")] = combined_template
-
-            # Execute the insert
-            cursor.execute(insert_query, row_data)
-            logging.debug(f"[INSERT_JOBINFO_SQLITE] Inserted job ID: {job_id} into SQLite database.")
-        except Exception as e:
-            logging.error(f"[INSERT_JOBINFO_SQLITE] Error inserting job {job_id}: {e}")
-            logging.debug(traceback.format_exc())
+    local_writer = writer is None
+    if local_writer:
+        writer = SqliteJobWriter(db_path)
+
+    try:
+        for job in clean_data:
+            job_id = job.get("id")
+            if not job_id:
+                logging.warning("[INSERT_JOBINFO_SQLITE] Skipping job entry without 'id'.")
+                continue
+
+            try:
+                writer.add(job)
+                logging.debug(f"[INSERT_JOBINFO_SQLITE] Queued job ID: {job_id} for the SQLite database.")
+            except Exception as e:
+                logging.error(f"[INSERT_JOBINFO_SQLITE] Error inserting job {job_id}: {e}")
+                logging.debug(traceback.format_exc())
+    finally:
+        if local_writer:
+            writer.close()
 
-    # Commit changes and close the connection
-    conn.commit()
-    conn.close()
     logging.info(f"[INSERT_JOBINFO_SQLITE] Inserted {len(clean_data)} job entries into SQLite database.")
 
 def get_scraped_links():
     """
-    Retrieve all previously scraped job links from the SQLite database.
-    
+    Retrieve the previously scraped jobs of the SQLite database as a seen-ID index.
+
+    The index is persisted under `SEEN_INDEX_DIR` and only rebuilt from the `jobs` table
+    when it no longer matches it (see `load_seen_index`), so startup does not read every ID.
+
     Returns:
-        set: A set of job URLs that have already been scraped.
+        SeenJobLinks: A set-like view supporting `link in`, `add` and `issuperset` on job links.
     """
-    logging.info("[GET_SCRAPED_LINKS] Starting to fetch scraped links from SQLite database.")
+    logging.info("[GET_SCRAPED_LINKS] Starting to load scraped job IDs for the SQLite database.")
 
-    scraped_links = set()
-
-    try:
-        conn = sqlite3.connect(DATABASES['jobs'])
-    except sqlite3.Error as e:
-        logging.error(f"[GET_SCRAPED_LINKS] Failed to connect to SQLite database: {e}")
-        return scraped_links  # Return empty set on failure
-    
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM jobs")
-        id_list = [row[0] for row in cursor.fetchall()]
-        logging.info(f"[GET_SCRAPED_LINKS] Retrieved {len(id_list)} job IDs from the database.")
-    except sqlite3.Error as e:
-        logging.error(f"[GET_SCRAPED_LINKS] Failed to execute SELECT query: {e}")
-        conn.close()
-        return scraped_links  # Return empty set on failure
-    
-    if not id_list:
-        logging.warning("[GET_SCRAPED_LINKS] No job IDs found in the database.")   
-    else:
-        for job_id in id_list:
-            if not job_id:
-                logging.warning("[GET_SCRAPED_LINKS] Encountered a job entry with missing ID. Skipping.")
-                continue  # Skip entries without a valid ID
+    def load_ids():
+        with sqlite3.connect(DATABASES['jobs']) as conn:
+            for row in conn.execute("SELECT id FROM jobs WHERE id IS NOT NULL"):
+                yield row[0]
 
-            link = f"https://www.jobup.ch/en/jobs/detail/{job_id}/?source=vacancy_search"
-            scraped_links.add(link)
+    def load_marker():
+        with sqlite3.connect(DATABASES['jobs']) as conn:
+            return table_marker(conn.cursor(), "jobs")
 
-        logging.info(f"[GET_SCRAPED_LINKS] Total scraped links collected: {len(scraped_links)}.")
-    
     try:
-        conn.close()
+        index = load_seen_index("jobs_sqlite", load_ids, load_marker)
     except sqlite3.Error as e:
-        logging.error(f"[GET_SCRAPED_LINKS] Failed to close SQLite connection: {e}")
+        logging.error(f"[GET_SCRAPED_LINKS] Failed to read job IDs from the SQLite database: {e}")
+        index = load_seen_index("jobs_sqlite", lambda: [], lambda: (0, None))
 
-    logging.info("[GET_SCRAPED_LINKS] Completed fetching scraped links.")
-    return scraped_links    
+    logging.info(f"[GET_SCRAPED_LINKS] Completed loading {len(index)} scraped job IDs.")
+    return SeenJobLinks(index, parse_job_id)
 
 def get_scraped_links_orm():
     """
-    Retrieve all previously scraped job links from the database using Django ORM.
+    Retrieve the previously scraped jobs of the database as a seen-ID index, using Django ORM.
+
+    The index is persisted under `SEEN_INDEX_DIR` and only rebuilt from the Job table when
+    it no longer matches it (see `load_seen_index`). Pass its `record` method as an
+    `on_flush` hook to keep it up to date as jobs are written; the cleaning step removes
+    the deleted jobs with `forget_seen_ids`.
 
     Returns:
-        set: A set of job URLs that have already been scraped.
+        SeenJobLinks: A set-like view supporting `link in`, `add` and `issuperset` on job links.
     """
-    from .models import Job  # Import the Job model from your app
+    logging.info("[GET_SCRAPED_LINKS_ORM] Starting to load scraped job IDs using Django ORM.")
 
-    logging.info("[GET_SCRAPED_LINKS_ORM] Starting to fetch scraped links using Django ORM.")
+    def load_marker():
+        with connection.cursor() as cursor:
+            return table_marker(cursor, Job._meta.db_table)
 
-    try:
-        # Get all job IDs from the Job model using Django's ORM.
-        job_ids = Job.objects.values_list("id", flat=True)
-        
-        # Build the set of scraped links from job IDs
-        scraped_links = {
-            f"https://www.jobup.ch/en/jobs/detail/{job_id}/?source=vacancy_search"
-            for job_id in job_ids if job_id
-        }
-        
-        logging.info(f"[GET_SCRAPED_LINKS_ORM] Retrieved {len(scraped_links)} scraped links.")
-    except Exception as e:
-        logging.error(f"[GET_SCRAPED_LINKS_ORM] Failed to fetch job IDs: {e}")
-        scraped_links = set()
+    index = load_seen_index("jobs", Job.objects.values_list("id", flat=True).iterator, load_marker)
 
-    logging.info("[GET_SCRAPED_LINKS_ORM] Completed fetching scraped links.")
-    return scraped_links
+    logging.info(f"[GET_SCRAPED_LINKS_ORM] Completed loading {len(index)} scraped job IDs.")
+    return SeenJobLinks(index, parse_job_id)
 
 def scrape_and_store_jobs(max_pages=100, published_since=1, db_path=DATABASES['jobs']):
     """
@@ -572,12 +472,19 @@ def scrape_and_store_jobs(max_pages=100, published_since=1, db_path=DATABASES['j
     
     scraped_links = get_scraped_links()  # Track already-scraped links
 
+    # One connection for the whole run; rows are committed in batches, at least once per page.
+    # Committed jobs are recorded in the persistent seen-ID index.
+    writer = SqliteJobWriter(db_path, on_flush=[scraped_links.record, commit_cached])
+
     for page_number in range(1, max_pages + 1):
         try:
             logging.info(f"[SCRAPE_AND_STORE_JOBS] Scraping page {page_number}...")
             
             # Get job links for the current page
             job_links = get_links(page_number, published_since)
+            if job_links is None:
+                logging.error(f"[SCRAPE_AND_STORE_JOBS] Page {page_number} could not be fetched. Exiting loop.")
+                break
             
             # Check if the current page redirects or repeats
             if not job_links or scraped_links.issuperset(job_links):
@@ -592,6 +499,9 @@ def scrape_and_store_jobs(max_pages=100, published_since=1, db_path=DATABASES['j
                 try:
                     # Fetch and clean job info
                     raw_info = get_job_info(link)
+                    if raw_info == JOB_NOT_MODIFIED:
+                        scraped_links.add(link)
+                        continue
                     if not raw_info:
                         logging.warning(f"[SCRAPE_AND_STORE_JOBS] No job info found for {link}. Skipping.")
                         continue
@@ -602,7 +512,7 @@ def scrape_and_store_jobs(max_pages=100, published_since=1, db_path=DATABASES['j
                         continue
                     
                     # Insert into SQLite
-                    insert_jobinfo_sqlite(clean_info, db_path)
+                    insert_jobinfo_sqlite(clean_info, db_path, writer)
                     scraped_links.add(link)  # Mark as scraped
                     logging.info(f"[SCRAPE_AND_STORE_JOBS] Successfully inserted job from {link} into database.")
                 
@@ -610,84 +520,362 @@ def scrape_and_store_jobs(max_pages=100, published_since=1, db_path=DATABASES['j
                     logging.error(f"[SCRAPE_AND_STORE_JOBS] Error processing job link {link}: {e}")
                     logging.debug(traceback.format_exc())
             
+            writer.flush()
+
             # Respectful scraping
-            time.sleep(5)
+            time.sleep(SCRAPER_PAGE_DELAY)
         
         except Exception as e:
             logging.error(f"[SCRAPE_AND_STORE_JOBS] Error on page {page_number}: {e}")
             logging.debug(traceback.format_exc())
             continue
 
+    writer.close()
+    scraped_links.close()
     logging.info("[SCRAPE_AND_STORE_JOBS] Scraping completed.")
 
 
-def scrape_and_store_jobs_orm(max_pages=100, published_since=3):
+def scrape_job_link_orm(link, writer, checkpoint=None):
+    """
+    Fetch, clean and queue for insertion the job behind one detail link.
+
+    Args:
+        link (str): The job detail link.
+        writer (JobBulkWriter): The writer the cleaned job is added to.
+        checkpoint (ScrapeCheckpoint, optional): Run state updated with the outcome of the link.
+
+    Returns:
+        bool: True if the link was processed (including unchanged pages), False if it failed.
+    """
+    try:
+        # Fetch job info from the link.
+        raw_info = get_job_info(link)
+        if raw_info == JOB_NOT_MODIFIED:
+            if checkpoint:
+                checkpoint.mark_done([link])
+            return True
+        if not raw_info:
+            logging.warning(f"[SCRAPE_AND_STORE_JOBS_ORM] No job info found for {link}. Skipping.")
+            if checkpoint:
+                checkpoint.mark_failed(link, "No job info found")
+            return False
+
+        # Clean and format the fetched JSON data.
+        clean_info = clean_json(raw_info, link)
+        if not clean_info:
+            logging.warning(f"[SCRAPE_AND_STORE_JOBS_ORM] Cleaned data is empty for {link}. Skipping insertion.")
+            if checkpoint:
+                checkpoint.mark_failed(link, "Cleaned data is empty")
+            return False
+
+        # Insert or update the job entry using Django ORM.
+        insert_jobinfo_orm(clean_info, writer)
+        logging.info(f"[SCRAPE_AND_STORE_JOBS_ORM] Successfully processed job from {link}.")
+        return True
+
+    except Exception as e:
+        logging.error(f"[SCRAPE_AND_STORE_JOBS_ORM] Error processing job link {link}: {e}")
+        logging.debug(traceback.format_exc())
+        if checkpoint:
+            checkpoint.mark_failed(link, e)
+        return False
+
+def scrape_and_store_jobs_orm(max_pages=100, published_since=3, resume=True):
     """
     Scrape job postings from Jobup and store them using Django ORM.
 
-    This function uses the original get_links, get_job_info, and clean_json functions
-    (which remain unchanged) and replaces the raw SQLite insertion with an ORM-based
-    insertion (via insert_jobinfo_orm).
+    Each result page is read by `get_listing_page`, which returns the page's job links
+    together with their publication dates. Every new link is then processed by
+    `scrape_job_link_orm`: `get_job_info` fetches the page through the shared, cached HTTP
+    session (a page unchanged since its job was stored is skipped without parsing) and
+    decodes only the job fields of its React query state with the selective decoder,
+    `clean_json` maps them to the model fields with `normalize_job`, and the job is upserted
+    in batches by a `JobBulkWriter` flushed at the end of every page.
+
+    Progress is checkpointed in the run-state tables: if the previous run was interrupted,
+    its pending and failed links are processed first and discovery continues from the page
+    after the last one recorded.
+
+    Pagination also stops at the first page whose postings were all published before the
+    query's publication-date watermark. The periodic full sweeps ignore both stop conditions
+    and walk every page of the `published_since` window, but still stop at a page that only
+    repeats links listed earlier in the run (the search serves an earlier page again past
+    the last one). Full sweeps also refetch the jobs already stored, which is how edited
+    postings get refreshed.
+
+    If a result page cannot be fetched, pagination stops there and the run is left open
+    (neither the checkpoint is finished nor the watermark advanced), so that the next run
+    resumes from that page.
 
     Args:
         max_pages (int): Maximum number of pages to scrape.
         published_since (int): The number of days since publication to filter job postings.
+        resume (bool): Resume an interrupted run instead of starting over from page 1.
     """
     logging.info("[SCRAPE_AND_STORE_JOBS_ORM] Starting job scraping process using Django ORM.")
 
     # Retrieve already scraped job links using the ORM-based helper.
     scraped_links = get_scraped_links_orm()
 
+    checkpoint = ScrapeCheckpoint.start("sequential", max_pages, published_since, resume)
+    watermark = PublicationWatermark.load(build_search_url(1, published_since))
+
+    # Jobs are upserted in batches; the writer is flushed at the end of every page.
+    # Links are marked done in the run state, and recorded in the seen-ID index, only once their job is committed.
+    writer = JobBulkWriter(on_flush=[checkpoint.mark_jobs_done, scraped_links.record, watermark.observe_jobs, commit_cached])
+    inserted_jobs_counter = 0
+
+    # Finish the frontier left by an interrupted run before discovering new pages.
+    for link in checkpoint.resumable_links():
+        if scrape_job_link_orm(link, writer, checkpoint):
+            inserted_jobs_counter += 1
+            scraped_links.add(link)
+    writer.flush()
+
+    # Links listed by the result pages of this run, to detect a page served again.
+    listed_links = set()
+
     # Loop over pages to scrape jobs.
-    for page_number in range(1, max_pages + 1):
+    for page_number in range(checkpoint.start_page, max_pages + 1):
         try:
             logging.info(f"[SCRAPE_AND_STORE_JOBS_ORM] Scraping page {page_number}...")
             
             # Get job links from the current page.
-            job_links = get_links(page_number, published_since)
+            page = get_listing_page(page_number, published_since)
+            if page is None:
+                checkpoint.interrupt(f"page {page_number} could not be fetched")
+                break
+            job_links, publication_dates = page
             
             # If no new links are found, or if all links are already scraped, exit the loop.
-            if not job_links or scraped_links.issuperset(job_links):
+            # Full sweeps walk the whole window, to pick up postings missed by earlier runs.
+            if not job_links or (scraped_links.issuperset(job_links) and not watermark.full_sweep):
                 logging.info("[SCRAPE_AND_STORE_JOBS_ORM] No new links found. Exiting loop.")
                 break
-            
-            inserted_jobs_counter = 0
-            for link in job_links:
-                if link in scraped_links:
-                    logging.info(f"[SCRAPE_AND_STORE_JOBS_ORM] Skipping already-scraped link: {link}")
-                    continue
 
-                try:
-                    # Fetch job info from the link.
-                    raw_info = get_job_info(link)
-                    if not raw_info:
-                        logging.warning(f"[SCRAPE_AND_STORE_JOBS_ORM] No job info found for {link}. Skipping.")
-                        continue
+            # Past the last page, the search serves an earlier page again: stop, full sweep or not.
+            if listed_links.issuperset(job_links):
+                logging.info("[SCRAPE_AND_STORE_JOBS_ORM] Page only repeats links listed earlier in this run. Exiting loop.")
+                break
+            page_links = [link for link in dict.fromkeys(job_links) if link not in listed_links]
+            listed_links.update(page_links)
 
-                    # Clean and format the fetched JSON data.
-                    clean_info = clean_json(raw_info, link)
-                    if not clean_info:
-                        logging.warning(f"[SCRAPE_AND_STORE_JOBS_ORM] Cleaned data is empty for {link}. Skipping insertion.")
-                        continue
+            # Results are newest first: past the watermark, the remaining pages were walked by earlier runs.
+            if watermark.page_exhausted(publication_dates):
+                logging.info("[SCRAPE_AND_STORE_JOBS_ORM] All postings on this page are older than the watermark. Exiting loop.")
+                break
+
+            # Full sweeps also refetch stored jobs, so edited postings are updated. Unchanged pages
+            # cost a conditional GET and unchanged jobs are not rewritten (see `JobBulkWriter`).
+            new_links = page_links if watermark.full_sweep else [link for link in page_links if link not in scraped_links]
+            checkpoint.record_page(page_number, new_links, [parse_job_id(link) for link in new_links])
 
-                    # Insert or update the job entry using Django ORM.
-                    insert_jobinfo_orm(clean_info)
+            for link in new_links:
+                if scrape_job_link_orm(link, writer, checkpoint):
                     inserted_jobs_counter += 1
-                    
+
                     # Mark this link as processed.
                     scraped_links.add(link)
-                    logging.info(f"[SCRAPE_AND_STORE_JOBS_ORM] Successfully processed job from {link}.")
-                
-                except Exception as e:
-                    logging.error(f"[SCRAPE_AND_STORE_JOBS_ORM] Error processing job link {link}: {e}")
-                    logging.debug(traceback.format_exc())
-            
+
+            writer.flush()
+
             # Pause between pages for respectful scraping.
-            time.sleep(5)
+            time.sleep(SCRAPER_PAGE_DELAY)
         
         except Exception as e:
             logging.error(f"[SCRAPE_AND_STORE_JOBS_ORM] Error on page {page_number}: {e}")
             logging.debug(traceback.format_exc())
             continue
 
-    logging.info("[SCRAPE_AND_STORE_JOBS_ORM] Job scraping process completed. Inserted jobs {inserted_jobs_counter} new jobs.")
+    writer.flush()
+    # An interrupted run stays open, to be resumed, and does not move the watermark.
+    if not checkpoint.interrupted:
+        checkpoint.finish()
+        watermark.commit()
+    scraped_links.close()
+    logging.info(f"[SCRAPE_AND_STORE_JOBS_ORM] Job scraping process {'interrupted' if checkpoint.interrupted else 'completed'}. Processed {inserted_jobs_counter} jobs.")
+
+def discover_jobs_to_queue_orm(queue, max_pages=100, published_since=3, scraped_links=None):
+    """
+    Paginate the search results and enqueue the new job links for the distributed workers.
+
+    Links already stored or still outstanding in the queue are skipped, and discovery stops
+    at the first page without any new link, like the sequential scraper.
+
+    Args:
+        queue (WorkQueue): The shared work queue.
+        max_pages (int): Maximum number of pages to scrape.
+        published_since (int): The number of days since publication to filter job postings.
+        scraped_links (SeenJobLinks, optional): Seen-ID index of stored jobs. Loaded if None.
+
+    Returns:
+        int: The number of links enqueued.
+    """
+    scraped_links = scraped_links if scraped_links is not None else get_scraped_links_orm()
+    enqueued = 0
+
+    for page_number in range(1, max_pages + 1):
+        try:
+            logging.info(f"[DISCOVER_JOBS_TO_QUEUE_ORM] Scraping page {page_number}...")
+            job_links = get_links(page_number, published_since)
+            if job_links is None:
+                logging.error(f"[DISCOVER_JOBS_TO_QUEUE_ORM] Page {page_number} could not be fetched. Exiting loop.")
+                break
+            job_links = list(dict.fromkeys(job_links))
+            unseen_links = [link for link in job_links if link not in scraped_links]
+            outstanding = queue.outstanding(unseen_links) if unseen_links else set()
+            new_links = [link for link in unseen_links if link not in outstanding]
+            if not new_links:
+                logging.info("[DISCOVER_JOBS_TO_QUEUE_ORM] No new links found. Exiting loop.")
+                break
+
+            enqueued += queue.enqueue(new_links, [parse_job_id(link) for link in new_links])
+
+            # Pause between pages for respectful scraping.
+            time.sleep(SCRAPER_PAGE_DELAY)
+
+        except Exception as e:
+            logging.error(f"[DISCOVER_JOBS_TO_QUEUE_ORM] Error on page {page_number}: {e}")
+            logging.debug(traceback.format_exc())
+            continue
+
+    logging.info(f"[DISCOVER_JOBS_TO_QUEUE_ORM] Enqueued {enqueued} new job links.")
+    return enqueued
+
+def run_scrape_worker_orm(
+    worker_id=None,
+    discover=False,
+    max_pages=100,
+    published_since=3,
+    batch_size=SCRAPER_LEASE_BATCH_SIZE,
+    poll_interval=SCRAPER_WORKER_POLL_INTERVAL,
+    idle_timeout=SCRAPER_WORKER_IDLE_TIMEOUT,
+    requests_per_second=SCRAPER_REQUESTS_PER_SECOND,
+):
+    """
+    Run one of N cooperating scrape workers sharing the `scrape_work_items` queue.
+
+    Any number of workers, on any machine using the same database, lease batches of job
+    links from the queue, fetch them and write the jobs, renewing their lease between
+    links. Items are marked done only once their job is committed; items held by a worker
+    that dies are leased again once their lease expires. With `discover`, the worker
+    first paginates the search results and fills the queue (running several discovering
+    workers is safe, only wasteful).
+
+    The workers share `requests_per_second` against Jobup: before every batch, a worker
+    sets its own rate to an equal share among the workers currently holding leases.
+
+    Args:
+        worker_id (str, optional): Identifies this worker in leases. Defaults to `<hostname>-<pid>`.
+        discover (bool): Paginate the search results and enqueue new links before working.
+        max_pages (int): Maximum number of pages to scrape when discovering.
+        published_since (int): The number of days since publication to filter job postings.
+        batch_size (int): Work items leased at a time.
+        poll_interval (float): Seconds to wait before polling an empty queue again.
+        idle_timeout (float): Seconds without leasable work after which the worker exits.
+        requests_per_second (float): Detail page request rate shared by all the workers.
+
+    Returns:
+        int: The number of jobs processed by this worker.
+    """
+    # Imported here: async_scraping imports this module.
+    from .async_scraping import TokenBucket
+
+    queue = WorkQueue(worker_id)
+    logging.info(f"[RUN_SCRAPE_WORKER_ORM] Starting scrape worker {queue.worker_id}.")
+
+    scraped_links = get_scraped_links_orm()
+    if discover:
+        discover_jobs_to_queue_orm(queue, max_pages, published_since, scraped_links)
+
+    writer = JobBulkWriter(on_flush=[queue.mark_jobs_done, scraped_links.record, commit_cached])
+    processed_jobs_counter = 0
+    idle_since = None
+    heartbeat_interval = queue.lease_seconds / 3
+    # No burst: the bursts of all the workers would add up.
+    bucket = TokenBucket(requests_per_second, 1)
+
+    try:
+        while True:
+            links = queue.lease(batch_size)
+            if not links:
+                idle_since = idle_since or time.monotonic()
+                if time.monotonic() - idle_since >= idle_timeout:
+                    logging.info(f"[RUN_SCRAPE_WORKER_ORM] No leasable work for {idle_timeout} seconds. Exiting.")
+                    break
+                time.sleep(poll_interval)
+                continue
+            idle_since = None
+            bucket.rate = requests_per_second / queue.active_workers()
+
+            last_heartbeat = time.monotonic()
+            for link in links:
+                if time.monotonic() - last_heartbeat >= heartbeat_interval:
+                    queue.heartbeat()
+                    last_heartbeat = time.monotonic()
+                bucket.wait()
+                if scrape_job_link_orm(link, writer, queue):
+                    processed_jobs_counter += 1
+
+            # Commit the batch; links whose job could not be written are still leased and count as failed.
+            writer.flush()
+            queue.fail_unfinished(links, "Job was not written")
+    finally:
+        writer.flush()
+        queue.release()
+        scraped_links.close()
+
+    logging.info(
+        f"[RUN_SCRAPE_WORKER_ORM] Worker {queue.worker_id} finished. Processed {processed_jobs_counter} jobs. "
+        f"Queue: {queue.stats()}."
+    )
+    return processed_jobs_counter
+
+def replay_archived_jobs_orm(since=None, processes=0):
+    """
+    Rebuild job rows from the raw page archive, without any network access.
+
+    The latest archived page of every job is parsed and cleaned again with the current
+    `parse_job_page` and `clean_json`, and written through the batched ORM writer. Jobs
+    whose content hash did not change are skipped by the writer, so a replay after a
+    `clean_json` change only rewrites the rows it affects.
+
+    Args:
+        since (float, optional): Only replay pages fetched at or after this Unix timestamp.
+        processes (int): Worker processes used for parsing (0 parses in this process).
+
+    Returns:
+        int: The number of archived pages that produced job records.
+    """
+    from .parse_pool import create_parse_pool, parse_and_clean
+
+    logging.info("[REPLAY_ARCHIVED_JOBS_ORM] Starting replay of the raw page archive.")
+    start_time = time.monotonic()
+
+    archive = get_page_archive(force=True)
+    pages = archive.iter_latest(since)
+    replayed = 0
+
+    with JobBulkWriter() as writer, (create_parse_pool(processes) if processes else nullcontext()) as pool:
+        # Pages are handed out in chunks so that memory stays bounded however large the archive is.
+        while True:
+            chunk = list(islice(pages, 256))
+            if not chunk:
+                break
+            urls = [url for _, url, _, _ in chunk]
+            contents = [content for _, _, _, content in chunk]
+            if pool is not None:
+                results = pool.map(parse_and_clean, contents, urls, chunksize=16)
+            else:
+                results = map(parse_and_clean, contents, urls)
+
+            for clean_info in results:
+                if clean_info:
+                    insert_jobinfo_orm(clean_info, writer)
+                    replayed += 1
+
+    logging.info(
+        f"[REPLAY_ARCHIVED_JOBS_ORM] Replay completed in {time.monotonic() - start_time:.2f} seconds. "
+        f"Pages with job data: {replayed}, jobs written: {writer.written - writer.unchanged}, unchanged: {writer.unchanged}."
+    )
+    return replayed
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from config.settings import JOBUP_BASE_URL, LINK_CHECK_CONCURRENCY, LINK_CHECK_CONCURRENCY_PER_HOST, LINK_CHECK_BREAKER_THRESHOLD
+from .http_session import get_session
+
+# Outcome of one link check.
+#   failed:    whether the job should be counted as expired.
+#   status:    HTTP status of the HEAD request, or None if it failed.
+#   final_url: the URL answering the request, following a redirect's Location.
+#   outage:    whether the failure points at the host rather than the job (timeout,
+#              connection error, 429 or 5xx).
+#   deferred:  whether the link was not checked because its host is down.
+LinkCheckResult = namedtuple("LinkCheckResult", ["failed", "status", "final_url", "outage", "deferred"], defaults=[False, False])
+REQUEST_FAILED = LinkCheckResult(True, None, None, outage=True)
+DEFERRED = LinkCheckResult(False, None, None, deferred=True)
+
+def _result(response, failed):
+    final_url = response.url
+    if response.is_redirect and response.headers.get("Location"):
+        final_url = urljoin(response.url, response.headers["Location"])
+    outage = response.status_code == 429 or response.status_code >= 500
+    return LinkCheckResult(failed, response.status_code, final_url, outage)
+
+def fallback_link(job_id):
+    return f"{JOBUP_BASE_URL}/en/jobs/detail/{job_id}/?source=vacancy_search"
+
+def has_valid_scheme(link):
+    return bool(link) and bool(urlparse(link).scheme)
+
+def check_job_link(session, job_id, link):
+    """
+    Check whether a job's application URL is still reachable.
+
+    A missing or scheme-less URL is replaced by the job's Jobup page. A URL failing SSL
+    verification is tried again with verification disabled.
+
+    Args:
+        session (requests.Session): The session used for the HEAD requests.
+        job_id (str): The job ID.
+        link (str | None): The job's external application URL.
+
+    Returns:
+        LinkCheckResult: The outcome; `failed` is True if the job should be deleted.
+    """
+    try:
+        # If link is missing or doesn't have a valid scheme, try the fallback URL.
+        if not has_valid_scheme(link):
+            logging.warning(f"[CHECK_JOB_LINK] Invalid URL for job ID: {job_id}, URL: {link}")
+            fallback = fallback_link(job_id)
+            try:
+                response = session.head(fallback, timeout=10)
+                if response.status_code < 400:
+                    # Fallback URL is valid, so skip deletion.
+                    logging.info(f"[CHECK_JOB_LINK] Fallback URL is valid: ID={job_id}, URL={fallback}")
+                    return _result(response, False)
+                return _result(response, True)
+            except requests.RequestException as e:
+                logging.error(f"[CHECK_JOB_LINK] Error checking fallback URL: ID={job_id}, URL={fallback}, Error={e}")
+                return REQUEST_FAILED
+
+        # Validate the provided URL.
+        response = session.head(link, timeout=10)
+        return _result(response, response.status_code >= 400)
+    except requests.exceptions.SSLError:
+        try:
+            # Retry with SSL verification disabled.
+            response = session.head(link, timeout=10, verify=False)
+            return _result(response, response.status_code >= 400)
+        except requests.RequestException as e:
+            logging.error(f"[CHECK_JOB_LINK] Error checking URL with verify=False: ID={job_id}, URL={link}, Error={e}")
+            return REQUEST_FAILED
+    except requests.RequestException as e:
+        logging.error(f"[CHECK_JOB_LINK] Error checking URL: ID={job_id}, URL={link}, Error={e}")
+        return REQUEST_FAILED
+
+def link_host(job_id, link):
+    """
+    Host contacted when checking a job's link: the host of the URL, or Jobup's for the fallback.
+    """
+    return urlparse(link if has_valid_scheme(link) else fallback_link(job_id)).netloc
+
+class HostCircuitBreaker:
+    """
+    Per-host circuit breaker of a link-check round.
+
+    A host opens the breaker after `threshold` outage results in a row (timeouts,
+    connection errors, 429 or 5xx answers); any other answer resets the count. Once open,
+    the host stays open for the rest of the round: its remaining links are not checked.
+
+    Args:
+        threshold (int): Outage results in a row after which a host is taken as down.
+    """
+    def __init__(self, threshold=LINK_CHECK_BREAKER_THRESHOLD):
+        self.threshold = threshold
+        self.open_hosts = set()
+        self._outages = {}
+
+    def is_open(self, host):
+        return host in self.open_hosts
+
+    def record(self, host, result):
+        if not result.outage:
+            self._outages[host] = 0
+            return
+        self._outages[host] = self._outages.get(host, 0) + 1
+        if self._outages[host] >= self.threshold and host not in self.open_hosts:
+            self.open_hosts.add(host)
+            logging.warning(f"[HOST_CIRCUIT_BREAKER] {host} looks down after {self._outages[host]} failures in a row; deferring its remaining links.")
+
+async def validate_job_links_async(
+    jobs,
+    max_concurrency=LINK_CHECK_CONCURRENCY,
+    max_concurrency_per_host=LINK_CHECK_CONCURRENCY_PER_HOST,
+    breaker_threshold=LINK_CHECK_BREAKER_THRESHOLD,
+):
+    """
+    Check the links of `jobs` concurrently, grouped by host.
+
+    Every check runs `check_job_link` on a pool of `max_concurrency` threads sharing the
+    pooled `link_checker` session, so connections to a host are reused. The links of each
+    host are worked off by at most `max_concurrency_per_host` workers, so a few slow hosts
+    cannot take every slot.
+
+    When a host's circuit breaker opens (see `HostCircuitBreaker`), its remaining links
+    are not checked, and the outage failures already seen on it are not trusted either:
+    both come back as deferred, to be checked again by the next round, instead of
+    waiting out a timeout per job and reporting all of them as expired.
+
+    Args:
+        jobs (list): `(job_id, link)` pairs.
+        max_concurrency (int): Checks running at the same time across all hosts.
+        max_concurrency_per_host (int): Checks running at the same time against one host.
+        breaker_threshold (int): Outage results in a row after which a host is taken as down.
+
+    Returns:
+        list: The `LinkCheckResult` of every job, in the order of `jobs`.
+    """
+    session = get_session("link_checker")
+    loop = asyncio.get_running_loop()
+    breaker = HostCircuitBreaker(breaker_threshold)
+    results = [None] * len(jobs)
+
+    hosts = {}
+    for index, (job_id, link) in enumerate(jobs):
+        hosts.setdefault(link_host(job_id, link), []).append(index)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="link-checker") as executor:
+        async def check_host(host, indexes):
+            pending = iter(indexes)
+
+            # The executor bounds the global concurrency; the workers bound the per-host one.
+            async def worker():
+                for index in pending:
+                    if breaker.is_open(host):
+                        results[index] = DEFERRED
+                        continue
+                    job_id, link = jobs[index]
+                    results[index] = await loop.run_in_executor(executor, check_job_link, session, job_id, link)
+                    breaker.record(host, results[index])
+
+            await asyncio.gather(*(worker() for _ in range(min(max_concurrency_per_host, len(indexes)))))
+
+            if breaker.is_open(host):
+                for index in indexes:
+                    if results[index].outage:
+                        results[index] = DEFERRED
+
+        await asyncio.gather(*(check_host(host, indexes) for host, indexes in hosts.items()))
+
+    deferred = sum(result.deferred for result in results)
+    if deferred:
+        logging.warning(f"[VALIDATE_JOB_LINKS] Deferred {deferred} links on {len(breaker.open_hosts)} unreachable hosts to the next run.")
+    return results
+
+def validate_job_links(jobs, **kwargs):
+    """
+    Synchronous entry point for `validate_job_links_async`.
+
+    Args:
+        jobs (list): `(job_id, link)` pairs.
+        **kwargs: Concurrency limits and breaker threshold forwarded to `validate_job_links_async`.
+
+    Returns:
+        list: The `LinkCheckResult` of every job, in the order of `jobs`.
+    """
+    return asyncio.run(validate_job_links_async(jobs, **kwargs))
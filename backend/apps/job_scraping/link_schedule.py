@@ -0,0 +1,137 @@
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from config.settings import (
+    LINK_CHECK_BASE_TTL_HOURS,
+    LINK_CHECK_MIN_TTL_HOURS,
+    LINK_CHECK_MAX_TTL_HOURS,
+    LINK_CHECK_AGE_HALVING_DAYS,
+    LINK_CHECK_MAX_FAILURES,
+    DELETE_CHUNK_SIZE,
+)
+from .models import Job, LinkCheck
+from .watermark import parse_publication_date
+
+def revalidation_ttl(consecutive_successes, age_days):
+    """
+    Time until a link that passed its last check is checked again.
+
+    The interval starts at `LINK_CHECK_BASE_TTL_HOURS`, doubles with every further
+    successful check in a row (stable links are checked less often), and halves for every
+    `LINK_CHECK_AGE_HALVING_DAYS` since the job's publication (older postings are closer
+    to being taken down). It is kept between `LINK_CHECK_MIN_TTL_HOURS` and
+    `LINK_CHECK_MAX_TTL_HOURS`.
+
+    Args:
+        consecutive_successes (int): Successful checks in a row, including the last one.
+        age_days (float | None): Days since the job's publication, if known.
+
+    Returns:
+        timedelta: The revalidation interval.
+    """
+    hours = LINK_CHECK_BASE_TTL_HOURS * 2 ** min(max(consecutive_successes - 1, 0), 16)
+    if age_days:
+        hours *= 0.5 ** (max(age_days, 0) / LINK_CHECK_AGE_HALVING_DAYS)
+    return timedelta(hours=min(max(hours, LINK_CHECK_MIN_TTL_HOURS), LINK_CHECK_MAX_TTL_HOURS))
+
+def jobs_due_for_check(now=None, check_all=False):
+    """
+    Select the jobs whose link must be checked: never checked, due for revalidation, or
+    whose `externalUrl` changed since the last check.
+
+    Args:
+        now (datetime, optional): Defaults to the current time.
+        check_all (bool): Select every job, ignoring the stored results.
+
+    Returns:
+        list: `(job_id, externalUrl)` pairs.
+    """
+    jobs = Job.objects.all()
+    if not check_all:
+        jobs = jobs.annotate(current_url=Coalesce("externalUrl", Value(""))).filter(
+            Q(link_check__isnull=True)
+            | Q(link_check__next_check_at__lte=now or timezone.now())
+            | ~Q(link_check__url=F("current_url"))
+        )
+    return list(jobs.values_list("id", "externalUrl"))
+
+def record_link_checks(jobs, results, now=None):
+    """
+    Store the results of a round of link checks and schedule the next check of every link.
+
+    A passed check resets the failure count and schedules the next one after
+    `revalidation_ttl`. A failed check increments the failure count; the job is reported
+    for deletion once it reaches `LINK_CHECK_MAX_FAILURES`, and is retried after
+    `LINK_CHECK_MIN_TTL_HOURS` until then. Deferred checks (host down) are not recorded:
+    the stored result is kept and the job stays due.
+
+    Args:
+        jobs (list): `(job_id, externalUrl)` pairs that were checked.
+        results (list): The `LinkCheckResult` of every job, in the same order.
+        now (datetime, optional): Time of the checks. Defaults to the current time.
+
+    Returns:
+        list: The IDs of the jobs to delete, in the order of `jobs`.
+    """
+    now = now or timezone.now()
+    job_ids = [job_id for job_id, _ in jobs]
+    previous = {}
+    published = {}
+    # Looked up in chunks to stay below SQLite's bound-variable limit.
+    for start in range(0, len(job_ids), DELETE_CHUNK_SIZE):
+        chunk = job_ids[start:start + DELETE_CHUNK_SIZE]
+        for check in LinkCheck.objects.filter(job_id__in=chunk).values("job_id", "url", "consecutive_failures", "consecutive_successes"):
+            previous[check["job_id"]] = check
+        published.update(Job.objects.filter(id__in=chunk).values_list("id", "publicationDate"))
+
+    checks = []
+    ids_to_delete = []
+    for (job_id, link), result in zip(jobs, results):
+        if result.deferred:
+            continue
+        last = previous.get(job_id)
+        # Counts only carry over while the link is the one checked before.
+        if last is None or last["url"] != (link or ""):
+            last = {"consecutive_failures": 0, "consecutive_successes": 0}
+
+        if result.failed:
+            failures, successes = last["consecutive_failures"] + 1, 0
+            next_check_at = now + timedelta(hours=LINK_CHECK_MIN_TTL_HOURS)
+            if failures >= LINK_CHECK_MAX_FAILURES:
+                ids_to_delete.append(job_id)
+        else:
+            failures, successes = 0, last["consecutive_successes"] + 1
+            publication_date = parse_publication_date(published.get(job_id))
+            age_days = (now - publication_date).total_seconds() / 86400 if publication_date else None
+            next_check_at = now + revalidation_ttl(successes, age_days)
+
+        checks.append(LinkCheck(
+            job_id=job_id,
+            url=link or "",
+            status=result.status,
+            final_url=result.final_url,
+            checked_at=now,
+            next_check_at=next_check_at,
+            consecutive_failures=failures,
+            consecutive_successes=successes,
+        ))
+
+    with transaction.atomic():
+        LinkCheck.objects.bulk_create(
+            checks,
+            update_conflicts=True,
+            unique_fields=["job"],
+            update_fields=["url", "status", "final_url", "checked_at", "next_check_at", "consecutive_failures", "consecutive_successes"],
+            batch_size=500,
+        )
+
+    logging.info(
+        f"[RECORD_LINK_CHECKS] Recorded {len(checks)} link checks, {sum(result.failed for result in results)} failed, "
+        f"{len(jobs) - len(checks)} deferred, {len(ids_to_delete)} jobs to delete."
+    )
+    return ids_to_delete
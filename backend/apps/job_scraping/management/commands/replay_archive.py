@@ -0,0 +1,46 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+import logging
+import traceback
+
+from backend.apps.job_scraping.jobs_functions import replay_archived_jobs_orm
+from config.logging_config import setup_logging
+
+class Command(BaseCommand):
+    help = "Re-parse the raw job page archive and update the jobs table, without any network access."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only replay pages fetched on or after this date (ISO format, e.g. 2025-01-31).",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=0,
+            help="Worker processes used for parsing (0 parses in this process).",
+        )
+
+    def handle(self, *args, **options):
+        # Setup logging configuration.
+        try:
+            setup_logging()
+            logging.info("[REPLAY ARCHIVE] Logging has been configured.")
+        except Exception as e:
+            logging.error(f"[REPLAY ARCHIVE] Failed to setup logging: {e}")
+            logging.debug(traceback.format_exc())
+
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.fromisoformat(options["since"]).timestamp()
+            except ValueError:
+                raise CommandError(f"Invalid --since date: {options['since']}")
+
+        try:
+            replayed = replay_archived_jobs_orm(since=since, processes=options["processes"])
+            self.stdout.write(self.style.SUCCESS(f"Replayed {replayed} archived job pages."))
+        except Exception as e:
+            logging.error(f"[REPLAY ARCHIVE] Replay failed: {e}")
+            logging.debug(traceback.format_exc())
+            raise CommandError(f"Replay failed: {e}")
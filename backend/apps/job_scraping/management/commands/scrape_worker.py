@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+import logging
+import traceback
+from dotenv import load_dotenv
+
+from backend.apps.job_scraping.jobs_functions import run_scrape_worker_orm
+from config.logging_config import setup_logging
+from config.settings import SCRAPER_LEASE_BATCH_SIZE, SCRAPER_WORKER_IDLE_TIMEOUT, SCRAPER_REQUESTS_PER_SECOND
+
+class Command(BaseCommand):
+    help = "Run a distributed scrape worker that fetches job links from the shared work queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--discover",
+            action="store_true",
+            help="Paginate the search results and enqueue new job links before working the queue.",
+        )
+        parser.add_argument(
+            "--worker-id",
+            help="Name of this worker in leases (defaults to <hostname>-<pid>).",
+        )
+        parser.add_argument(
+            "--max-pages",
+            type=int,
+            default=200,
+            help="Maximum number of search result pages to discover.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SCRAPER_LEASE_BATCH_SIZE,
+            help="Work items leased at a time.",
+        )
+        parser.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=SCRAPER_WORKER_IDLE_TIMEOUT,
+            help="Seconds without leasable work after which the worker exits.",
+        )
+        parser.add_argument(
+            "--requests-per-second",
+            type=float,
+            default=SCRAPER_REQUESTS_PER_SECOND,
+            help="Job page request rate shared by all the running workers.",
+        )
+
+    def handle(self, *args, **options):
+        # Load environment variables from .env file.
+        try:
+            load_dotenv()
+            logging.info("[SCRAPE WORKER] Environment variables loaded successfully.")
+        except Exception as e:
+            logging.error(f"[SCRAPE WORKER] Failed to load environment variables: {e}")
+            logging.debug(traceback.format_exc())
+
+        # Setup logging configuration.
+        try:
+            setup_logging()
+            logging.info("[SCRAPE WORKER] Logging has been configured.")
+        except Exception as e:
+            logging.error(f"[SCRAPE WORKER] Failed to setup logging: {e}")
+            logging.debug(traceback.format_exc())
+
+        try:
+            processed = run_scrape_worker_orm(
+                worker_id=options["worker_id"],
+                discover=options["discover"],
+                max_pages=options["max_pages"],
+                published_since=3,
+                batch_size=options["batch_size"],
+                idle_timeout=options["idle_timeout"],
+                requests_per_second=options["requests_per_second"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Worker processed {processed} jobs."))
+        except Exception as e:
+            logging.error(f"[SCRAPE WORKER] Worker failed: {e}")
+            logging.debug(traceback.format_exc())
+            raise CommandError(f"Worker failed: {e}")
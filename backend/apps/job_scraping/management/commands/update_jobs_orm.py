@@ -5,13 +5,46 @@ from dotenv import load_dotenv
 
 from backend.apps.job_scraping.clean_jobs_db import clean_databases_orm
 from backend.apps.job_scraping.jobs_functions import scrape_and_store_jobs_orm
+from backend.apps.job_scraping.async_scraping import scrape_and_store_jobs_orm_concurrent, scrape_sitemap_jobs_orm
 from backend.apps.job_scraping.create_embeddings import embed_jobs_orm
 from backend.settings import JOB_ADS_EMBEDDINGS_PATH
 from config.logging_config import setup_logging
+from config.settings import SCRAPER_PARSE_PROCESSES
 
 class Command(BaseCommand):
     help = "Orchestrate the scraping, cleaning, and embedding and deleting of job data from Jobup."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrent",
+            action="store_true",
+            help="Scrape with the asyncio engine (concurrent fetches, per-host rate limiting) instead of the sequential loop.",
+        )
+        parser.add_argument(
+            "--sitemap",
+            action="store_true",
+            help=(
+                "Discover new jobs, and jobs changed since the last completed sitemap run, from the Jobup sitemaps "
+                "instead of paginating the search results. Jobs outside SCRAPER_REGION_IDS are skipped."
+            ),
+        )
+        parser.add_argument(
+            "--no-resume",
+            action="store_true",
+            help="Start discovery from page 1 instead of resuming an interrupted scrape run.",
+        )
+        parser.add_argument(
+            "--recheck-all-links",
+            action="store_true",
+            help="Check every job's link while cleaning, not only the ones due for revalidation.",
+        )
+        parser.add_argument(
+            "--parse-processes",
+            type=int,
+            default=SCRAPER_PARSE_PROCESSES,
+            help="Worker processes for the parse stage of the --concurrent and --sitemap modes (0 parses in threads).",
+        )
+
     def handle(self, *args, **options):
         # Load environment variables from .env file.
         try:
@@ -32,7 +65,7 @@ class Command(BaseCommand):
         # Clean database and vector store.
         try:
             logging.info("[JOBUP SCRAPING] Starting database cleaning process.")
-            clean_databases_orm(chroma_path=JOB_ADS_EMBEDDINGS_PATH)
+            clean_databases_orm(chroma_path=JOB_ADS_EMBEDDINGS_PATH, check_all_links=options["recheck_all_links"])
             logging.info("[JOBUP SCRAPING] Database cleaning completed successfully.")
         except Exception as e:
             logging.error(f"[JOBUP SCRAPING] Database cleaning failed: {e}")
@@ -41,7 +74,17 @@ class Command(BaseCommand):
         # Scrape jobs.
         try:
             logging.info("[JOBUP SCRAPING] Starting job scraping process.")
-            scrape_and_store_jobs_orm(max_pages=200, published_since=3)
+            if options["sitemap"]:
+                scrape_sitemap_jobs_orm(parse_processes=options["parse_processes"])
+            elif options["concurrent"]:
+                scrape_and_store_jobs_orm_concurrent(
+                    max_pages=200,
+                    published_since=3,
+                    resume=not options["no_resume"],
+                    parse_processes=options["parse_processes"],
+                )
+            else:
+                scrape_and_store_jobs_orm(max_pages=200, published_since=3, resume=not options["no_resume"])
             logging.info("[JOBUP SCRAPING] Job scraping process completed successfully.")
         except Exception as e:
             logging.error(f"[JOBUP SCRAPING] Job scraping failed: {e}")
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(help_text="Scraping mode, e.g. 'sequential' or 'concurrent'", max_length=20)),
+                ('published_since', models.IntegerField(help_text='Publication-date filter of the search, in days')),
+                ('max_pages', models.IntegerField()),
+                ('pages_done', models.IntegerField(default=0, help_text='Last result page whose links are recorded')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('abandoned', 'Abandoned')], db_index=True, default='running', max_length=20)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'scrape_runs',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScrapeRunLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500)),
+                ('job_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0, help_text='Failed attempts so far')),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='links', to='job_scraping.scraperun')),
+            ],
+            options={
+                'db_table': 'scrape_run_links',
+                'indexes': [models.Index(fields=['run', 'status'], name='scrape_run_links_run_status'), models.Index(fields=['run', 'job_id'], name='scrape_run_links_run_job')],
+                'constraints': [models.UniqueConstraint(fields=('run', 'url'), name='scrape_run_links_run_url')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0002_scrape_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='Hash of the normalized job payload, set at ingest', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='embedding_hash',
+            field=models.CharField(blank=True, help_text='Hash of the embedding input at the last embed', max_length=64, null=True),
+        ),
+    ]
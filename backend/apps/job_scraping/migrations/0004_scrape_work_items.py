@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0003_job_content_hashes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeWorkItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, unique=True)),
+                ('job_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('leased', 'Leased'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0, help_text='Leases taken so far')),
+                ('lease_owner', models.CharField(blank=True, max_length=255, null=True)),
+                ('lease_token', models.CharField(blank=True, max_length=32, null=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'scrape_work_items',
+                'indexes': [models.Index(fields=['status', 'lease_expires_at'], name='scrape_work_items_lease'), models.Index(fields=['lease_owner', 'job_id'], name='scrape_work_items_owner_job')],
+            },
+        ),
+    ]
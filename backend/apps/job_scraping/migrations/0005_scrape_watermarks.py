@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0004_scrape_work_items'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=500, unique=True)),
+                ('newest_publication', models.DateTimeField(blank=True, help_text='Newest publication date ingested', null=True)),
+                ('last_full_sweep_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'scrape_watermarks',
+            },
+        ),
+    ]
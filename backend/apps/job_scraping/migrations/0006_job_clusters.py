@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0005_scrape_watermarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMinHash',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='minhash', serialize=False, to='job_scraping.job')),
+                ('signature', models.BinaryField(help_text='One little-endian uint32 per permutation')),
+            ],
+            options={
+                'db_table': 'job_minhashes',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='cluster_id',
+            field=models.CharField(blank=True, db_index=True, help_text='ID of the job that founded its near-duplicate cluster', max_length=255, null=True),
+        ),
+        migrations.CreateModel(
+            name='JobLshBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField(help_text="64-bit hash of the band's signature rows")),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='job_scraping.job')),
+            ],
+            options={
+                'db_table': 'job_lsh_buckets',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='job_lsh_buckets_band_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0006_job_clusters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkCheck',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='link_check', serialize=False, to='job_scraping.job')),
+                ('url', models.TextField(blank=True, default='', help_text="The job's externalUrl when it was checked")),
+                ('status', models.IntegerField(blank=True, help_text='HTTP status of the last check, or None if the request failed', null=True)),
+                ('final_url', models.TextField(blank=True, help_text='URL answering the last check, after a redirect', null=True)),
+                ('checked_at', models.DateTimeField()),
+                ('next_check_at', models.DateTimeField(db_index=True)),
+                ('consecutive_failures', models.IntegerField(default=0)),
+                ('consecutive_successes', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'link_checks',
+            },
+        ),
+    ]
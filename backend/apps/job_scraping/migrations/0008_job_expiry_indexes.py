@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0007_link_checks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['publicationEndDate'], name='jobs_publication_end_date'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['isActive'], name='jobs_is_active'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_scraping', '0008_job_expiry_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_is_active',
+        ),
+    ]
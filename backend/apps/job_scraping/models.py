@@ -30,9 +30,177 @@ class Job(models.Model):
     employmentGrades = models.TextField(blank=True, null=True)
     employmentPositionIds = NullableIntegerField(blank=True, null=True)
     employmentTypeIds = NullableIntegerField(blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True, help_text="Hash of the normalized job payload, set at ingest")
+    embedding_hash = models.CharField(max_length=64, blank=True, null=True, help_text="Hash of the embedding input at the last embed")
+    cluster_id = models.CharField(max_length=255, blank=True, null=True, db_index=True, help_text="ID of the job that founded its near-duplicate cluster")
 
     def __str__(self):
         return self.template_title or self.id
     
     class Meta:
         db_table = 'jobs'
+        indexes = [
+            models.Index(fields=["publicationEndDate"], name="jobs_publication_end_date"),
+        ]
+
+class ScrapeRun(models.Model):
+    """
+    Persistent state of a paginated scrape run, used to resume it after a crash.
+    Sitemap runs are recorded too, for their start time.
+    """
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_ABANDONED = "abandoned"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_ABANDONED, "Abandoned"),
+    ]
+
+    mode = models.CharField(max_length=20, help_text="Scraping mode, e.g. 'sequential' or 'concurrent'")
+    published_since = models.IntegerField(help_text="Publication-date filter of the search, in days")
+    max_pages = models.IntegerField()
+    pages_done = models.IntegerField(default=0, help_text="Last result page whose links are recorded")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_RUNNING, db_index=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.mode} run {self.pk} ({self.status}, {self.pages_done} pages)"
+
+    class Meta:
+        db_table = 'scrape_runs'
+
+class ScrapeRunLink(models.Model):
+    """
+    A job detail link in the frontier of a scrape run.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    run = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, related_name="links")
+    url = models.CharField(max_length=500)
+    job_id = models.CharField(max_length=255, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0, help_text="Failed attempts so far")
+    last_error = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
+
+    class Meta:
+        db_table = 'scrape_run_links'
+        constraints = [
+            models.UniqueConstraint(fields=["run", "url"], name="scrape_run_links_run_url"),
+        ]
+        indexes = [
+            models.Index(fields=["run", "status"], name="scrape_run_links_run_status"),
+            models.Index(fields=["run", "job_id"], name="scrape_run_links_run_job"),
+        ]
+
+class ScrapeWorkItem(models.Model):
+    """
+    A job detail link in the work queue shared by distributed scrape workers.
+
+    A worker leases a batch of items for a limited time and extends the lease with
+    heartbeats while it works; items whose lease expired (e.g. because their worker died)
+    can be leased again. Every lease counts as an attempt.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_LEASED = "leased"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_LEASED, "Leased"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    url = models.CharField(max_length=500, unique=True)
+    job_id = models.CharField(max_length=255, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0, help_text="Leases taken so far")
+    lease_owner = models.CharField(max_length=255, blank=True, null=True)
+    lease_token = models.CharField(max_length=32, blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
+
+    class Meta:
+        db_table = 'scrape_work_items'
+        indexes = [
+            models.Index(fields=["status", "lease_expires_at"], name="scrape_work_items_lease"),
+            models.Index(fields=["lease_owner", "job_id"], name="scrape_work_items_owner_job"),
+        ]
+
+class ScrapeWatermark(models.Model):
+    """
+    Publication-date high-water mark of a search query, used to stop paginating early.
+    """
+    query = models.CharField(max_length=500, unique=True)
+    newest_publication = models.DateTimeField(blank=True, null=True, help_text="Newest publication date ingested")
+    last_full_sweep_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.query} ({self.newest_publication})"
+
+    class Meta:
+        db_table = 'scrape_watermarks'
+
+class JobMinHash(models.Model):
+    """
+    MinHash signature of a job's title and description, used for near-duplicate detection.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="minhash")
+    signature = models.BinaryField(help_text="One little-endian uint32 per permutation")
+
+    class Meta:
+        db_table = 'job_minhashes'
+
+class JobLshBucket(models.Model):
+    """
+    LSH bucket of one band of a job's MinHash signature. Jobs sharing a bucket in any band
+    are candidate near-duplicates.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="lsh_buckets")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField(help_text="64-bit hash of the band's signature rows")
+
+    class Meta:
+        db_table = 'job_lsh_buckets'
+        indexes = [
+            models.Index(fields=["band", "bucket"], name="job_lsh_buckets_band_bucket"),
+        ]
+
+class LinkCheck(models.Model):
+    """
+    Result of the last check of a job's application link, and when it is due again.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="link_check")
+    url = models.TextField(blank=True, default="", help_text="The job's externalUrl when it was checked")
+    status = models.IntegerField(blank=True, null=True, help_text="HTTP status of the last check, or None if the request failed")
+    final_url = models.TextField(blank=True, null=True, help_text="URL answering the last check, after a redirect")
+    checked_at = models.DateTimeField()
+    next_check_at = models.DateTimeField(db_index=True)
+    consecutive_failures = models.IntegerField(default=0)
+    consecutive_successes = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.job_id}: {self.status} at {self.checked_at}"
+
+    class Meta:
+        db_table = 'link_checks'
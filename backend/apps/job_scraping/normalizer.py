@@ -0,0 +1,226 @@
+import hashlib
+import html
+import json
+import re
+from collections import namedtuple
+
+# Markup dropped by `html_to_text`: comments, script/style elements with their content,
+# doctype/processing instructions and ordinary tags. A `<` not followed by a tag name is text.
+_MARKUP_PATTERN = re.compile(
+    r"<!--.*?(?:-->|$)"
+    r"|<(?:script|style)\b[^>]*>.*?(?:</(?:script|style)\s*>|$)"
+    r"|<[!?][^>]*>"
+    r"|</?[A-Za-z][^>]*>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+def html_to_text(markup, separator=""):
+    """
+    Strip the tags from an HTML fragment and return its text.
+
+    This is a single regex pass instead of a full BeautifulSoup tree, and returns the same
+    text as `BeautifulSoup(markup, "html.parser").get_text(separator, strip=True)` on the
+    job description fragments: every text run is unescaped and stripped, and empty runs are
+    dropped.
+
+    Args:
+        markup (str | None): The HTML fragment.
+        separator (str): String inserted between text runs.
+
+    Returns:
+        str: The text content.
+    """
+    if not markup:
+        return ""
+    if "<" not in markup and "&" not in markup:
+        return markup.strip()
+
+    runs = []
+    for run in _MARKUP_PATTERN.split(markup):
+        if "&" in run:
+            run = html.unescape(run)
+        run = run.strip()
+        if run:
+            runs.append(run)
+    return separator.join(runs)
+
+def to_text(value):
+    return value if isinstance(value, str) else str(value)
+
+def to_bool(value):
+    return bool(value)
+
+def to_int(value):
+    """
+    Convert a scalar, a numeric string or a one-element list to int; anything else becomes None.
+    """
+    if isinstance(value, list):
+        if len(value) != 1:
+            return None
+        value = value[0]
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def join_list(value):
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    return to_text(value)
+
+def format_language_skills(value):
+    if not isinstance(value, list):
+        return to_text(value)
+    return ", ".join(
+        f"{skill.get('language', '')} (Level {skill.get('level', '')})"
+        for skill in value if isinstance(skill, dict)
+    )
+
+def combine_html(*fragments):
+    """
+    Convert each HTML fragment to text and join the non-empty ones with a blank line.
+    """
+    return "\n\n".join(text for text in map(html_to_text, fragments) if text)
+
+# One entry per output field.
+#   name:    key in the normalized record (a `Job` field / `jobs` column).
+#   paths:   one or more paths into the React Query `data` object. Strings are dict keys,
+#            integers are list indexes.
+#   convert: applied to the values found at `paths`, or None to keep the value as is.
+#   default: used when the value at a path is missing or null.
+Field = namedtuple("Field", ["name", "paths", "convert", "default"])
+
+JOB_FIELDS = (
+    Field("id", [("id",)], None, None),
+    Field("externalUrl", [("applicationOptions", "externalUrl")], to_text, ""),
+    Field("logo", [("logo",)], to_text, ""),
+    Field("company_id", [("company", "id")], to_int, None),
+    Field("company_name", [("company", "name")], to_text, ""),
+    Field("contact_firstName", [("contacts", 0, "firstName")], to_text, ""),
+    Field("contact_lastName", [("contacts", 0, "lastName")], to_text, ""),
+    Field("headhunterApplicationAllowed", [("headhunterApplicationAllowed",)], to_bool, False),
+    Field("initialPublicationDate", [("initialPublicationDate",)], to_text, ""),
+    Field("isActive", [("isActive",)], to_bool, False),
+    Field("isPaid", [("isPaid",)], to_bool, False),
+    Field("language_skills", [("languageSkills",)], format_language_skills, []),
+    Field("postalCode", [("locations", 0, "postalCode")], to_text, ""),
+    Field("city", [("locations", 0, "city")], to_text, ""),
+    Field("cantonCode", [("locations", 0, "cantonCode")], to_text, ""),
+    Field("countryCode", [("locations", 0, "countryCode")], to_text, ""),
+    Field("publicationDate", [("publicationDate",)], to_text, ""),
+    Field("publicationEndDate", [("publicationEndDate",)], to_text, ""),
+    Field("skills", [("skills",)], join_list, []),
+    Field("synonym", [("synonym",)], to_text, ""),
+    Field("template_lead", [("template", "lead"), ("template", "text")], combine_html, ""),
+    Field("template_title", [("title",)], to_text, ""),
+    Field("industry", [("industry",)], to_int, None),
+    Field("regionID", [("regionId",)], to_int, None),
+    Field("employmentPositionIds", [("employmentPositionIds",)], to_int, None),
+    Field("employmentTypeIds", [("employmentTypeIds",)], to_int, None),
+    Field("employmentGrades", [("employmentGrades",)], join_list, []),
+)
+
+JOB_FIELD_NAMES = tuple(field.name for field in JOB_FIELDS)
+
+def source_spec(fields):
+    """
+    Build the selection spec of the source values read by `fields`, for
+    `react_state.select_react_query_state`.
+
+    Dict keys along the paths become nested specs; a path's last key, or a key followed
+    by a list index, selects the whole value (True).
+
+    Args:
+        fields (Iterable[Field]): The field spec.
+
+    Returns:
+        dict: The selection spec of the React Query `data` object.
+    """
+    spec = {}
+    for field in fields:
+        for path in field.paths:
+            node = spec
+            for i, step in enumerate(path):
+                rest = path[i + 1:]
+                if not rest or isinstance(rest[0], int):
+                    node[step] = True
+                    break
+                if node.get(step) is True:
+                    break
+                node = node.setdefault(step, {})
+    return spec
+
+def _compile_path(path, default):
+    """
+    Build a getter for `path` that returns `default` as soon as a step is missing or null.
+    """
+    if len(path) == 1 and isinstance(path[0], str):
+        key = path[0]
+
+        def get(data):
+            value = data.get(key)
+            return default if value is None else value
+        return get
+
+    def get(data):
+        value = data
+        for step in path:
+            if isinstance(step, int):
+                value = value[step] if isinstance(value, list) and len(value) > step else None
+            else:
+                value = value.get(step) if isinstance(value, dict) else None
+            if value is None:
+                return default
+        return value
+    return get
+
+def compile_fields(fields):
+    """
+    Turn a field spec into a normalizer function.
+
+    Path getters and converters are resolved once here, so normalizing a record is a
+    single pass over prebuilt closures with no per-record interpretation of the spec.
+
+    Args:
+        fields (Iterable[Field]): The field spec.
+
+    Returns:
+        Callable[[dict], dict]: Function mapping a raw `data` object to a normalized record.
+    """
+    steps = []
+    for field in fields:
+        getters = [_compile_path(path, field.default) for path in field.paths]
+        steps.append((field.name, getters, field.convert))
+
+    def normalize(data):
+        record = {}
+        for name, getters, convert in steps:
+            if len(getters) == 1:
+                value = getters[0](data)
+                record[name] = convert(value) if convert else value
+            else:
+                values = [get(data) for get in getters]
+                record[name] = convert(*values) if convert else values
+        return record
+    return normalize
+
+# Normalizes the `data` object of a React Query entry into a record whose keys are the
+# `Job` model fields (and the columns of the legacy SQLite `jobs` table).
+normalize_job = compile_fields(JOB_FIELDS)
+
+def compute_content_hash(record):
+    """
+    Hash the normalized fields of a job record, to detect postings that changed since the last ingest.
+
+    Args:
+        record (dict): A record returned by `normalize_job`.
+
+    Returns:
+        str: The hex SHA-256 digest.
+    """
+    payload = json.dumps([record.get(name) for name in JOB_FIELD_NAMES], ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
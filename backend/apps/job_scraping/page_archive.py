@@ -0,0 +1,210 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within the process.
+    fcntl = None
+
+from config.settings import ARCHIVE_ENABLED, ARCHIVE_DIR, ARCHIVE_SEGMENT_BYTES, ARCHIVE_COMPRESSION_LEVEL
+
+_archive = None
+_archive_lock = threading.Lock()
+
+class PageArchive:
+    """
+    Append-only archive of raw job detail pages, compressed with zstd.
+
+    Pages are appended to segment files (`segment-000001.zst`, ...) as independent zstd
+    frames, so any page can be read back from its offset without decompressing the rest
+    of the segment. A new segment is started once the current one exceeds `segment_bytes`.
+    An SQLite index maps every record to its job ID, URL, fetch time, segment, offset and
+    length. Several processes (e.g. distributed scrape workers) may append to the same
+    archive: every append holds an exclusive lock on the segment file.
+
+    Args:
+        archive_dir (str): Directory holding the segments and the index.
+        segment_bytes (int): Size after which a new segment is started.
+        level (int): zstd compression level.
+    """
+    def __init__(self, archive_dir, segment_bytes=ARCHIVE_SEGMENT_BYTES, level=ARCHIVE_COMPRESSION_LEVEL):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("The page archive requires the 'zstandard' package (pip install zstandard).") from e
+
+        self.archive_dir = archive_dir
+        self.segment_bytes = segment_bytes
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        os.makedirs(archive_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(archive_dir, "index.db"), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS records (
+                job_id TEXT,
+                url TEXT,
+                fetched_at REAL,
+                segment INTEGER,
+                offset INTEGER,
+                length INTEGER,
+                raw_size INTEGER
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS records_job_fetched ON records (job_id, fetched_at)")
+        self._conn.commit()
+
+        last_segment = self._conn.execute("SELECT MAX(segment) FROM records").fetchone()[0]
+        self._segment = last_segment or 1
+        self._file = None
+
+    def _segment_path(self, segment):
+        return os.path.join(self.archive_dir, f"segment-{segment:06d}.zst")
+
+    def _lock_segment(self):
+        """
+        Lock the current segment for appending, moving on to the next one while it is full.
+
+        The offset of the new record is the size of the file under the lock, not this
+        process's position in it, since other processes may have appended since. Must be
+        called with the thread lock held; release with `_unlock_segment`.
+
+        Returns:
+            tuple: The segment file and the offset the next record is written at.
+        """
+        while True:
+            if self._file is None:
+                self._file = open(self._segment_path(self._segment), "ab")
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            end = os.fstat(self._file.fileno()).st_size
+            if end < self.segment_bytes:
+                return self._file, end
+            self._unlock_segment()
+            self._file.close()
+            self._file = None
+            self._segment += 1
+
+    def _unlock_segment(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def append(self, job_id, url, content, fetched_at=None):
+        """
+        Compress and append one raw page, and index it.
+
+        Args:
+            job_id (str): The job ID the page belongs to.
+            url (str): The URL the page was fetched from.
+            content (bytes): The raw response body.
+            fetched_at (float, optional): Fetch time as a Unix timestamp. Defaults to now.
+        """
+        frame = self._compressor.compress(content)
+        with self._lock:
+            f, offset = self._lock_segment()
+            try:
+                # The file is opened in append mode: the write lands at `offset`.
+                f.write(frame)
+                f.flush()
+            finally:
+                self._unlock_segment()
+            self._conn.execute(
+                "INSERT INTO records (job_id, url, fetched_at, segment, offset, length, raw_size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, url, fetched_at or time.time(), self._segment, offset, len(frame), len(content)),
+            )
+            self._conn.commit()
+
+    def read(self, segment, offset, length):
+        """
+        Read back and decompress the record stored at `offset` in `segment`.
+        """
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return self._decompressor.decompress(f.read(length))
+
+    def latest(self, job_id):
+        """
+        Return the most recently archived page of `job_id` as `(url, fetched_at, content)`, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, fetched_at, segment, offset, length FROM records WHERE job_id = ? ORDER BY fetched_at DESC LIMIT 1",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        url, fetched_at, segment, offset, length = row
+        return url, fetched_at, self.read(segment, offset, length)
+
+    def iter_latest(self, since=None):
+        """
+        Yield the latest archived page of every job, in segment order for sequential reads.
+
+        Args:
+            since (float, optional): Only consider pages fetched at or after this Unix timestamp.
+
+        Yields:
+            tuple: `(job_id, url, fetched_at, content)`.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            rows = self._conn.execute(
+                '''
+                SELECT job_id, url, MAX(fetched_at), segment, offset, length FROM records
+                WHERE fetched_at >= ?
+                GROUP BY job_id
+                ORDER BY segment, offset
+                ''',
+                (since or 0,),
+            ).fetchall()
+
+        logging.info(f"[PAGE_ARCHIVE] Replaying {len(rows)} archived jobs from {self.archive_dir}.")
+        handles = {}
+        try:
+            for job_id, url, fetched_at, segment, offset, length in rows:
+                if segment not in handles:
+                    handles[segment] = open(self._segment_path(segment), "rb")
+                f = handles[segment]
+                f.seek(offset)
+                try:
+                    content = self._decompressor.decompress(f.read(length))
+                except Exception as e:
+                    logging.error(f"[PAGE_ARCHIVE] Corrupt record for job {job_id} in segment {segment}: {e}")
+                    continue
+                yield job_id, url, fetched_at, content
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._conn.close()
+
+def get_page_archive(force=False):
+    """
+    Return the process-wide page archive, or None if archiving is disabled.
+
+    Args:
+        force (bool): Open the archive even if `ARCHIVE_ENABLED` is False (used by replay).
+
+    Returns:
+        PageArchive | None: The shared archive.
+    """
+    global _archive
+    if not (ARCHIVE_ENABLED or force):
+        return None
+
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive(ARCHIVE_DIR)
+            logging.debug(f"[PAGE_ARCHIVE] Opened page archive at {ARCHIVE_DIR}.")
+        return _archive
@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# This module is imported by the parse worker processes before Django is configured,
+# so it must not import models (or modules that do) at import time.
+
+def init_parse_worker():
+    """
+    Process pool initializer: make sure Django is set up in the worker process.
+
+    With the `fork` start method the parent's setup is inherited and this is a no-op;
+    with `spawn`/`forkserver` the worker starts from a fresh interpreter.
+    """
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+        django.setup()
+
+def parse_and_clean(content, link):
+    """
+    Extract the React Query state from raw page bytes and clean it into job records.
+
+    Runs in a worker process (or thread). Only the raw bytes go in and only plain
+    dictionaries come out, so the pickling cost per page is small.
+
+    Args:
+        content (bytes): The raw job detail page.
+        link (str): The job detail link, used for logging.
+
+    Returns:
+        list of dict | None: The cleaned job records, or None if the page holds no job data.
+    """
+    from .jobs_functions import parse_job_page, clean_json
+
+    raw_info = parse_job_page(content, link)
+    if not raw_info:
+        return None
+    return clean_json(raw_info, link) or None
+
+def create_parse_pool(processes):
+    """
+    Create the process pool used by the scraping pipeline's parse stage.
+
+    Args:
+        processes (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    return ProcessPoolExecutor(max_workers=processes, initializer=init_parse_worker)
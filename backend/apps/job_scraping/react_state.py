@@ -0,0 +1,226 @@
+import json
+import logging
+import re
+
+REACT_QUERY_STATE_MARKER = b"__REACT_QUERY_STATE__"
+
+# JSON strings, braces and bare `undefined` tokens. Matching whole strings lets the scanner
+# jump over their content (including braces and quotes inside them) in a single regex step.
+_TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]|\bundefined\b', re.DOTALL)
+
+def _find_state_start(content):
+    """
+    Return the offset of the `{` opening the `__REACT_QUERY_STATE__` object, or None.
+    """
+    marker_index = content.find(REACT_QUERY_STATE_MARKER)
+    while marker_index != -1:
+        after_marker = marker_index + len(REACT_QUERY_STATE_MARKER)
+        start = content.find(b"{", after_marker)
+        if start == -1:
+            return None
+        # Only whitespace and the assignment may sit between the marker and the object.
+        if content[after_marker:start].strip() == b"=":
+            return start
+        marker_index = content.find(REACT_QUERY_STATE_MARKER, after_marker)
+    return None
+
+def find_react_query_state(content):
+    """
+    Locate the `__REACT_QUERY_STATE__` object in a raw page by brace matching.
+
+    Args:
+        content (bytes): The raw response body.
+
+    Returns:
+        tuple | None: `(start, end, undefined_positions)` where `content[start:end]` is the
+                      object literal and `undefined_positions` are the offsets of bare
+                      `undefined` tokens outside strings, or None if the object is not found
+                      or is unbalanced.
+    """
+    start = _find_state_start(content)
+    if start is None:
+        return None
+
+    depth = 0
+    undefined_positions = []
+    for match in _TOKEN_PATTERN.finditer(content, start):
+        token = match.group()
+        if token == b"{":
+            depth += 1
+        elif token == b"}":
+            depth -= 1
+            if depth == 0:
+                return start, match.end(), undefined_positions
+        elif token == b"undefined":
+            undefined_positions.append(match.start())
+
+    return None
+
+def extract_react_query_state(content):
+    """
+    Extract and decode the `__REACT_QUERY_STATE__` object from a raw job detail page.
+
+    This scans the response bytes directly instead of building a BeautifulSoup tree. Bare
+    `undefined` values are replaced with `null` outside of JSON strings only.
+
+    Args:
+        content (bytes | str): The raw response body.
+
+    Returns:
+        dict | None: The decoded React query state, or None if it could not be extracted,
+                     in which case callers should fall back to the BeautifulSoup path.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    located = find_react_query_state(content)
+    if located is None:
+        logging.debug("[EXTRACT_REACT_QUERY_STATE] __REACT_QUERY_STATE__ object not found in raw content.")
+        return None
+
+    start, end, undefined_positions = located
+    if undefined_positions:
+        parts = []
+        position = start
+        for undefined_position in undefined_positions:
+            parts.append(content[position:undefined_position])
+            parts.append(b"null")
+            position = undefined_position + len(b"undefined")
+        parts.append(content[position:end])
+        payload = b"".join(parts)
+    else:
+        payload = content[start:end]
+
+    try:
+        return json.loads(payload)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logging.debug(f"[EXTRACT_REACT_QUERY_STATE] Failed to decode extracted object: {e}")
+        return None
+
+# Patterns of the selective decoder, which scans the raw bytes. Strings use the unrolled
+# `[^"\\]*(?:\\.[^"\\]*)*` form, and a skip step consumes everything up to the next
+# bracket outside strings in one match, so skipping costs one Python step per bracket.
+_JSON_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_WHITESPACE_PATTERN = re.compile(rb"\s*")
+_STRING_PATTERN = re.compile(_JSON_STRING, re.DOTALL)
+_SCALAR_PATTERN = re.compile(rb"[^\s,\]}]+")
+_SKIP_STEP_PATTERN = re.compile(rb'(?:[^"{}\[\]]++|' + _JSON_STRING + rb')*+([{}\[\]])', re.DOTALL)
+_UNDEFINED_PATTERN = re.compile(_JSON_STRING + rb'|\bundefined\b', re.DOTALL)
+
+# Returned by `_select` for values whose type does not match their spec; they are left out.
+_MISMATCH = object()
+
+def _skip_value(content, index):
+    """
+    Return the offset just past the JSON value starting at `index`, without decoding it.
+    """
+    char = content[index:index + 1]
+    if char == b'"':
+        return _STRING_PATTERN.match(content, index).end()
+    if char != b"{" and char != b"[":
+        return _SCALAR_PATTERN.match(content, index).end()
+
+    depth = 0
+    for match in _SKIP_STEP_PATTERN.finditer(content, index):
+        bracket = match.group(1)
+        if bracket == b"{" or bracket == b"[":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError("Unbalanced JSON value")
+
+def _decode_value(content, index):
+    """
+    Decode the whole JSON value starting at `index`. Returns `(value, end)`.
+    """
+    end = _skip_value(content, index)
+    fragment = content[index:end]
+    if b"undefined" in fragment:
+        fragment = _UNDEFINED_PATTERN.sub(lambda match: b"null" if match.group() == b"undefined" else match.group(), fragment)
+    return json.loads(fragment), end
+
+def _select(content, index, spec):
+    """
+    Decode the parts of the JSON value at `index` selected by `spec`. Returns `(value, end)`.
+
+    `spec` is True to decode the whole value, a dict mapping the keys to keep to their own
+    spec for an object, or a one-element list holding the spec of every item for an array.
+    """
+    if spec is True:
+        return _decode_value(content, index)
+
+    opening, closing = (b"{", b"}") if isinstance(spec, dict) else (b"[", b"]")
+    if content[index:index + 1] != opening:
+        return _MISMATCH, _skip_value(content, index)
+
+    result = {} if opening == b"{" else []
+    index = _WHITESPACE_PATTERN.match(content, index + 1).end()
+    if content[index:index + 1] == closing:
+        return result, index + 1
+
+    while True:
+        if opening == b"{":
+            key_match = _STRING_PATTERN.match(content, index)
+            key = json.loads(key_match.group())
+            index = _WHITESPACE_PATTERN.match(content, key_match.end()).end()
+            if content[index:index + 1] != b":":
+                raise ValueError("Expected ':' after object key")
+            index = _WHITESPACE_PATTERN.match(content, index + 1).end()
+
+            item_spec = spec.get(key)
+            if item_spec is None:
+                index = _skip_value(content, index)
+            else:
+                value, index = _select(content, index, item_spec)
+                if value is not _MISMATCH:
+                    result[key] = value
+        else:
+            value, index = _select(content, index, spec[0])
+            if value is not _MISMATCH:
+                result.append(value)
+
+        index = _WHITESPACE_PATTERN.match(content, index).end()
+        separator = content[index:index + 1]
+        if separator == b",":
+            index = _WHITESPACE_PATTERN.match(content, index + 1).end()
+        elif separator == closing:
+            return result, index + 1
+        else:
+            raise ValueError(f"Expected ',' or {closing!r}")
+
+def select_react_query_state(content, spec):
+    """
+    Decode only the parts of the `__REACT_QUERY_STATE__` object selected by `spec`.
+
+    The raw bytes are scanned in place: unselected values (related-jobs blocks, other
+    queries' payloads, ...) are skipped by regex matching without building any Python
+    object, and only the selected leaves are decoded, so memory use follows the size of the
+    selected data rather than the size of the page. Bare `undefined` values decode to None.
+
+    Args:
+        content (bytes | str): The raw response body.
+        spec (dict): Selection spec of the state object: a dict maps the keys to keep to
+                     their own spec, a one-element list gives the spec of every array item,
+                     and True decodes a value whole. Values whose type does not match
+                     their spec are left out.
+
+    Returns:
+        dict | None: The selected part of the state, or None if it could not be decoded,
+                     in which case callers should fall back to `extract_react_query_state`.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    start = _find_state_start(content)
+    if start is None:
+        logging.debug("[SELECT_REACT_QUERY_STATE] __REACT_QUERY_STATE__ object not found in raw content.")
+        return None
+
+    try:
+        state, _ = _select(content, start, spec)
+    except (ValueError, AttributeError) as e:
+        logging.debug(f"[SELECT_REACT_QUERY_STATE] Failed to decode selected fields: {e}")
+        return None
+    return state if state is not _MISMATCH else None
@@ -0,0 +1,188 @@
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from config.settings import SCRAPER_MAX_LINK_ATTEMPTS, SCRAPER_RESUME_MAX_AGE_HOURS
+from .models import ScrapeRun, ScrapeRunLink
+
+class ScrapeCheckpoint:
+    """
+    Persist the frontier of a paginated scrape run so an interrupted run can be resumed.
+
+    The run records the last result page whose links are stored, and every discovered
+    detail link with its status (pending, done or failed) and failed-attempt count. A
+    restarted run first retries the pending links and the failures that have attempts
+    left, then continues discovery from the page after `pages_done`.
+
+    Links are marked done only once their job is committed: pass `mark_jobs_done` as the
+    `on_flush` hook of the job writer. A run whose discovery is cut short by a failure is
+    `interrupt`ed instead of finished, so that it is resumed.
+
+    Args:
+        run (ScrapeRun): The run being checkpointed.
+        max_attempts (int): Failed attempts after which a link is no longer retried.
+    """
+    def __init__(self, run, max_attempts=SCRAPER_MAX_LINK_ATTEMPTS):
+        self.run = run
+        self.max_attempts = max_attempts
+        self.interrupted = False
+
+    @classmethod
+    def start(cls, mode, max_pages, published_since, resume=True):
+        """
+        Resume the latest interrupted run with the same parameters, or start a new one.
+
+        Interrupted runs older than `SCRAPER_RESUME_MAX_AGE_HOURS` are marked abandoned,
+        since the search results they paginated over have moved on.
+
+        Args:
+            mode (str): The scraping mode (e.g. 'sequential' or 'concurrent').
+            max_pages (int): Maximum number of pages to scrape.
+            published_since (int): The number of days since publication to filter job postings.
+            resume (bool): If False, interrupted runs are abandoned and a new run is started.
+
+        Returns:
+            ScrapeCheckpoint: The checkpoint of the resumed or new run.
+        """
+        interrupted = ScrapeRun.objects.filter(mode=mode, published_since=published_since, status=ScrapeRun.STATUS_RUNNING)
+        cutoff = timezone.now() - timedelta(hours=SCRAPER_RESUME_MAX_AGE_HOURS)
+
+        run = None
+        if resume:
+            run = interrupted.filter(updated_at__gte=cutoff).order_by("-updated_at").first()
+
+        abandoned = interrupted.exclude(pk=run.pk if run else None).update(
+            status=ScrapeRun.STATUS_ABANDONED, finished_at=timezone.now()
+        )
+        if abandoned:
+            logging.info(f"[SCRAPE_CHECKPOINT] Abandoned {abandoned} stale interrupted {mode} run(s).")
+
+        if run:
+            if run.max_pages != max_pages:
+                run.max_pages = max_pages
+                run.save(update_fields=["max_pages", "updated_at"])
+            checkpoint = cls(run)
+            logging.info(
+                f"[SCRAPE_CHECKPOINT] Resuming {mode} run {run.pk} after page {run.pages_done} "
+                f"with {checkpoint.links().count()} links to retry."
+            )
+            return checkpoint
+
+        run = ScrapeRun.objects.create(mode=mode, max_pages=max_pages, published_since=published_since)
+        logging.info(f"[SCRAPE_CHECKPOINT] Started {mode} run {run.pk}.")
+        return cls(run)
+
+    @property
+    def start_page(self):
+        return self.run.pages_done + 1
+
+    def links(self):
+        """
+        Queryset of the links a resumed run still has to process: pending ones, and
+        failed ones with attempts left.
+        """
+        return self.run.links.filter(
+            Q(status=ScrapeRunLink.STATUS_PENDING)
+            | Q(status=ScrapeRunLink.STATUS_FAILED, attempts__lt=self.max_attempts)
+        )
+
+    def resumable_links(self):
+        """
+        Returns:
+            list: The links left over by the interrupted run, in discovery order.
+        """
+        return list(self.links().order_by("id").values_list("url", flat=True))
+
+    def record_page(self, page_number, links, job_ids=None):
+        """
+        Store the new links of a result page as pending and mark the page as done, atomically.
+
+        Args:
+            page_number (int): The result page the links were found on.
+            links (list): The links still to be processed.
+            job_ids (list, optional): The job ID of each link, used to mark links done on write.
+        """
+        job_ids = job_ids or [None] * len(links)
+        with transaction.atomic():
+            ScrapeRunLink.objects.bulk_create(
+                [ScrapeRunLink(run=self.run, url=link, job_id=job_id) for link, job_id in zip(links, job_ids)],
+                ignore_conflicts=True,
+            )
+            self.run.pages_done = page_number
+            self.run.save(update_fields=["pages_done", "updated_at"])
+
+    def mark_done(self, links):
+        """
+        Mark links done that needed no write, e.g. pages unchanged since the last fetch.
+        """
+        self.run.links.filter(url__in=list(links)).update(status=ScrapeRunLink.STATUS_DONE, updated_at=timezone.now())
+
+    def mark_jobs_done(self, job_ids):
+        """
+        Mark the links of committed jobs done. Meant as the `on_flush` hook of a job writer.
+        """
+        self.run.links.filter(job_id__in=list(job_ids)).update(status=ScrapeRunLink.STATUS_DONE, updated_at=timezone.now())
+
+    def mark_failed(self, link, error=None):
+        """
+        Record a failed attempt for `link`. It is retried by a resumed run while it has attempts left.
+        """
+        self.run.links.filter(url=link).update(
+            status=ScrapeRunLink.STATUS_FAILED,
+            attempts=F("attempts") + 1,
+            last_error=str(error)[:1000] if error else None,
+            updated_at=timezone.now(),
+        )
+
+    def interrupt(self, reason):
+        """
+        Record that discovery stopped before the end of the results, e.g. because a result
+        page could not be fetched. The scrapers then leave the run open instead of calling
+        `finish`, and the next run resumes after `pages_done`.
+        """
+        self.interrupted = True
+        logging.warning(f"[SCRAPE_CHECKPOINT] Run {self.run.pk} interrupted after page {self.run.pages_done}: {reason}. It stays open to be resumed.")
+
+    def finish(self):
+        """
+        Mark the run completed, so the next run starts a fresh discovery.
+        """
+        failed = self.run.links.filter(status=ScrapeRunLink.STATUS_FAILED).count()
+        self.run.status = ScrapeRun.STATUS_COMPLETED
+        self.run.finished_at = timezone.now()
+        self.run.save(update_fields=["status", "finished_at", "updated_at"])
+        logging.info(f"[SCRAPE_CHECKPOINT] Completed run {self.run.pk} after {self.run.pages_done} pages. Failed links: {failed}.")
+
+def start_sitemap_run():
+    """
+    Record the start of a sitemap run.
+
+    Sitemap runs have no frontier to resume: they only keep their start time, from which
+    on the next run refetches the known jobs whose sitemap lastmod is newer.
+
+    Returns:
+        tuple: The new `ScrapeRun`, and the start time of the last completed sitemap run
+               (None if there is none).
+    """
+    previous = ScrapeRun.objects.filter(mode="sitemap", status=ScrapeRun.STATUS_COMPLETED).order_by("-started_at").first()
+    run = ScrapeRun.objects.create(mode="sitemap", max_pages=0, published_since=0)
+    changed_since = previous.started_at if previous else None
+    logging.info(f"[SCRAPE_CHECKPOINT] Started sitemap run {run.pk}, refetching jobs changed since {changed_since}.")
+    return run, changed_since
+
+def finish_sitemap_run(run, complete):
+    """
+    Close a sitemap run. An incomplete run (some sitemaps failed) is abandoned, so the next
+    run still diffs against the last complete one and does not miss the jobs it skipped.
+
+    Args:
+        run (ScrapeRun): The run started by `start_sitemap_run`.
+        complete (bool): Whether every sitemap was read.
+    """
+    run.status = ScrapeRun.STATUS_COMPLETED if complete else ScrapeRun.STATUS_ABANDONED
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "finished_at", "updated_at"])
+    logging.info(f"[SCRAPE_CHECKPOINT] Sitemap run {run.pk} {run.status}.")
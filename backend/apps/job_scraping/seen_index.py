@@ -0,0 +1,299 @@
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+from config.settings import SEEN_INDEX_DIR, SEEN_INDEX_COMPACT_THRESHOLD
+
+def id_key(job_id):
+    """
+    Map a job ID to the 64-bit key stored in the index.
+
+    With 64-bit keys the chance of any collision stays below 1e-7 up to a million IDs.
+    """
+    return int.from_bytes(hashlib.blake2b(job_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _write_temp(path, keys):
+    """
+    Write `keys` (array or numpy array of uint64) to a unique temporary file next to `path`,
+    so concurrent builds never write to the same file, and return its path. The caller
+    moves it into place with `os.replace`.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            keys.tofile(f)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+def _remove_if_exists(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class SeenIdIndex:
+    """
+    Compact, persistent set of job IDs, used to skip jobs that were already scraped.
+
+    The base file is a sorted array of 64-bit ID keys, memory-mapped and searched with
+    bisect, so opening it costs no parsing and no per-ID memory instead of a Python string
+    per URL. IDs recorded since the last compaction live in an append-only delta file,
+    replayed into a small in-memory set on load, and merged into the base file once they
+    exceed `compact_threshold`. Forgetting IDs rewrites the base file, so it is meant for
+    the occasional batch of deleted jobs.
+
+    Args:
+        path (str): Path of the base file; the delta file is `path + ".delta"`.
+        compact_threshold (int): Number of delta keys that triggers a compaction.
+    """
+    def __init__(self, path, compact_threshold=SEEN_INDEX_COMPACT_THRESHOLD):
+        self.path = path
+        self.delta_path = path + ".delta"
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._keys = memoryview(b"").cast("Q")
+        self._delta = set()
+        self._added = set()
+        self._delta_file = None
+        self._open()
+
+    def _open(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._keys = memoryview(self._mmap).cast("Q")
+
+        if os.path.exists(self.delta_path):
+            delta = array("Q")
+            with open(self.delta_path, "rb") as f:
+                data = f.read()
+            # Ignore a torn trailing record from an interrupted append.
+            delta.frombytes(data[:len(data) - len(data) % delta.itemsize])
+            self._delta = set(delta)
+        self._delta_file = open(self.delta_path, "ab")
+
+    def _close_files(self):
+        self._keys.release()
+        self._keys = memoryview(b"").cast("Q")
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._delta_file is not None:
+            self._delta_file.close()
+            self._delta_file = None
+
+    @classmethod
+    def build(cls, path, job_ids, **kwargs):
+        """
+        Write a fresh index containing exactly `job_ids` and open it.
+
+        Args:
+            path (str): Path of the base file.
+            job_ids (Iterable[str]): All known job IDs.
+
+        Returns:
+            SeenIdIndex: The opened index.
+        """
+        keys = np.unique(np.fromiter((id_key(job_id) for job_id in job_ids if job_id), dtype=np.uint64))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(_write_temp(path, keys), path)
+        _remove_if_exists(path + ".delta")
+        return cls(path, **kwargs)
+
+    def __len__(self):
+        """
+        Number of persisted IDs; IDs only added in memory are not counted.
+        """
+        return len(self._keys) + len(self._delta)
+
+    def _in_base(self, key):
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def __contains__(self, job_id):
+        key = id_key(job_id)
+        # Locked because a compaction remaps the base file.
+        with self._lock:
+            return key in self._delta or key in self._added or self._in_base(key)
+
+    def add(self, job_id):
+        """
+        Mark `job_id` as seen for the lifetime of this object only, without persisting it.
+        """
+        self._added.add(id_key(job_id))
+
+    def record(self, job_ids):
+        """
+        Durably add the IDs of committed jobs. Meant as an `on_flush` hook of a job writer.
+
+        Args:
+            job_ids (Iterable[str]): IDs of jobs that are now stored.
+        """
+        with self._lock:
+            new_keys = {id_key(job_id) for job_id in job_ids}
+            new_keys = array("Q", [key for key in new_keys if key not in self._delta and not self._in_base(key)])
+            if not new_keys:
+                return
+            new_keys.tofile(self._delta_file)
+            self._delta_file.flush()
+            self._delta.update(new_keys)
+            if len(self._delta) >= self.compact_threshold:
+                self._compact()
+
+    def forget(self, job_ids):
+        """
+        Durably remove the IDs of deleted jobs.
+
+        Args:
+            job_ids (Iterable[str]): IDs of jobs that are no longer stored.
+        """
+        with self._lock:
+            keys = {id_key(job_id) for job_id in job_ids}
+            self._added -= keys
+            if any(key in self._delta or self._in_base(key) for key in keys):
+                self._compact(removed=keys)
+
+    def _compact(self, removed=()):
+        keys = array("Q", sorted(set(self._keys).union(self._delta).difference(removed)))
+        tmp_path = _write_temp(self.path, keys)
+        self._close_files()
+        os.replace(tmp_path, self.path)
+        _remove_if_exists(self.delta_path)
+        self._delta = set()
+        self._open()
+        logging.info(f"[SEEN_INDEX] Compacted {self.path} to {len(keys)} IDs.")
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+
+class SeenJobLinks:
+    """
+    Set-like view of a `SeenIdIndex` keyed by job links, for the scrapers' dedup checks.
+
+    Links are reduced to their canonical job ID with `parse_id`, so the same job is
+    recognized whatever the language prefix or query string of its link.
+
+    Args:
+        index (SeenIdIndex): The underlying index.
+        parse_id (Callable[[str], str | None]): Extracts the job ID from a link.
+    """
+    def __init__(self, index, parse_id):
+        self.index = index
+        self.parse_id = parse_id
+
+    def _job_id(self, link):
+        return self.parse_id(link) or link
+
+    def __contains__(self, link):
+        return self._job_id(link) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, link):
+        self.index.add(self._job_id(link))
+
+    def issuperset(self, links):
+        return all(link in self for link in links)
+
+    def record(self, job_ids):
+        self.index.record(job_ids)
+
+    def close(self):
+        self.index.close()
+
+def table_marker(cursor, table):
+    """
+    Return the row count of a jobs table and the ID of its last inserted row, the cheap
+    check `load_seen_index` compares an index against.
+
+    The jobs tables are SQLite rowid tables, whose largest rowid is the last inserted row.
+
+    Args:
+        cursor: A DB-API cursor (sqlite3 or Django) on the database of `table`.
+        table (str): The table name.
+
+    Returns:
+        tuple: `(count, last_id)`, `last_id` being None for an empty table.
+    """
+    cursor.execute(f"SELECT COUNT(id), (SELECT id FROM {table} WHERE id IS NOT NULL ORDER BY rowid DESC LIMIT 1) FROM {table}")
+    count, last_id = cursor.fetchone()
+    return count, last_id
+
+def load_seen_index(name, load_ids, load_marker):
+    """
+    Open the named index, rebuilding it from the database when it is missing or out of date.
+
+    The index is kept in sync by its writers: `record` as jobs are committed and
+    `forget_seen_ids` as they are deleted. Opening it therefore only checks it against
+    `load_marker`: the number of stored jobs must equal the index's, and the last inserted
+    job must be in it, which catches jobs inserted or deleted by another code path. Only
+    when that check fails are every stored ID streamed and the index rebuilt from them.
+
+    Args:
+        name (str): Index name, used as the file name under `SEEN_INDEX_DIR`.
+        load_ids (Callable[[], Iterable[str]]): Returns every stored job ID.
+        load_marker (Callable[[], tuple]): Returns `(count, last_id)` for the stored jobs (see `table_marker`).
+
+    Returns:
+        SeenIdIndex: The opened index.
+    """
+    path = os.path.join(SEEN_INDEX_DIR, f"{name}.idx")
+    count, last_id = load_marker()
+
+    if os.path.exists(path):
+        index = SeenIdIndex(path)
+        if len(index) == count and (last_id is None or last_id in index):
+            logging.info(f"[SEEN_INDEX] Loaded {len(index)} seen job IDs from {path}.")
+            return index
+        logging.info(f"[SEEN_INDEX] Index {path} has {len(index)} IDs but does not match the {count} jobs stored. Rebuilding.")
+        index.close()
+
+    index = SeenIdIndex.build(path, load_ids())
+    logging.info(f"[SEEN_INDEX] Built {path} with {len(index)} job IDs.")
+    return index
+
+def forget_seen_ids(name, job_ids):
+    """
+    Remove the IDs of deleted jobs from the named index, if it exists, so that it stays in
+    sync with its table and is not rebuilt on the next load.
+
+    Args:
+        name (str): Index name, used as the file name under `SEEN_INDEX_DIR`.
+        job_ids (Iterable[str]): IDs of the deleted jobs.
+    """
+    path = os.path.join(SEEN_INDEX_DIR, f"{name}.idx")
+    if not os.path.exists(path):
+        return
+    index = SeenIdIndex(path)
+    try:
+        index.forget(job_ids)
+    finally:
+        index.close()
+
+def open_seen_index(name):
+    """
+    Open the named index as it is, creating it empty if missing.
+
+    For ID sets that are not mirrored by a table and cannot be rebuilt, e.g. jobs fetched
+    and deliberately not stored.
+
+    Args:
+        name (str): Index name, used as the file name under `SEEN_INDEX_DIR`.
+
+    Returns:
+        SeenIdIndex: The opened index.
+    """
+    os.makedirs(SEEN_INDEX_DIR, exist_ok=True)
+    return SeenIdIndex(os.path.join(SEEN_INDEX_DIR, f"{name}.idx"))
@@ -0,0 +1,161 @@
+import gzip
+import logging
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import requests
+
+from config.settings import SCRAPER_SITEMAP_INDEX_URL, SCRAPER_JOB_SITEMAP_PATTERN
+from .http_session import get_session
+from .jobs_functions import build_job_link, parse_job_id
+
+JOB_SITEMAP_PATTERN = re.compile(SCRAPER_JOB_SITEMAP_PATTERN)
+
+def parse_lastmod(value):
+    """
+    Parse a sitemap `<lastmod>` value (W3C datetime or plain date) into an aware datetime.
+
+    Args:
+        value (str | None): The raw lastmod text.
+
+    Returns:
+        datetime | None: The parsed datetime in UTC if no offset is given, or None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def iter_sitemap_entries(url, session=None, errors=None):
+    """
+    Stream the `<loc>`/`<lastmod>` pairs of a sitemap or sitemap index.
+
+    The body is decompressed and parsed incrementally with `iterparse`, and processed
+    elements are cleared, so memory stays flat however large the sitemap is. A sitemap
+    that cannot be fetched or parsed is logged and ends the stream early.
+
+    Args:
+        url (str): The sitemap URL (`.xml` or `.xml.gz`).
+        session (requests.Session, optional): The session to use. Defaults to the scraper session.
+        errors (list, optional): The URL is appended to it when the sitemap fails.
+
+    Yields:
+        tuple: `(loc, lastmod)` where `lastmod` is an aware datetime or None.
+    """
+    session = session or get_session()
+    try:
+        response = session.get(url, stream=True, timeout=30)
+    except requests.RequestException as e:
+        logging.error(f"[ITER_SITEMAP_ENTRIES] RequestException: Unable to fetch sitemap {url}. Error: {e}")
+        if errors is not None:
+            errors.append(url)
+        return
+
+    try:
+        if response.status_code != 200:
+            logging.error(f"[ITER_SITEMAP_ENTRIES] Failed to fetch sitemap {url}. Status code: {response.status_code}")
+            if errors is not None:
+                errors.append(url)
+            return
+
+        response.raw.decode_content = True
+        stream = gzip.GzipFile(fileobj=response.raw) if url.endswith(".gz") else response.raw
+
+        root = None
+        for event, element in ET.iterparse(stream, events=("start", "end")):
+            if root is None:
+                root = element
+            if event != "end":
+                continue
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag not in ("url", "sitemap"):
+                continue
+
+            loc = lastmod = None
+            for child in element:
+                child_tag = child.tag.rsplit("}", 1)[-1]
+                if child_tag == "loc":
+                    loc = (child.text or "").strip()
+                elif child_tag == "lastmod":
+                    lastmod = parse_lastmod(child.text)
+            if loc:
+                yield loc, lastmod
+            root.clear()
+    except (ET.ParseError, OSError, EOFError) as e:
+        logging.error(f"[ITER_SITEMAP_ENTRIES] Failed to parse sitemap {url}. Error: {e}")
+        if errors is not None:
+            errors.append(url)
+    finally:
+        response.close()
+
+def iter_job_sitemaps(index_url=SCRAPER_SITEMAP_INDEX_URL, changed_since=None, errors=None):
+    """
+    Yield the URLs of the job sitemaps listed in the sitemap index.
+
+    Args:
+        index_url (str): The sitemap index URL.
+        changed_since (datetime, optional): Skip child sitemaps whose lastmod is older than this.
+        errors (list, optional): Collects the URL of the index if it fails.
+
+    Yields:
+        str: Job sitemap URLs.
+    """
+    for loc, lastmod in iter_sitemap_entries(index_url, errors=errors):
+        if not JOB_SITEMAP_PATTERN.search(loc):
+            continue
+        if changed_since and lastmod and lastmod < changed_since:
+            logging.debug(f"[ITER_JOB_SITEMAPS] Skipping unchanged sitemap {loc} (lastmod={lastmod.isoformat()}).")
+            continue
+        yield loc
+
+def discover_job_links(known_ids, changed_since=None, index_url=SCRAPER_SITEMAP_INDEX_URL, skipped_ids=None, errors=None):
+    """
+    Diff the job sitemaps against the known job IDs and yield the links worth fetching.
+
+    A job is yielded when its ID is unknown, or when it is known and its lastmod is newer
+    than `changed_since`. Each job ID is yielded at most once, even when it is listed in
+    several language sitemaps. Unlike the paginated search, the sitemaps are not filtered
+    by region: the jobs a previous run fetched and dropped are passed as `skipped_ids`,
+    and are treated like known jobs.
+
+    Args:
+        known_ids (set | SeenIdIndex): IDs of jobs already stored.
+        changed_since (datetime, optional): Also yield known jobs modified after this time.
+                                            If None, only new jobs are yielded.
+        index_url (str): The sitemap index URL.
+        skipped_ids (set | SeenIdIndex, optional): IDs of jobs deliberately not stored.
+        errors (list, optional): Collects the URLs of the sitemaps that failed, whose jobs
+                                 were not all listed.
+
+    Yields:
+        str: Canonical job detail links, as built by `build_job_link`.
+    """
+    logging.info(f"[DISCOVER_JOB_LINKS] Starting sitemap discovery from {index_url}.")
+
+    seen_ids = set()
+    new_count = changed_count = 0
+    for sitemap_url in iter_job_sitemaps(index_url, changed_since, errors):
+        logging.info(f"[DISCOVER_JOB_LINKS] Streaming job sitemap {sitemap_url}.")
+        for loc, lastmod in iter_sitemap_entries(sitemap_url, errors=errors):
+            job_id = parse_job_id(loc)
+            if not job_id or job_id in seen_ids:
+                continue
+            seen_ids.add(job_id)
+
+            if job_id not in known_ids and not (skipped_ids is not None and job_id in skipped_ids):
+                new_count += 1
+                yield build_job_link(job_id)
+            elif changed_since and lastmod and lastmod > changed_since:
+                changed_count += 1
+                yield build_job_link(job_id)
+
+    logging.info(
+        f"[DISCOVER_JOB_LINKS] Sitemap discovery complete. Listed jobs: {len(seen_ids)}, "
+        f"new: {new_count}, changed: {changed_count}."
+    )
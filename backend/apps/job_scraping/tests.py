@@ -1,3 +1,1014 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+import requests
+from bs4 import BeautifulSoup
+from django.db import DatabaseError, connection
+from django.db.models import signals
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from backend.apps.job_finding_agent.models import UserJobFitEvaluation
+from backend.apps.users.models import User
+
+from config.settings import JOBUP_BASE_URL, SCRAPER_SITEMAP_INDEX_URL
+from . import async_scraping, bulk_delete, clean_jobs_db, dedup, http_session, jobs_functions, link_checker, link_schedule, normalizer, react_state, seen_index, sitemap_discovery
+from .async_scraping import scrape_sitemap_jobs_orm
+from .http_cache import HttpCache
+from .http_session import commit_cached, invalidate_cached
+from .job_writers import JOBS_TABLE_SCHEMA, JobBulkWriter, SqliteJobWriter
+from .jobs_functions import JOB_NOT_MODIFIED, build_job_link, build_search_url, scrape_and_store_jobs_orm
+from .models import Job, JobLshBucket, JobMinHash, LinkCheck, ScrapeRun, ScrapeWatermark, ScrapeWorkItem
+from .page_archive import PageArchive
+from .parse_pool import create_parse_pool, parse_and_clean
+from .work_queue import WorkQueue
+
+def job_page(job_id, title="Data Engineer", lead="Build data pipelines.", published="2026-10-01T08:00:00+00:00", region_id=33):
+    """
+    A job detail page carrying the job in its `__REACT_QUERY_STATE__`, like Jobup's.
+    """
+    data = {
+        "id": job_id,
+        "title": title,
+        "template": {"lead": f"<p>{lead}</p>"},
+        "company": {"id": 1, "name": "Acme"},
+        "publicationDate": published,
+        "initialPublicationDate": published,
+        "regionId": region_id,
+        "isActive": True,
+    }
+    state = {"queries": [{"state": {"data": data}}]}
+    return f"<html><body><script>window.__REACT_QUERY_STATE__ = {json.dumps(state)};</script></body></html>".encode()
+
+def listing_page(job_ids, published="2026-10-01T08:00:00+00:00"):
+    """
+    A search results page linking `job_ids`, with their publication dates in its state.
+    """
+    links = "".join(f'<a data-cy="job-link" href="/en/jobs/detail/{job_id}/?source=vacancy_search">Job</a>' for job_id in job_ids)
+    state = {"queries": [{"state": {"data": {"documents": [{"id": job_id, "publicationDate": published} for job_id in job_ids]}}}]}
+    return f"<html><body>{links}<script>window.__REACT_QUERY_STATE__ = {json.dumps(state)};</script></body></html>".encode()
+
+class FakeResponse:
+    def __init__(self, url, status_code=200, content=b"", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.raw = io.BytesIO(content)
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def close(self):
+        pass
+
+class FakeSession:
+    """
+    Serves `pages` (URL -> body, or an exception to raise) and records the requested URLs.
+    Bodies are answered with an ETag, and with a 304 when the request's `If-None-Match` matches.
+    """
+    def __init__(self, pages=None):
+        self.pages = pages or {}
+        self.requested = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requested.append(url)
+        page = self.pages.get(url)
+        if isinstance(page, Exception):
+            raise page
+        if page is None:
+            return FakeResponse(url, 404)
+        etag = f'"{hash(page)}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(url, 304, b"", {"ETag": etag})
+        return FakeResponse(url, 200, page, {"ETag": etag})
+
+class ScraperTestMixin:
+    """
+    Runs the scraper against a `FakeSession`, with the HTTP cache and the seen-ID index in
+    a temporary directory and no delay between result pages.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.session = FakeSession()
+        self.cache = HttpCache(self.tmp_dir, 10 * 1024 * 1024)
+        self.addCleanup(self.cache.close)
+        for patcher in (
+            mock.patch.object(http_session, "get_session", lambda profile="scraper": self.session),
+            mock.patch.object(sitemap_discovery, "get_session", lambda profile="scraper": self.session),
+            mock.patch.object(http_session, "_http_cache", self.cache),
+            mock.patch.object(seen_index, "SEEN_INDEX_DIR", self.tmp_dir),
+            mock.patch.object(jobs_functions, "SCRAPER_PAGE_DELAY", 0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+class ScraperTestCase(ScraperTestMixin, TestCase):
+    pass
+
+class AsyncScraperTestCase(ScraperTestMixin, TransactionTestCase):
+    """
+    For the asyncio scrapers, whose database calls run on another thread and connection,
+    which would not see the uncommitted data of a `TestCase`.
+    """
+
+class FakeClock:
+    """
+    Stands in for the `time` module: `sleep` advances `monotonic` instead of blocking.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(async_scraping, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def acquire(self, bucket, count):
+        async def sleep(seconds):
+            self.clock.sleep(seconds)
+
+        async def acquire_all():
+            await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+
+        with mock.patch.object(async_scraping.asyncio, "sleep", sleep):
+            asyncio.run(acquire_all())
+
+    def test_burst_is_served_without_waiting(self):
+        self.acquire(async_scraping.TokenBucket(rate=4, capacity=3), 3)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_requests_past_the_burst_wait_for_the_refill(self):
+        self.acquire(async_scraping.TokenBucket(rate=4, capacity=1), 3)
+        self.assertEqual(self.clock.sleeps, [0.25, 0.25])
+
+    def test_idle_time_refills_up_to_capacity_only(self):
+        bucket = async_scraping.TokenBucket(rate=2, capacity=2)
+        self.acquire(bucket, 2)
+        self.clock.now += 60
+        self.acquire(bucket, 3)
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_wait_sleeps_like_acquire(self):
+        bucket = async_scraping.TokenBucket(rate=4, capacity=1)
+        for _ in range(3):
+            bucket.wait()
+        self.assertEqual(self.clock.sleeps, [0.25, 0.25])
+
+class WriteWorkerTests(TestCase):
+    class FakeWriter:
+        flush_interval = 0.001
+
+        def __init__(self):
+            self.flushes = 0
+
+        def flush_due(self):
+            return True
+
+        def flush(self):
+            self.flushes += 1
+
+    def test_items_arriving_between_wake_ups_are_all_written(self):
+        writer = self.FakeWriter()
+        written = []
+        cancelled_gets = []
+
+        async def run():
+            pipeline = async_scraping.ScrapePipeline(None, writer=writer, parse_processes=0)
+            queue_get = pipeline.write_queue.get
+
+            # A get cancelled as it takes an item can lose that item, so wake-ups must not cancel it.
+            async def get():
+                try:
+                    return await queue_get()
+                except asyncio.CancelledError:
+                    cancelled_gets.append(pipeline.write_queue.qsize())
+                    raise
+
+            pipeline.write_queue.get = get
+            worker = asyncio.create_task(pipeline._write_worker())
+            for job_id in range(50):
+                await pipeline.write_queue.put((build_job_link(job_id), {"id": job_id}))
+                await asyncio.sleep(0.001 * (job_id % 3))
+            await asyncio.wait_for(pipeline.write_queue.join(), timeout=5)
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+        with mock.patch.object(async_scraping, "insert_jobinfo_orm", lambda clean_info, writer: written.append(clean_info["id"])):
+            asyncio.run(run())
+        self.assertEqual(written, list(range(50)))
+        self.assertGreater(writer.flushes, 0)
+        # Only the get left pending when the worker is stopped is cancelled.
+        self.assertEqual(cancelled_gets, [0])
+
+class ExtractReactQueryStateTests(TestCase):
+    def test_braces_quotes_and_undefined_inside_strings_are_kept(self):
+        content = (
+            b'<script>var config = {"name": "__REACT_QUERY_STATE__"};</script>'
+            b'<script>window.__REACT_QUERY_STATE__ = {"queries": [{"state": {"data": '
+            b'{"id": "1", "title": "C++ {senior} \\"undefined\\"", "logo": undefined}}}]};</script>'
+            b'<script>var next = {"other": true};</script>'
+        )
+        state = react_state.extract_react_query_state(content)
+        self.assertEqual(state, {"queries": [{"state": {"data": {"id": "1", "title": 'C++ {senior} "undefined"', "logo": None}}}]})
+
+    def test_unbalanced_object_is_not_extracted(self):
+        self.assertIsNone(react_state.extract_react_query_state(b'<script>window.__REACT_QUERY_STATE__ = {"queries": [{"state": </script>'))
+        self.assertIsNone(react_state.extract_react_query_state(b"<html></html>"))
+
+    def test_undecodable_page_falls_back_to_beautifulsoup(self):
+        link = "https://www.jobup.ch/en/jobs/detail/1/"
+        # A page served in Latin-1: the raw bytes are not valid UTF-8 JSON.
+        content = '<script>window.__REACT_QUERY_STATE__ = {"queries": [{"state": {"data": {"id": "1", "title": "Ingénieur"}}}]};</script>'.encode("latin-1")
+        self.assertIsNone(react_state.extract_react_query_state(content))
+
+        response = mock.Mock(status_code=200, content=content, text=content.decode("latin-1"), not_modified=False, url=link)
+        with mock.patch.object(jobs_functions, "cached_get", return_value=response):
+            state = jobs_functions.get_job_info(link)
+
+        data = state["queries"][0]["state"]["data"]
+        self.assertEqual(data["id"], "1")
+        self.assertTrue(data["title"].startswith("Ing"))
+
+class JobBulkWriterTests(TestCase):
+    def jobs_inserts(self, queries):
+        return [query for query in queries if query["sql"].startswith('INSERT INTO "jobs"')]
+
+    def test_full_batch_is_upserted_with_one_statement(self):
+        Job.objects.create(id="9001", template_title="Data Engineer")
+        writer = JobBulkWriter(batch_size=3, flush_interval=60)
+
+        with CaptureQueriesContext(connection) as queries:
+            writer.add({"id": "9001", "template_title": "Senior Data Engineer"})
+            writer.add({"id": "9002", "template_title": "Data Analyst"})
+            # The same job twice in a batch is written once, with its latest values.
+            writer.add({"id": "9002", "template_title": "Data Scientist"})
+            self.assertEqual(len(queries), 0)
+            writer.add({"id": "9003", "template_title": "ML Engineer"})
+
+        self.assertEqual(len(self.jobs_inserts(queries)), 1)
+        self.assertEqual(writer.written, 3)
+        self.assertEqual(
+            dict(Job.objects.values_list("id", "template_title")),
+            {"9001": "Senior Data Engineer", "9002": "Data Scientist", "9003": "ML Engineer"},
+        )
+
+    def test_failed_batch_is_retried_row_by_row(self):
+        writer = JobBulkWriter(batch_size=10, flush_interval=60)
+        writer.add({"id": "9001", "template_title": "Data Engineer"})
+        writer.add({"id": "9002", "template_title": "Data Analyst", "regionID": "Vaud"})
+        writer.add({"id": "9003", "template_title": "ML Engineer"})
+
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(writer.failed, 1)
+        self.assertEqual(set(Job.objects.values_list("id", flat=True)), {"9001", "9003"})
+
+    def test_unchanged_rows_are_skipped_but_reported_written(self):
+        record = normalizer.normalize_job({"id": "9001", "title": "Data Engineer"})
+        with JobBulkWriter(flush_interval=60) as writer:
+            writer.add(dict(record))
+        # Marks the stored row, so a rewrite would show.
+        Job.objects.filter(id="9001").update(template_lead="Edited in place")
+
+        flushed = []
+        with JobBulkWriter(flush_interval=60, on_flush=flushed.extend) as writer:
+            writer.add(dict(record))
+            writer.add(normalizer.normalize_job({"id": "9002", "title": "Data Analyst"}))
+
+        self.assertEqual(writer.unchanged, 1)
+        self.assertEqual(flushed, ["9001", "9002"])
+        self.assertEqual(Job.objects.get(id="9001").template_lead, "Edited in place")
+        self.assertEqual(Job.objects.get(id="9002").template_title, "Data Analyst")
+
+class SqliteJobWriterTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.db_path = os.path.join(self.tmp_dir, "jobs.db")
+
+    def stored_rows(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT id, template_title FROM jobs ORDER BY id").fetchall()
+        finally:
+            conn.close()
+
+    def test_missing_columns_are_added_when_opened(self):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, template_title TEXT)")
+            conn.execute("INSERT INTO jobs VALUES ('9001', 'Data Engineer')")
+        conn.close()
+
+        SqliteJobWriter(self.db_path).close()
+
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        self.assertEqual({row[1] for row in conn.execute("PRAGMA table_info(jobs)")}, set(JOBS_TABLE_SCHEMA))
+        self.assertEqual(self.stored_rows(), [("9001", "Data Engineer")])
+
+    def test_batches_are_committed_once_and_close_flushes_the_rest(self):
+        writer = SqliteJobWriter(self.db_path, batch_size=2, flush_interval=60)
+        statements = []
+        writer._conn.set_trace_callback(statements.append)
+
+        writer.add({"id": "9001", "template_title": "Data Engineer"})
+        writer.add({"id": "9002", "template_title": "Data Analyst"})
+        writer.add({"id": "9003", "template_title": "ML Engineer"})
+        self.assertEqual(sum(statement.startswith("COMMIT") for statement in statements), 1)
+        self.assertEqual(self.stored_rows(), [("9001", "Data Engineer"), ("9002", "Data Analyst")])
+
+        writer.close()
+        self.assertEqual(sum(statement.startswith("COMMIT") for statement in statements), 2)
+        self.assertEqual(len(self.stored_rows()), 3)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            writer._conn.execute("SELECT 1")
+
+class NormalizerTests(TestCase):
+    def test_compiled_fields_follow_paths_and_fall_back_to_defaults(self):
+        normalize = normalizer.compile_fields((
+            normalizer.Field("city", [("locations", 0, "city")], normalizer.to_text, ""),
+            normalizer.Field("company_id", [("company", "id")], normalizer.to_int, None),
+            normalizer.Field("lead", [("template", "lead"), ("template", "text")], normalizer.combine_html, ""),
+            normalizer.Field("raw", [("raw",)], None, "missing"),
+        ))
+
+        record = normalize({
+            "locations": [{"city": "Lausanne"}],
+            "company": {"id": "42"},
+            "template": {"lead": "<p>Lead &amp; more</p>", "text": "<ul><li>Text</li></ul>"},
+            "raw": None,
+        })
+        self.assertEqual(record, {"city": "Lausanne", "company_id": 42, "lead": "Lead & more\n\nText", "raw": "missing"})
+
+        # Missing containers, empty lists and values of the wrong type all give the default.
+        self.assertEqual(
+            normalize({"locations": [], "company": "Acme", "template": None}),
+            {"city": "", "company_id": None, "lead": "", "raw": "missing"},
+        )
+
+    def test_normalize_job_reads_a_detail_page_payload(self):
+        record = normalizer.normalize_job({
+            "id": "1",
+            "title": "Data Engineer",
+            "skills": ["Python", "SQL"],
+            "regionId": [33],
+            "languageSkills": [{"language": "French", "level": 5}],
+        })
+        self.assertEqual(tuple(record), normalizer.JOB_FIELD_NAMES)
+        self.assertEqual(record["template_title"], "Data Engineer")
+        self.assertEqual(record["skills"], "Python, SQL")
+        self.assertEqual(record["regionID"], 33)
+        self.assertEqual(record["language_skills"], "French (Level 5)")
+        self.assertEqual(record["externalUrl"], "")
+
+    def test_html_to_text_matches_beautifulsoup(self):
+        markup = "<p>Lead &amp; more</p><!-- internal note --><ul><li> One </li><li>Two &lt; three</li></ul>a < b<br/>end"
+        for separator in ("", "\n"):
+            self.assertEqual(normalizer.html_to_text(markup, separator), BeautifulSoup(markup, "html.parser").get_text(separator, strip=True))
+
+    def test_content_hash_only_changes_with_the_normalized_fields(self):
+        record = normalizer.normalize_job({"id": "1", "title": "Data Engineer"})
+        digest = normalizer.compute_content_hash(record)
+
+        self.assertEqual(normalizer.compute_content_hash(dict(reversed(record.items()))), digest)
+        self.assertEqual(normalizer.compute_content_hash({**record, "content_hash": "stale"}), digest)
+        self.assertNotEqual(normalizer.compute_content_hash({**record, "template_title": "Data Scientist"}), digest)
+
+class ParsePoolTests(TestCase):
+    LINK = "https://www.jobup.ch/en/jobs/detail/9101/"
+    PAGE = (
+        b'<script>window.__REACT_QUERY_STATE__ = {"queries": [{"state": {"data": '
+        b'{"id": "9101", "title": "Data Engineer", "template": {"lead": "<p>Build pipelines.</p>"}}}}]};</script>'
+    )
+
+    def setUp(self):
+        self.pool = create_parse_pool(1)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_worker_returns_the_records_of_an_inline_parse(self):
+        records = self.pool.submit(parse_and_clean, self.PAGE, self.LINK).result()
+        self.assertEqual(records, parse_and_clean(self.PAGE, self.LINK))
+        self.assertEqual(records[0]["id"], "9101")
+        self.assertEqual(records[0]["template_lead"], "Build pipelines.")
+
+    def test_page_without_job_data_gives_none(self):
+        self.assertIsNone(self.pool.submit(parse_and_clean, b"<html></html>", self.LINK).result())
+
+class SelectReactQueryStateTests(TestCase):
+    PAGE = (
+        b'<script>var other = {"__REACT_QUERY_STATE__": 1};</script>'
+        b'<script>window.__REACT_QUERY_STATE__ = {"queries": ['
+        b'{"state": {"data": {"id": "1", "title": "Data \\"Engineer\\" {remote}", "company": {"id": 7, "name": "Acme", "logo": "x"},'
+        b' "regionId": undefined, "related": [{"id": "2", "title": "}]"}]}}},'
+        b' {"state": {"data": "not an object"}}'
+        b']};</script>'
+    )
+    SPEC = {"queries": [{"state": {"data": {"id": True, "title": True, "company": {"name": True}, "regionId": True}}}]}
+
+    def test_only_selected_fields_are_decoded(self):
+        state = react_state.select_react_query_state(self.PAGE, self.SPEC)
+        self.assertEqual(state, {"queries": [
+            {"state": {"data": {"id": "1", "title": 'Data "Engineer" {remote}', "company": {"name": "Acme"}, "regionId": None}}},
+            # A value whose type does not match its spec is left out.
+            {"state": {}},
+        ]})
+
+    def test_selection_matches_the_full_decoder(self):
+        data = react_state.extract_react_query_state(self.PAGE)["queries"][0]["state"]["data"]
+        selected = react_state.select_react_query_state(self.PAGE.decode(), self.SPEC)["queries"][0]["state"]["data"]
+        self.assertEqual(selected, {"id": data["id"], "title": data["title"], "company": {"name": "Acme"}, "regionId": data["regionId"]})
+
+    def test_missing_or_truncated_state_returns_none(self):
+        self.assertIsNone(react_state.select_react_query_state(b"<html></html>", self.SPEC))
+        self.assertIsNone(react_state.select_react_query_state(self.PAGE[:self.PAGE.index(b"related")], self.SPEC))
+
+class ValidateJobLinksTests(TestCase):
+    def test_results_keep_the_input_order_within_the_per_host_limit(self):
+        lock = threading.Lock()
+        running = Counter()
+        peak = Counter()
+
+        def check_job_link(session, job_id, link):
+            host = link_checker.link_host(job_id, link)
+            with lock:
+                running[host] += 1
+                peak[host] = max(peak[host], running[host])
+            # Earlier jobs take longer, so checks finish out of order.
+            time.sleep(0.03 - 0.002 * (int(job_id) - 9300))
+            with lock:
+                running[host] -= 1
+            failed = int(job_id) % 2 == 1
+            return link_checker.LinkCheckResult(failed, 404 if failed else 200, link)
+
+        jobs = [(f"{9300 + index}", f"https://{'slow' if index % 3 else 'fast'}.example.com/jobs/{index}") for index in range(12)]
+        with mock.patch.object(link_checker, "check_job_link", check_job_link):
+            results = link_checker.validate_job_links(jobs, max_concurrency=8, max_concurrency_per_host=2)
+
+        self.assertEqual([(result.failed, result.final_url) for result in results], [(int(job_id) % 2 == 1, link) for job_id, link in jobs])
+        self.assertEqual(peak, {"slow.example.com": 2, "fast.example.com": 2})
+
+class RevalidationTtlTests(TestCase):
+    def setUp(self):
+        for name, value in (
+            ("LINK_CHECK_BASE_TTL_HOURS", 24),
+            ("LINK_CHECK_MIN_TTL_HOURS", 6),
+            ("LINK_CHECK_MAX_TTL_HOURS", 168),
+            ("LINK_CHECK_AGE_HALVING_DAYS", 30),
+        ):
+            patcher = mock.patch.object(link_schedule, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_interval_doubles_with_every_success_up_to_the_cap(self):
+        self.assertEqual(link_schedule.revalidation_ttl(1, None), timedelta(hours=24))
+        self.assertEqual(link_schedule.revalidation_ttl(2, None), timedelta(hours=48))
+        self.assertEqual(link_schedule.revalidation_ttl(3, None), timedelta(hours=96))
+        self.assertEqual(link_schedule.revalidation_ttl(4, None), timedelta(hours=168))
+        self.assertEqual(link_schedule.revalidation_ttl(10_000, None), timedelta(hours=168))
+
+    def test_interval_halves_with_the_age_of_the_posting(self):
+        self.assertEqual(link_schedule.revalidation_ttl(2, 30), timedelta(hours=24))
+        self.assertEqual(link_schedule.revalidation_ttl(2, 15), timedelta(hours=48 * 0.5 ** 0.5))
+        self.assertEqual(link_schedule.revalidation_ttl(1, 365), timedelta(hours=6))
+        # A publication date in the future counts as a fresh posting.
+        self.assertEqual(link_schedule.revalidation_ttl(1, -3), timedelta(hours=24))
+
+class ExpiredJobsTests(TestCase):
+    TODAY = date(2026, 10, 18)
+
+    def create_jobs(self, jobs):
+        for job_id, end_date, is_active in jobs:
+            Job.objects.create(id=job_id, externalUrl=f"https://example.com/jobs/{job_id}", publicationEndDate=end_date, isActive=is_active)
+
+    def test_only_end_dates_of_earlier_days_are_expired(self):
+        self.create_jobs([
+            ("9401", "2026-10-17T23:59:59+02:00", True),
+            ("9402", "2026-01-31", True),
+            ("9403", "2026-10-18T00:00:00+00:00", True),
+            ("9404", "2026-10-18", True),
+            ("9405", "2026-11-30T00:00:00+01:00", True),
+            ("9406", "", True),
+            ("9407", None, True),
+            ("9408", "2026-10-17T08:00:00+00:00", False),
+        ])
+        self.assertEqual(sorted(clean_jobs_db.get_expired_ids_orm(self.TODAY)), ["9401", "9402", "9408"])
+
+    def test_inactive_jobs_that_have_not_ended_are_not_expired(self):
+        # A page without `isActive` is stored as inactive, so the flag alone retires nothing.
+        self.create_jobs([("9411", "2026-12-01T00:00:00+00:00", False), ("9412", "", False), ("9413", None, False)])
+        self.assertEqual(clean_jobs_db.get_expired_ids_orm(self.TODAY), [])
+
+    def test_expired_first_checks_the_links_of_the_other_jobs_only(self):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        self.create_jobs([("9421", yesterday, True), ("9422", tomorrow, False), ("9423", "", False), ("9424", tomorrow, True)])
+        checked = []
+
+        def validate_job_links(jobs):
+            checked.extend(job_id for job_id, _ in jobs)
+            return [link_checker.LinkCheckResult(False, 200, link) for _, link in jobs]
+
+        with mock.patch.object(clean_jobs_db, "validate_job_links", validate_job_links):
+            self.assertEqual(clean_jobs_db.get_ids_to_delete_orm(expired_first=True), ["9421"])
+        self.assertEqual(sorted(checked), ["9422", "9423", "9424"])
+
+        # Without `expired_first`, the expired job waits for its link check like the others.
+        checked.clear()
+        LinkCheck.objects.all().delete()
+        with mock.patch.object(clean_jobs_db, "validate_job_links", validate_job_links):
+            self.assertEqual(clean_jobs_db.get_ids_to_delete_orm(expired_first=False), [])
+        self.assertEqual(sorted(checked), ["9421", "9422", "9423", "9424"])
+
+class FakeVectorStore:
+    """
+    Records the batches passed to `delete`, failing every batch that holds one of `bad_ids`.
+    """
+    def __init__(self, bad_ids=()):
+        self.bad_ids = set(bad_ids)
+        self.calls = []
+        self.deleted = []
+
+    def delete(self, ids):
+        self.calls.append(list(ids))
+        if self.bad_ids.intersection(ids):
+            raise ValueError("Could not delete the batch")
+        self.deleted.extend(ids)
+
+class DeleteChromaIdsTests(TestCase):
+    IDS = [f"job-{index}" for index in range(10)]
+
+    def test_ids_are_deleted_with_one_call_per_batch(self):
+        store = FakeVectorStore()
+        self.assertEqual(clean_jobs_db.delete_chroma_ids(store, self.IDS, batch_size=4), [])
+        self.assertEqual(store.calls, [self.IDS[:4], self.IDS[4:8], self.IDS[8:]])
+
+    def test_bad_id_is_isolated_by_bisecting_its_batch(self):
+        store = FakeVectorStore(bad_ids=["job-5"])
+        self.assertEqual(clean_jobs_db.delete_chroma_ids(store, self.IDS, batch_size=8), ["job-5"])
+        self.assertEqual(sorted(store.deleted), sorted(set(self.IDS) - {"job-5"}))
+        # [0-7] fails, [0-3] passes, [4-7] and [4-5] fail, [4] passes, [5] fails, [6-7] and [8-9] pass.
+        self.assertEqual(len(store.calls), 8)
+
+class BulkDeleteTests(TestCase):
+    def create_job(self, job_id, user):
+        job = Job.objects.create(id=job_id, template_title="Data Engineer")
+        LinkCheck.objects.create(job=job, checked_at=timezone.now(), next_check_at=timezone.now())
+        JobMinHash.objects.create(job=job, signature=b"\x00" * 4)
+        JobLshBucket.objects.bulk_create([JobLshBucket(job=job, band=band, bucket=band) for band in range(2)])
+        UserJobFitEvaluation.objects.create(user=user, job=job, llm_score=50, llm_evaluation="Good fit")
+
+    def test_rows_and_their_references_are_deleted_in_chunks(self):
+        user = User.objects.create(username="reader")
+        for job_id in ("8001", "8002", "8003", "8004"):
+            self.create_job(job_id, user)
+
+        params = []
+        def record_params(execute, sql, parameters, many, context):
+            if sql.startswith(("SELECT", "UPDATE", "DELETE")):
+                params.append(len(parameters or ()))
+            return execute(sql, parameters, many, context)
+
+        with connection.execute_wrapper(record_params):
+            deleted, counts = bulk_delete.bulk_delete(Job, ["8001", "8002", "8003", "8002", "9999"], chunk_size=2)
+
+        self.assertEqual(counts, {
+            "job_scraping.Job": 3,
+            "job_scraping.LinkCheck": 3,
+            "job_scraping.JobMinHash": 3,
+            "job_scraping.JobLshBucket": 6,
+            "job_finding_agent.UserJobFitEvaluation": 3,
+        })
+        self.assertEqual(deleted, 18)
+        self.assertLessEqual(max(params), 2)
+        self.assertEqual(list(Job.objects.values_list("id", flat=True)), ["8004"])
+        self.assertEqual(LinkCheck.objects.count(), 1)
+        self.assertEqual(JobLshBucket.objects.count(), 2)
+        self.assertEqual(UserJobFitEvaluation.objects.get().job_id, "8004")
+
+    def test_models_with_delete_receivers_go_through_the_collector(self):
+        self.create_job("8001", User.objects.create(username="reader"))
+        deleted_ids = []
+        def receiver(sender, instance, **kwargs):
+            deleted_ids.append(instance.pk)
+
+        signals.post_delete.connect(receiver, sender=LinkCheck)
+        self.addCleanup(signals.post_delete.disconnect, receiver, sender=LinkCheck)
+        deleted, counts = bulk_delete.bulk_delete(Job, ["8001"])
+
+        self.assertEqual(deleted_ids, ["8001"])
+        self.assertEqual(counts["job_scraping.LinkCheck"], 1)
+        self.assertFalse(Job.objects.exists())
+
+class HostCircuitBreakerTests(TestCase):
+    OUTAGE = link_checker.LinkCheckResult(True, 503, "https://down.example.com/", outage=True)
+    EXPIRED = link_checker.LinkCheckResult(True, 404, "https://down.example.com/", outage=False)
+
+    def test_host_opens_after_threshold_outages_in_a_row(self):
+        breaker = link_checker.HostCircuitBreaker(threshold=2)
+        breaker.record("down.example.com", self.OUTAGE)
+        breaker.record("down.example.com", self.EXPIRED)
+        breaker.record("down.example.com", self.OUTAGE)
+        self.assertFalse(breaker.is_open("down.example.com"))
+
+        breaker.record("down.example.com", self.OUTAGE)
+        self.assertTrue(breaker.is_open("down.example.com"))
+        # Once open, the host stays open for the round.
+        breaker.record("down.example.com", self.EXPIRED)
+        self.assertTrue(breaker.is_open("down.example.com"))
+        self.assertFalse(breaker.is_open("up.example.com"))
+
+    def test_links_on_a_down_host_are_deferred(self):
+        def head(url, **kwargs):
+            if url.startswith("https://down.example.com"):
+                raise requests.ConnectionError("Connection refused")
+            return mock.Mock(url=url, status_code=404 if url.endswith("gone") else 200, is_redirect=False, headers={})
+
+        session = mock.Mock(head=mock.Mock(side_effect=head))
+        jobs = [(str(job_id), f"https://down.example.com/{job_id}") for job_id in range(5)]
+        jobs += [("up", "https://up.example.com/job"), ("gone", "https://up.example.com/gone")]
+        with mock.patch.object(link_checker, "get_session", return_value=session):
+            results = link_checker.validate_job_links(jobs, max_concurrency_per_host=1, breaker_threshold=3)
+
+        self.assertTrue(all(result.deferred and not result.failed for result in results[:5]))
+        self.assertEqual([result.failed for result in results[5:]], [False, True])
+        # The host was given up on after the threshold instead of timing out on every link.
+        self.assertEqual(sum(call.args[0].startswith("https://down.example.com") for call in session.head.call_args_list), 3)
+
+class HttpCacheTests(ScraperTestCase):
+    def test_body_with_commit_key_is_only_unchanged_once_committed(self):
+        url = "https://example.com/page"
+        self.session.pages[url] = b"body"
+
+        self.assertFalse(self.cache.get(self.session, url, commit_key="1").not_modified)
+        # A 304 for an uncommitted body still hands the body back for processing.
+        response = self.cache.get(self.session, url, commit_key="1")
+        self.assertFalse(response.not_modified)
+        self.assertEqual(response.content, b"body")
+
+        self.cache.commit(["1"])
+        self.assertTrue(self.cache.get(self.session, url, commit_key="1").not_modified)
+
+        self.cache.invalidate(["1"])
+        self.assertFalse(self.cache.get(self.session, url, commit_key="1").not_modified)
+
+    def test_body_without_commit_key_is_committed_when_stored(self):
+        url = "https://example.com/page"
+        self.session.pages[url] = b"body"
+        self.cache.get(self.session, url)
+        self.assertTrue(self.cache.get(self.session, url).not_modified)
+
+class BuildRetryTests(TestCase):
+    def test_retry_after_is_capped(self):
+        retry = http_session.build_retry(max_retry_after=30)
+        self.assertEqual(retry.parse_retry_after("3600"), 30)
+        self.assertEqual(retry.parse_retry_after("5"), 5)
+        # The cap survives the copies urllib3 makes on every retry.
+        self.assertEqual(retry.increment("GET", "/").retry_after_max, 30)
+
+    def test_profiles_cap_retry_after(self):
+        session = http_session.build_session(**http_session.SESSION_PROFILES["link_checker"])
+        self.addCleanup(session.close)
+        self.assertEqual(session.get_adapter("https://example.com").max_retries.retry_after_max, 10)
+
+class FetchJobPageTests(ScraperTestCase):
+    def test_page_whose_job_was_not_written_is_processed_again(self):
+        link = build_job_link("1001")
+        self.session.pages[link] = job_page("1001")
+
+        # The first fetch succeeds but its job is never written (e.g. the batch write failed).
+        self.assertEqual(jobs_functions.fetch_job_page(link), job_page("1001"))
+        self.assertEqual(jobs_functions.fetch_job_page(link), job_page("1001"))
+
+        writer = JobBulkWriter(on_flush=commit_cached)
+        self.assertTrue(jobs_functions.scrape_job_link_orm(link, writer))
+        writer.flush()
+        self.assertEqual(Job.objects.get(id="1001").template_title, "Data Engineer")
+        self.assertEqual(jobs_functions.fetch_job_page(link), JOB_NOT_MODIFIED)
+
+    def test_page_of_deleted_job_is_processed_again(self):
+        link = build_job_link("1001")
+        self.session.pages[link] = job_page("1001")
+        writer = JobBulkWriter(on_flush=commit_cached)
+        jobs_functions.scrape_job_link_orm(link, writer)
+        writer.flush()
+
+        Job.objects.filter(id="1001").delete()
+        invalidate_cached(["1001"])
+        self.assertEqual(jobs_functions.fetch_job_page(link), job_page("1001"))
+
+    def test_result_pages_are_not_cached(self):
+        url = build_search_url(1, 3)
+        self.session.pages[url] = listing_page(["1001"])
+        self.assertEqual(jobs_functions.get_listing_page(1, 3)[0], [build_job_link("1001")])
+        self.assertIsNone(self.cache._lookup(url))
+
+class ResumableScrapeTests(ScraperTestCase):
+    def test_listing_failure_leaves_run_open_and_unwritten_jobs_are_retried(self):
+        for job_id in ("2001", "2002", "2003"):
+            self.session.pages[build_job_link(job_id)] = job_page(job_id)
+        self.session.pages[build_search_url(1, 3)] = listing_page(["2001", "2002"])
+        self.session.pages[build_search_url(2, 3)] = requests.ConnectionError("Connection reset by peer")
+
+        write = JobBulkWriter._write
+        def write_failing_2002(writer, rows):
+            if any(row["id"] == "2002" for row in rows):
+                raise DatabaseError("disk I/O error")
+            return write(writer, rows)
+
+        with mock.patch.object(JobBulkWriter, "_write", write_failing_2002):
+            scrape_and_store_jobs_orm(max_pages=5, published_since=3)
+
+        run = ScrapeRun.objects.get()
+        self.assertEqual(run.status, ScrapeRun.STATUS_RUNNING)
+        self.assertEqual(run.pages_done, 1)
+        self.assertEqual(set(Job.objects.values_list("id", flat=True)), {"2001"})
+
+        # Page 2 is back; page 3 is past the end of the results (404).
+        self.session.pages[build_search_url(2, 3)] = listing_page(["2003"])
+        scrape_and_store_jobs_orm(max_pages=5, published_since=3)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, ScrapeRun.STATUS_COMPLETED)
+        self.assertEqual(ScrapeRun.objects.count(), 1)
+        self.assertEqual(set(Job.objects.values_list("id", flat=True)), {"2001", "2002", "2003"})
+
+class FullSweepTests(ScraperTestCase):
+    def test_full_sweep_stops_at_a_repeated_page(self):
+        for job_id in ("3001", "3002"):
+            self.session.pages[build_job_link(job_id)] = job_page(job_id)
+        # Past the last page, the search serves the first page again.
+        for page_number in range(1, 6):
+            self.session.pages[build_search_url(page_number, 3)] = listing_page(["3001", "3002"])
+
+        scrape_and_store_jobs_orm(max_pages=5, published_since=3)
+
+        self.assertTrue(ScrapeWatermark.objects.get().last_full_sweep_at)
+        self.assertIn(build_search_url(2, 3), self.session.requested)
+        self.assertNotIn(build_search_url(3, 3), self.session.requested)
+        self.assertEqual(ScrapeRun.objects.get().status, ScrapeRun.STATUS_COMPLETED)
+
+    def test_full_sweep_refreshes_edited_postings(self):
+        link = build_job_link("4001")
+        self.session.pages[link] = job_page("4001")
+        self.session.pages[build_search_url(1, 3)] = listing_page(["4001"])
+        scrape_and_store_jobs_orm(max_pages=5, published_since=3)
+
+        self.session.pages[link] = job_page("4001", title="Senior Data Engineer")
+        # Between full sweeps, stored jobs are not refetched.
+        scrape_and_store_jobs_orm(max_pages=5, published_since=3)
+        self.assertEqual(Job.objects.get(id="4001").template_title, "Data Engineer")
+
+        ScrapeWatermark.objects.update(last_full_sweep_at=timezone.now() - timedelta(days=7))
+        scrape_and_store_jobs_orm(max_pages=5, published_since=3)
+        self.assertEqual(Job.objects.get(id="4001").template_title, "Senior Data Engineer")
+
+def sitemap(tag, entries):
+    """
+    A gzipped sitemap (`tag="urlset"`) or sitemap index (`tag="sitemapindex"`) of `(loc, lastmod)` entries.
+    """
+    item = "url" if tag == "urlset" else "sitemap"
+    body = "".join(f"<{item}><loc>{loc}</loc><lastmod>{lastmod}</lastmod></{item}>" for loc, lastmod in entries)
+    return gzip.compress(f'<?xml version="1.0" encoding="UTF-8"?><{tag} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</{tag}>'.encode())
+
+class SitemapScrapeTests(AsyncScraperTestCase):
+    JOB_SITEMAP_URL = f"{JOBUP_BASE_URL}/sitemaps/sitemap.job.1.xml.gz"
+
+    def serve_sitemaps(self, lastmods):
+        self.session.pages[SCRAPER_SITEMAP_INDEX_URL] = sitemap("sitemapindex", [(self.JOB_SITEMAP_URL, max(lastmods.values()))])
+        self.session.pages[self.JOB_SITEMAP_URL] = sitemap(
+            "urlset", [(f"{JOBUP_BASE_URL}/de/jobs/detail/{job_id}/", lastmod) for job_id, lastmod in lastmods.items()]
+        )
+
+    def test_refetches_jobs_changed_since_last_run_and_skips_other_regions(self):
+        self.session.pages[build_job_link("5001")] = job_page("5001")
+        self.session.pages[build_job_link("5002")] = job_page("5002", region_id=1)
+        self.serve_sitemaps({"5001": "2026-01-01T00:00:00+00:00", "5002": "2026-01-01T00:00:00+00:00"})
+        scrape_sitemap_jobs_orm()
+
+        self.assertEqual(set(Job.objects.values_list("id", flat=True)), {"5001"})
+        self.assertEqual(ScrapeRun.objects.get(mode="sitemap").status, ScrapeRun.STATUS_COMPLETED)
+
+        self.session.pages[build_job_link("5001")] = job_page("5001", title="Senior Data Engineer")
+        self.serve_sitemaps({"5001": (timezone.now() + timedelta(hours=1)).isoformat(), "5002": "2026-01-01T00:00:00+00:00"})
+        scrape_sitemap_jobs_orm()
+
+        self.assertEqual(Job.objects.get(id="5001").template_title, "Senior Data Engineer")
+        # The out-of-region job is not fetched again while its lastmod does not change.
+        self.assertEqual(self.session.requested.count(build_job_link("5002")), 1)
+        self.assertFalse(Job.objects.filter(id="5002").exists())
+
+    def test_run_with_failed_sitemap_is_not_completed(self):
+        self.session.pages[SCRAPER_SITEMAP_INDEX_URL] = requests.ConnectionError("Connection reset by peer")
+        scrape_sitemap_jobs_orm()
+        self.assertEqual(ScrapeRun.objects.get(mode="sitemap").status, ScrapeRun.STATUS_ABANDONED)
+
+class AssignClustersTests(TestCase):
+    LEAD = "We are looking for an engineer to build and run our data pipelines on a modern cloud stack in Zurich."
+
+    def create_jobs(self, jobs):
+        for job_id, title, lead in jobs:
+            Job.objects.create(id=job_id, template_title=title, template_lead=lead)
+        return [{"id": job_id, "template_title": title, "template_lead": lead} for job_id, title, lead in jobs]
+
+    def test_large_batches_are_looked_up_in_chunks(self):
+        dedup.assign_clusters(self.create_jobs([("6001", "Data Engineer", self.LEAD)]))
+        batch = self.create_jobs([
+            ("6002", "Data Engineer", self.LEAD + " Apply now."),
+            ("6003", "Pastry Chef", "Bake croissants, tarts and bread for our tea room every morning from five."),
+            ("6004", "Pastry Chef", "Bake croissants, tarts and bread for our tea room every morning from five!"),
+        ])
+
+        # Inserts and updates are batched by Django within the backend's limit; lookups and deletes are ours.
+        params = []
+        def record_params(execute, sql, parameters, many, context):
+            if sql.startswith(("SELECT", "DELETE")):
+                params.append(len(parameters or ()))
+            return execute(sql, parameters, many, context)
+
+        with mock.patch.object(dedup, "DELETE_CHUNK_SIZE", 2), connection.execute_wrapper(record_params):
+            clusters = dedup.assign_clusters(batch)
+
+        self.assertEqual(clusters, {"6002": "6001", "6003": "6003", "6004": "6003"})
+        # The batch has 3 * JOB_DEDUP_BANDS buckets; no lookup binds more than a chunk of them.
+        self.assertLessEqual(max(params), 2)
+
+class WorkQueueTests(TestCase):
+    LINKS = [build_job_link(job_id) for job_id in ("7001", "7002", "7003")]
+
+    def test_workers_never_lease_the_same_item(self):
+        first, second = WorkQueue("worker-1"), WorkQueue("worker-2")
+        first.enqueue(self.LINKS)
+
+        self.assertEqual(first.lease(2), self.LINKS[:2])
+        self.assertEqual(second.lease(2), self.LINKS[2:])
+        self.assertEqual(second.lease(2), [])
+        self.assertEqual(first.active_workers(), 2)
+
+    def test_expired_lease_is_leased_again_until_out_of_attempts(self):
+        first, second = WorkQueue("worker-1", max_attempts=2), WorkQueue("worker-2", max_attempts=2)
+        first.enqueue(self.LINKS[:1])
+
+        first.lease()
+        ScrapeWorkItem.objects.update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(second.lease(), self.LINKS[:1])
+        ScrapeWorkItem.objects.update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(first.lease(), [])
+        self.assertEqual(first.outstanding(self.LINKS[:1]), set())
+
+    def test_enqueue_resets_finished_items_but_not_leased_ones(self):
+        queue = WorkQueue("worker-1", max_attempts=1)
+        queue.enqueue(self.LINKS)
+        queue.lease(3)
+        queue.mark_done(self.LINKS[:1])
+        queue.mark_failed(self.LINKS[1])
+
+        queue.enqueue(self.LINKS)
+
+        items = dict(ScrapeWorkItem.objects.values_list("url", "status"))
+        self.assertEqual(items[self.LINKS[0]], ScrapeWorkItem.STATUS_PENDING)
+        self.assertEqual(items[self.LINKS[1]], ScrapeWorkItem.STATUS_PENDING)
+        self.assertEqual(items[self.LINKS[2]], ScrapeWorkItem.STATUS_LEASED)
+        self.assertEqual(WorkQueue("worker-2").lease(3), self.LINKS[:2])
+
+class PageArchiveTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+    def test_archives_appending_to_the_same_segment_record_correct_offsets(self):
+        # Two archives on one directory stand for two worker processes.
+        first, second = PageArchive(self.tmp_dir), PageArchive(self.tmp_dir)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        first.append("8001", "url-1", b"first page")
+        second.append("8002", "url-2", b"second page, a little longer")
+        first.append("8003", "url-3", b"third page")
+
+        for job_id, content in (("8001", b"first page"), ("8002", b"second page, a little longer"), ("8003", b"third page")):
+            self.assertEqual(first.latest(job_id)[2], content)
+
+    def test_full_segment_is_not_appended_to_by_any_archive(self):
+        first, second = PageArchive(self.tmp_dir, segment_bytes=1), PageArchive(self.tmp_dir, segment_bytes=1)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        first.append("8001", "url-1", b"first page")
+        second.append("8002", "url-2", b"second page")
+
+        self.assertEqual(second.latest("8001")[2], b"first page")
+        self.assertEqual(second.latest("8002")[2], b"second page")
+
+class ScrapeWorkerTests(ScraperTestCase):
+    def test_worker_fetches_queued_links_at_the_shared_rate(self):
+        links = [build_job_link(job_id) for job_id in ("7101", "7102", "7103")]
+        for link, job_id in zip(links, ("7101", "7102", "7103")):
+            self.session.pages[link] = job_page(job_id)
+        WorkQueue("discoverer").enqueue(links, ["7101", "7102", "7103"])
+
+        with mock.patch("time.sleep") as sleep:
+            processed = jobs_functions.run_scrape_worker_orm("worker-1", idle_timeout=0, requests_per_second=10)
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(set(Job.objects.values_list("id", flat=True)), {"7101", "7102", "7103"})
+        self.assertEqual(set(ScrapeWorkItem.objects.values_list("status", flat=True)), {ScrapeWorkItem.STATUS_DONE})
+        # Without burst, every request after the first waits for its token.
+        self.assertGreaterEqual(sleep.call_count, 2)
+
+class SeenIndexTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        patcher = mock.patch.object(seen_index, "SEEN_INDEX_DIR", self.tmp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load(self, ids, marker):
+        index = seen_index.load_seen_index("jobs", lambda: ids, lambda: marker)
+        self.addCleanup(index.close)
+        return index
+
+    def test_index_is_rebuilt_after_as_many_deletions_as_insertions(self):
+        self.load(["1", "2", "3"], (3, "3")).close()
+
+        # Same count, different IDs: "3" was deleted and "4" inserted by another code path.
+        index = self.load(["1", "2", "4"], (3, "4"))
+        self.assertIn("4", index)
+        self.assertNotIn("3", index)
+
+    def test_index_kept_in_sync_is_loaded_without_reading_the_ids(self):
+        index = self.load(["1", "2", "3"], (3, "3"))
+        index.record(["4"])
+        index.close()
+        seen_index.forget_seen_ids("jobs", ["2"])
+
+        def load_ids():
+            raise AssertionError("the stored IDs were read")
+
+        index = seen_index.load_seen_index("jobs", load_ids, lambda: (3, "4"))
+        self.addCleanup(index.close)
+        self.assertEqual(len(index), 3)
+        self.assertIn("4", index)
+        self.assertNotIn("2", index)
+
+    def test_forget_removes_base_and_delta_ids(self):
+        index = seen_index.SeenIdIndex.build(os.path.join(self.tmp_dir, "jobs.idx"), ["1", "2"])
+        self.addCleanup(index.close)
+        index.record(["3"])
+        index.add("4")
+        index.forget(["1", "3", "4"])
+
+        self.assertEqual(len(index), 1)
+        self.assertEqual([job_id for job_id in ("1", "2", "3", "4") if job_id in index], ["2"])
+
+    def test_scraped_links_are_checked_against_the_job_table(self):
+        for job_id in ("1", "2"):
+            Job.objects.create(id=job_id)
+        jobs_functions.get_scraped_links_orm().close()
+        Job.objects.create(id="3")
+
+        # A job inserted without `record` is caught by the cheap check.
+        with mock.patch.object(seen_index.SeenIdIndex, "build", wraps=seen_index.SeenIdIndex.build) as build:
+            scraped_links = jobs_functions.get_scraped_links_orm()
+            scraped_links.close()
+            Job.objects.filter(id="1").delete()
+            seen_index.forget_seen_ids("jobs", ["1"])
+            scraped_links = jobs_functions.get_scraped_links_orm()
+        self.addCleanup(scraped_links.close)
+        self.assertEqual(build.call_count, 1)
+        self.assertIn(build_job_link("3"), scraped_links)
+        self.assertNotIn(build_job_link("1"), scraped_links)
+
+    def test_compaction_leaves_no_temporary_file(self):
+        index = seen_index.SeenIdIndex.build(os.path.join(self.tmp_dir, "jobs.idx"), ["1"], compact_threshold=2)
+        self.addCleanup(index.close)
+        index.record(["2", "3"])
+
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["jobs.idx", "jobs.idx.delta"])
+        self.assertEqual(len(index), 3)
+        self.assertIn("3", index)
@@ -0,0 +1,115 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from config.settings import SCRAPER_FULL_SWEEP_HOURS
+from .models import Job, ScrapeWatermark
+
+def parse_publication_date(value):
+    """
+    Parse a Jobup publication date into an aware datetime.
+
+    Args:
+        value (str | None): An ISO 8601 date or datetime, as found in the job data.
+
+    Returns:
+        datetime | None: The date (naive values are taken as UTC), or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+class PublicationWatermark:
+    """
+    Per-query high-water mark of the newest publication date ingested, used to cut
+    pagination short.
+
+    Search results are newest first, so once every posting on a result page was published
+    before the watermark, the following pages only hold postings previous runs already
+    walked past and paginating can stop. The watermark only moves forward when a run
+    completes, and every `full_sweep_hours` a run ignores it and walks the whole
+    `published_since` window again, which picks up anything a cut-short run missed.
+
+    Args:
+        watermark (ScrapeWatermark): The stored watermark of the query.
+        full_sweep (bool): Whether this run is a full sweep that ignores the watermark.
+    """
+    def __init__(self, watermark, full_sweep):
+        self.watermark = watermark
+        self.full_sweep = full_sweep
+        self.newest = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, query, full_sweep_hours=SCRAPER_FULL_SWEEP_HOURS):
+        """
+        Load the watermark of `query` and decide whether this run is a full sweep.
+
+        Args:
+            query (str): Identifies the search query, e.g. its first result page URL.
+            full_sweep_hours (float): Maximum time between two full sweeps.
+
+        Returns:
+            PublicationWatermark: The watermark of the run.
+        """
+        watermark, _ = ScrapeWatermark.objects.get_or_create(query=query)
+        full_sweep = (
+            watermark.newest_publication is None
+            or watermark.last_full_sweep_at is None
+            or watermark.last_full_sweep_at < timezone.now() - timedelta(hours=full_sweep_hours)
+        )
+        if full_sweep:
+            logging.info(f"[PUBLICATION_WATERMARK] Full sweep of {query}.")
+        else:
+            logging.info(f"[PUBLICATION_WATERMARK] Paginating {query} down to watermark {watermark.newest_publication}.")
+        return cls(watermark, full_sweep)
+
+    def page_exhausted(self, publication_dates):
+        """
+        Whether a result page only lists postings older than the watermark.
+
+        Args:
+            publication_dates (list): The publication date of every posting on the page
+                                      (None where the listing did not show it).
+
+        Returns:
+            bool: True if paginating can stop at this page.
+        """
+        if self.full_sweep or not publication_dates or None in publication_dates:
+            return False
+        return max(publication_dates) < self.watermark.newest_publication
+
+    def observe_jobs(self, job_ids):
+        """
+        Track the newest publication date of committed jobs. Meant as an `on_flush` hook of a job writer.
+        """
+        dates = [
+            parse_publication_date(value)
+            for value in Job.objects.filter(id__in=list(job_ids)).values_list("publicationDate", flat=True)
+        ]
+        dates = [date for date in dates if date is not None]
+        if dates:
+            with self._lock:
+                self.newest = max(dates + ([self.newest] if self.newest else []))
+
+    def commit(self):
+        """
+        Advance the stored watermark after a completed run, and record the full sweep.
+        """
+        fields = ["updated_at"]
+        if self.newest and (self.watermark.newest_publication is None or self.newest > self.watermark.newest_publication):
+            self.watermark.newest_publication = self.newest
+            fields.append("newest_publication")
+        if self.full_sweep:
+            self.watermark.last_full_sweep_at = timezone.now()
+            fields.append("last_full_sweep_at")
+        self.watermark.save(update_fields=fields)
+        logging.info(f"[PUBLICATION_WATERMARK] Watermark of {self.watermark.query} is {self.watermark.newest_publication}.")
@@ -0,0 +1,211 @@
+import logging
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from config.settings import SCRAPER_LEASE_SECONDS, SCRAPER_LEASE_BATCH_SIZE, SCRAPER_MAX_LINK_ATTEMPTS
+from .models import ScrapeWorkItem
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    """
+    Work queue of job detail links in the database, shared by distributed scrape workers.
+
+    Workers lease batches of items for `lease_seconds` and must renew the lease with
+    `heartbeat` while they work. Claiming is a conditional UPDATE tagged with a fresh lease
+    token, so it is safe on any database backend (including SQLite, which has no
+    `SELECT ... FOR UPDATE SKIP LOCKED`): two workers never hold the same item. An item
+    whose lease expired is leased again, until it has been leased `max_attempts` times.
+
+    The queue implements the `ScrapeCheckpoint` interface used by `scrape_job_link_orm`
+    (`mark_done`, `mark_jobs_done`, `mark_failed`), so it can take the checkpoint's place.
+
+    Args:
+        worker_id (str, optional): Identifies this worker in leases. Defaults to `<hostname>-<pid>`.
+        lease_seconds (int): Lifetime of a lease.
+        max_attempts (int): Leases after which an item is no longer handed out.
+    """
+    def __init__(self, worker_id=None, lease_seconds=SCRAPER_LEASE_SECONDS, max_attempts=SCRAPER_MAX_LINK_ATTEMPTS):
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _leasable(self, now):
+        return Q(attempts__lt=self.max_attempts) & (
+            Q(status__in=[ScrapeWorkItem.STATUS_PENDING, ScrapeWorkItem.STATUS_FAILED])
+            | Q(status=ScrapeWorkItem.STATUS_LEASED, lease_expires_at__lt=now)
+        )
+
+    def _owned(self):
+        return ScrapeWorkItem.objects.filter(lease_owner=self.worker_id, status=ScrapeWorkItem.STATUS_LEASED)
+
+    def enqueue(self, links, job_ids=None):
+        """
+        Add links to the queue. Links already queued are queued again with their attempts
+        reset when they are finished: done, failed, or out of attempts. Links currently
+        leased, and pending ones with attempts left, are left alone.
+
+        Args:
+            links (list): Job detail links.
+            job_ids (list, optional): The job ID of each link, used to mark items done on write.
+
+        Returns:
+            int: The number of links given.
+        """
+        job_ids = job_ids or [None] * len(links)
+        with transaction.atomic():
+            ScrapeWorkItem.objects.bulk_create(
+                [ScrapeWorkItem(url=link, job_id=job_id) for link, job_id in zip(links, job_ids)],
+                ignore_conflicts=True,
+            )
+            now = timezone.now()
+            ScrapeWorkItem.objects.filter(
+                Q(status__in=[ScrapeWorkItem.STATUS_DONE, ScrapeWorkItem.STATUS_FAILED]) | Q(attempts__gte=self.max_attempts),
+                url__in=list(links),
+            ).exclude(status=ScrapeWorkItem.STATUS_LEASED, lease_expires_at__gte=now).update(
+                status=ScrapeWorkItem.STATUS_PENDING,
+                attempts=0,
+                lease_owner=None,
+                lease_token=None,
+                lease_expires_at=None,
+                last_error=None,
+                updated_at=now,
+            )
+        return len(links)
+
+    def outstanding(self, links):
+        """
+        Return the subset of `links` that is queued and not finished, i.e. will still be fetched by some worker.
+        """
+        return set(
+            ScrapeWorkItem.objects.filter(url__in=list(links), attempts__lt=self.max_attempts)
+            .exclude(status=ScrapeWorkItem.STATUS_DONE)
+            .values_list("url", flat=True)
+        )
+
+    def lease(self, batch_size=SCRAPER_LEASE_BATCH_SIZE):
+        """
+        Lease up to `batch_size` items, oldest first.
+
+        Returns:
+            list: The leased links.
+        """
+        now = timezone.now()
+        candidates = list(
+            ScrapeWorkItem.objects.filter(self._leasable(now)).order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+        if not candidates:
+            return []
+
+        # The leasable condition is checked again by the UPDATE itself, so an item claimed by
+        # another worker between the SELECT and the UPDATE is simply not claimed here.
+        token = uuid.uuid4().hex
+        claimed = ScrapeWorkItem.objects.filter(self._leasable(now), id__in=candidates).update(
+            status=ScrapeWorkItem.STATUS_LEASED,
+            lease_owner=self.worker_id,
+            lease_token=token,
+            lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        links = list(ScrapeWorkItem.objects.filter(lease_token=token).order_by("id").values_list("url", flat=True))
+        logging.info(f"[WORK_QUEUE] Worker {self.worker_id} leased {claimed} of {len(candidates)} candidate items.")
+        return links
+
+    def active_workers(self):
+        """
+        Number of workers holding an unexpired lease, this one included, e.g. to share a
+        request rate between them.
+        """
+        owners = set(
+            ScrapeWorkItem.objects.filter(status=ScrapeWorkItem.STATUS_LEASED, lease_expires_at__gte=timezone.now())
+            .values_list("lease_owner", flat=True)
+            .distinct()
+        )
+        return len(owners | {self.worker_id})
+
+    def heartbeat(self):
+        """
+        Extend the leases held by this worker.
+
+        Returns:
+            int: The number of leases extended.
+        """
+        now = timezone.now()
+        return self._owned().update(lease_expires_at=now + timedelta(seconds=self.lease_seconds), updated_at=now)
+
+    def release(self):
+        """
+        Hand the items still leased by this worker back to the queue, e.g. on shutdown.
+        The attempt they consumed is given back.
+        """
+        released = self._owned().update(
+            status=ScrapeWorkItem.STATUS_PENDING,
+            lease_owner=None,
+            lease_token=None,
+            lease_expires_at=None,
+            attempts=F("attempts") - 1,
+            updated_at=timezone.now(),
+        )
+        if released:
+            logging.info(f"[WORK_QUEUE] Worker {self.worker_id} released {released} unfinished items.")
+        return released
+
+    def mark_done(self, links):
+        """
+        Mark leased links done that needed no write, e.g. pages unchanged since the last fetch.
+        """
+        self._owned().filter(url__in=list(links)).update(status=ScrapeWorkItem.STATUS_DONE, updated_at=timezone.now())
+
+    def mark_jobs_done(self, job_ids):
+        """
+        Mark the leased items of committed jobs done. Meant as the `on_flush` hook of a job writer.
+        """
+        self._owned().filter(job_id__in=list(job_ids)).update(status=ScrapeWorkItem.STATUS_DONE, updated_at=timezone.now())
+
+    def mark_failed(self, link, error=None):
+        """
+        Record a failed attempt for a leased link. It is leased again while it has attempts left.
+        """
+        self._owned().filter(url=link).update(
+            status=ScrapeWorkItem.STATUS_FAILED,
+            lease_owner=None,
+            lease_token=None,
+            lease_expires_at=None,
+            last_error=str(error)[:1000] if error else None,
+            updated_at=timezone.now(),
+        )
+
+    def fail_unfinished(self, links, error=None):
+        """
+        Record a failed attempt for those of `links` still leased by this worker, e.g.
+        processed links whose job could not be written.
+
+        Returns:
+            int: The number of items marked failed.
+        """
+        return self._owned().filter(url__in=list(links)).update(
+            status=ScrapeWorkItem.STATUS_FAILED,
+            lease_owner=None,
+            lease_token=None,
+            lease_expires_at=None,
+            last_error=str(error)[:1000] if error else None,
+            updated_at=timezone.now(),
+        )
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of items per status.
+        """
+        counts = dict.fromkeys([status for status, _ in ScrapeWorkItem.STATUS_CHOICES], 0)
+        for status, count in ScrapeWorkItem.objects.values_list("status").annotate(count=Count("id")):
+            counts[status] = count
+        return counts
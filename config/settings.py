@@ -30,6 +30,88 @@ LOGGING_FILES = {
     "error": os.path.join(LOGGING_DIR, "error.log"),
 }
 
+# Scraper settings
+JOBUP_BASE_URL = os.environ.get("JOBUP_BASE_URL", "https://www.jobup.ch")  # Point at a local fixture server for offline benchmarks
+SCRAPER_PAGE_DELAY = 5  # Seconds the sequential scrapers pause between result pages
+SCRAPER_MAX_CONCURRENCY_PER_HOST = 4  # Maximum simultaneous requests against a single host
+SCRAPER_REQUESTS_PER_SECOND = 2.0  # Sustained request rate allowed per host (token bucket refill rate)
+SCRAPER_BURST = 4  # Token bucket capacity, i.e. requests that may be issued back to back
+SCRAPER_PAGE_WINDOW = 4  # Number of result pages fetched concurrently per discovery round
+SCRAPER_STAGE_WORKERS = {  # Concurrent workers per scraping pipeline stage
+    "fetch": 4,
+    "parse": 2,
+    "write": 1,
+}
+SCRAPER_PARSE_PROCESSES = 0  # Worker processes for the parse stage; 0 parses in threads
+SCRAPER_QUEUE_MAXSIZE = 50  # Capacity of the queues between pipeline stages
+SCRAPER_STATS_INTERVAL = 30  # Seconds between pipeline statistics log lines
+SCRAPER_MAX_LINK_ATTEMPTS = 3  # Failed detail links are retried by resumed runs up to this many attempts
+SCRAPER_RESUME_MAX_AGE_HOURS = 24  # Interrupted runs older than this are abandoned instead of resumed
+SCRAPER_FULL_SWEEP_HOURS = 24  # Paginated runs ignore the publication-date watermark once this long after the last full sweep
+SCRAPER_LEASE_SECONDS = 300  # Lifetime of a distributed worker's lease on work items, extended by heartbeats
+SCRAPER_LEASE_BATCH_SIZE = 20  # Work items leased by a distributed worker at a time
+SCRAPER_WORKER_POLL_INTERVAL = 10  # Seconds an idle distributed worker waits before polling the queue again
+SCRAPER_WORKER_IDLE_TIMEOUT = 120  # Seconds without leasable work after which a distributed worker exits
+SCRAPER_SITEMAP_INDEX_URL = f"{JOBUP_BASE_URL}/sitemaps/sitemap.xml.gz"  # Entry point for sitemap-driven discovery
+SCRAPER_JOB_SITEMAP_PATTERN = r"sitemap\.(job|vacanc)[^/]*\.xml(\.gz)?$"  # Child sitemaps listing job postings
+SCRAPER_REGION_IDS = [33, 34, 40, 42, 52, 57]  # Jobup regions scraped: filter of the paginated search, applied to sitemap discoveries after parsing
+
+# HTTP session settings (shared by the scraper and the link checker)
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
+)
+HTTP_TIMEOUT = 10  # Default timeout in seconds for requests that do not set one
+HTTP_POOL_CONNECTIONS = 50  # Number of per-host connection pools kept alive
+HTTP_POOL_MAXSIZE = 4  # Keep-alive connections per host, unless overridden below
+HTTP_HOST_POOL_SIZES = {
+    f"{JOBUP_BASE_URL}/": 16,
+}
+HTTP_RETRIES = 3  # Retries for connection errors and retryable status codes
+HTTP_BACKOFF_FACTOR = 0.5  # Sleep between retries: backoff_factor * 2 ** (retry - 1)
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_MAX_RETRY_AFTER = 60  # Longest sleep in seconds honoured from a Retry-After header; longer values are capped
+
+# Link checker used to find expired jobs
+CLEAN_EXPIRED_JOBS_FIRST = True  # Retire jobs past their publicationEndDate without checking their link
+LINK_CHECK_CONCURRENCY = 32  # Links checked simultaneously across all hosts
+LINK_CHECK_CONCURRENCY_PER_HOST = 4  # Links checked simultaneously per host; at most HTTP_POOL_MAXSIZE keeps every connection reused
+LINK_CHECK_BASE_TTL_HOURS = 24  # Revalidation interval of a link after its first successful check
+LINK_CHECK_MIN_TTL_HOURS = 6  # Shortest revalidation interval, also the retry delay of failed links
+LINK_CHECK_MAX_TTL_HOURS = 168  # Longest revalidation interval
+LINK_CHECK_AGE_HALVING_DAYS = 30  # The interval halves for every this many days since publication, as older postings expire sooner
+LINK_CHECK_MAX_FAILURES = 1  # Consecutive failed checks after which a job is deleted
+LINK_CHECK_BREAKER_THRESHOLD = 3  # Timeouts, connection errors or 5xx answers in a row after which a host is taken as down and its jobs deferred
+CHROMA_DELETE_BATCH_SIZE = 500  # Embeddings removed from Chroma per delete call when cleaning
+DELETE_CHUNK_SIZE = 500  # Rows deleted per statement and transaction; stays below SQLite's 999 bound variables on old builds
+
+# On-disk conditional-GET cache for scraped pages
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, "http_cache")
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used entries are evicted above this size
+
+# Raw job page archive (zstd-compressed, append-only) used for offline replays
+ARCHIVE_ENABLED = False  # Append every changed job detail page to the archive while scraping
+ARCHIVE_DIR = os.path.join(DATA_DIR, "page_archive")
+ARCHIVE_SEGMENT_BYTES = 256 * 1024 * 1024  # A new segment file is started above this size
+ARCHIVE_COMPRESSION_LEVEL = 10  # zstd level; higher is smaller and slower to write
+
+# Batched database writers used by the scraper
+JOB_WRITER_BATCH_SIZE = 200  # Jobs buffered before a batch is written in one transaction
+JOB_WRITER_FLUSH_INTERVAL = 5  # Seconds after which a partial batch is written anyway
+
+# Persistent index of already-scraped job IDs, checked before fetching a job
+SEEN_INDEX_DIR = os.path.join(DATA_DIR, "seen_ids")
+SEEN_INDEX_COMPACT_THRESHOLD = 50000  # IDs in the append-only delta file before it is merged into the sorted index
+
+# Near-duplicate detection at ingest (MinHash signatures over the title and description, LSH buckets)
+JOB_DEDUP_ENABLED = True
+JOB_DEDUP_NUM_PERM = 128  # MinHash permutations per signature
+JOB_DEDUP_BANDS = 16  # LSH bands; the rows per band are JOB_DEDUP_NUM_PERM / JOB_DEDUP_BANDS
+JOB_DEDUP_SHINGLE_SIZE = 3  # Words per shingle
+JOB_DEDUP_THRESHOLD = 0.8  # Estimated Jaccard similarity from which two postings are near-duplicates
+
 # Add project root to PYTHONPATH
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
@@ -0,0 +1,104 @@
+import sys
+import os
+import argparse
+import glob
+import statistics
+import time
+
+# Add the root directory to PYTHONPATH
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if root_path not in sys.path:
+    sys.path.append(root_path)
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+import django
+django.setup()
+
+from bs4 import BeautifulSoup
+
+from backend.apps.job_scraping.normalizer import normalize_job, html_to_text
+from backend.apps.job_scraping.react_state import extract_react_query_state
+
+def load_records(pages_dir):
+    """
+    Extract the job `data` objects from the recorded pages in `pages_dir`
+    (as saved by `benchmark_react_state.py --record`).
+    """
+    records = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(path, "rb") as f:
+            state = extract_react_query_state(f.read())
+        if not state:
+            continue
+        for query in state.get("queries", []):
+            data = query.get("state", {}).get("data")
+            if isinstance(data, dict) and data.get("id"):
+                records.append(data)
+    return records
+
+def bs4_template(data):
+    """
+    The previous template cleaning: two full BeautifulSoup parses per job.
+    """
+    template = data.get("template") or {}
+    lead = BeautifulSoup(template.get("lead") or "", "html.parser").get_text(strip=True)
+    text = BeautifulSoup(template.get("text") or "", "html.parser").get_text(strip=True)
+    return f"{lead}\n\n{text}".strip()
+
+def fast_template(data):
+    template = data.get("template") or {}
+    lead = html_to_text(template.get("lead"))
+    text = html_to_text(template.get("text"))
+    return f"{lead}\n\n{text}".strip()
+
+def per_record_times(func, records, repeat):
+    """
+    Return the best time in seconds of `func(record)` for every record.
+    """
+    times = []
+    for record in records:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(record)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times.append(best)
+    return times
+
+def benchmark(pages_dir, repeat):
+    """
+    Report the per-record cost of the normalizer and of its HTML stripping against BeautifulSoup.
+    """
+    records = load_records(pages_dir)
+    if not records:
+        print(f"No job records found in the recorded pages (*.html) in {pages_dir}")
+        return
+
+    sizes = [len((r.get("template") or {}).get("lead") or "") + len((r.get("template") or {}).get("text") or "") for r in records]
+    identical = sum(bs4_template(r) == fast_template(r) for r in records)
+
+    results = {
+        "normalize_job": per_record_times(normalize_job, records, repeat),
+        "template html_to_text": per_record_times(fast_template, records, repeat),
+        "template bs4": per_record_times(bs4_template, records, repeat),
+    }
+
+    print(f"Records: {len(records)}, median template HTML size: {statistics.median(sizes) / 1024:.1f} KB")
+    print(f"Template text identical to BeautifulSoup: {identical}/{len(records)}")
+    print(f"{'step':<24}{'median us':>12}{'p99 us':>12}{'records/s':>12}")
+    for name, times in results.items():
+        times = sorted(times)
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        print(f"{name:<24}{statistics.median(times) * 1e6:>12.1f}{p99 * 1e6:>12.1f}{len(times) / sum(times):>12.0f}")
+
+    speedup = statistics.median(results["template bs4"]) / statistics.median(results["template html_to_text"])
+    print(f"HTML stripping speedup over BeautifulSoup: {speedup:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark job record normalization on recorded job pages.")
+    parser.add_argument("pages_dir", help="Directory containing recorded job detail pages (*.html).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per record (best run is reported).")
+    args = parser.parse_args()
+
+    benchmark(args.pages_dir, args.repeat)
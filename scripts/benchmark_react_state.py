@@ -0,0 +1,117 @@
+import sys
+import os
+import argparse
+import glob
+import statistics
+import time
+import tracemalloc
+
+# Add the root directory to PYTHONPATH
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if root_path not in sys.path:
+    sys.path.append(root_path)
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+import django
+django.setup()
+
+from backend.apps.job_scraping.jobs_functions import JOB_STATE_SPEC, clean_json, get_links, parse_react_query_state_bs4
+from backend.apps.job_scraping.http_session import get_session
+from backend.apps.job_scraping.react_state import extract_react_query_state, select_react_query_state
+
+def record_pages(out_dir, count, published_since=3):
+    """
+    Fetch `count` live job detail pages from Jobup and save the raw bytes to `out_dir`.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    session = get_session()
+    saved = 0
+    page_number = 1
+    while saved < count:
+        links = get_links(page_number, published_since)
+        if not links:
+            break
+        for link in links:
+            response = session.get(link)
+            if response.status_code != 200:
+                continue
+            job_id = link.rstrip("/").split("/detail/")[1].split("/")[0]
+            with open(os.path.join(out_dir, f"{job_id}.html"), "wb") as f:
+                f.write(response.content)
+            saved += 1
+            if saved >= count:
+                break
+        page_number += 1
+        time.sleep(5)
+    print(f"Recorded {saved} pages to {out_dir}")
+
+def measure(parse, payload, repeat):
+    """
+    Return (best time in seconds, peak traced memory in bytes, result) for `parse(payload)`.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(payload)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, result
+
+def benchmark(pages_dir, repeat):
+    """
+    Compare the raw byte extractor against the BeautifulSoup path on every recorded page,
+    and the selective decoder against the raw byte extractor (same `clean_json` output).
+    """
+    paths = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    if not paths:
+        print(f"No recorded pages (*.html) found in {pages_dir}")
+        return
+
+    rows = []
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        html = content.decode("utf-8", errors="replace")
+
+        fast_time, fast_peak, fast_result = measure(extract_react_query_state, content, repeat)
+        bs4_time, bs4_peak, bs4_result = measure(lambda text: parse_react_query_state_bs4(text, path), html, repeat)
+        select_time, select_peak, select_result = measure(lambda raw: select_react_query_state(raw, JOB_STATE_SPEC), content, repeat)
+        select_same = fast_result is not None and select_result is not None and clean_json(fast_result, path) == clean_json(select_result, path)
+        rows.append((
+            os.path.basename(path), len(content), fast_time, fast_peak, bs4_time, bs4_peak, fast_result == bs4_result,
+            select_time, select_peak, select_same,
+        ))
+
+    print(f"{'page':<24}{'size KB':>9}{'fast ms':>10}{'fast KB':>10}{'bs4 ms':>10}{'bs4 KB':>10}{'same':>6}{'sel ms':>10}{'sel KB':>10}{'same':>6}")
+    for name, size, fast_time, fast_peak, bs4_time, bs4_peak, same, select_time, select_peak, select_same in rows:
+        print(
+            f"{name[:23]:<24}{size / 1024:>9.1f}{fast_time * 1000:>10.2f}{fast_peak / 1024:>10.1f}{bs4_time * 1000:>10.2f}{bs4_peak / 1024:>10.1f}{str(same):>6}"
+            f"{select_time * 1000:>10.2f}{select_peak / 1024:>10.1f}{str(select_same):>6}"
+        )
+
+    fast_median = statistics.median(row[2] for row in rows)
+    bs4_median = statistics.median(row[4] for row in rows)
+    select_median = statistics.median(row[7] for row in rows)
+    print("=" * 105)
+    print(f"Pages: {len(rows)}, identical results: {sum(row[6] for row in rows)}, identical selective results: {sum(row[9] for row in rows)}")
+    print(f"Median parse time: fast {fast_median * 1000:.2f} ms, bs4 {bs4_median * 1000:.2f} ms ({bs4_median / fast_median:.1f}x)")
+    print(f"Median selective decode time: {select_median * 1000:.2f} ms ({fast_median / select_median:.1f}x faster than fast)")
+    print(
+        f"Median peak memory: fast {statistics.median(row[3] for row in rows) / 1024:.1f} KB, bs4 {statistics.median(row[5] for row in rows) / 1024:.1f} KB, "
+        f"selective {statistics.median(row[8] for row in rows) / 1024:.1f} KB"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark __REACT_QUERY_STATE__ extraction on recorded job pages.")
+    parser.add_argument("pages_dir", help="Directory containing recorded job detail pages (*.html).")
+    parser.add_argument("--record", type=int, default=0, help="Fetch this many live pages into pages_dir before benchmarking.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per page (best run is reported).")
+    args = parser.parse_args()
+
+    if args.record:
+        record_pages(args.pages_dir, args.record)
+    benchmark(args.pages_dir, args.repeat)
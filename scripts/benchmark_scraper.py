@@ -0,0 +1,185 @@
+import sys
+import os
+import argparse
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+# Add the root directory to PYTHONPATH
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if root_path not in sys.path:
+    sys.path.append(root_path)
+
+from scripts.replay_server import FixtureServer, generate_fixtures
+
+class Timings:
+    """
+    Thread-safe collection of latencies, in seconds.
+    """
+    def __init__(self):
+        self.values = []
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        with self._lock:
+            self.values.append(value)
+
+    def percentile(self, p):
+        if not self.values:
+            return 0.0
+        if len(self.values) == 1:
+            return self.values[0]
+        return statistics.quantiles(self.values, n=100, method="inclusive")[p - 1]
+
+def setup_django(work_dir):
+    """
+    Point the scraper at a throwaway database and data directory, then set up Django.
+
+    Must run after JOBUP_BASE_URL is set in the environment and before any scraper module is imported,
+    since those read the settings at import time.
+    """
+    import config.settings as config_settings
+    config_settings.SCRAPER_PAGE_DELAY = 0
+    config_settings.HTTP_CACHE_ENABLED = False
+    config_settings.ARCHIVE_ENABLED = False
+    config_settings.SEEN_INDEX_DIR = os.path.join(work_dir, "seen_ids")
+    config_settings.DATABASES["identifiers"] = os.path.join(work_dir, "identifiers.db")
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import backend.settings as backend_settings
+    backend_settings.DATABASES["default"]["NAME"] = os.path.join(work_dir, "database.db")
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+def instrument(fetch_timings, write_timings):
+    """
+    Record the latency of every response of the shared sessions, and the duration of every job batch write.
+    """
+    from backend.apps.job_scraping.http_session import get_session
+    from backend.apps.job_scraping.job_writers import JobBulkWriter
+
+    for profile in ("scraper", "link_checker"):
+        get_session(profile).hooks["response"].append(lambda response, *args, **kwargs: fetch_timings.add(response.elapsed.total_seconds()))
+
+    write = JobBulkWriter._write
+    def timed_write(self, rows):
+        start = time.perf_counter()
+        try:
+            return write(self, rows)
+        finally:
+            write_timings.add(time.perf_counter() - start)
+    JobBulkWriter._write = timed_write
+
+def run_scrape(mode, max_pages, published_since, throttle):
+    from backend.apps.job_scraping import async_scraping
+    from backend.apps.job_scraping.jobs_functions import scrape_and_store_jobs_orm
+
+    if mode == "sequential":
+        scrape_and_store_jobs_orm(max_pages=max_pages, published_since=published_since)
+    elif mode == "concurrent":
+        async_scraping.scrape_and_store_jobs_orm_concurrent(max_pages=max_pages, published_since=published_since, **throttle)
+    else:
+        async_scraping.scrape_sitemap_jobs_orm(**throttle)
+
+def report(name, elapsed, server, counts_before, fetch_timings, extra=""):
+    requests_made = {kind: count - counts_before.get(kind, 0) for kind, count in server.counts.items() if count - counts_before.get(kind, 0)}
+    print(f"\n{name}: {elapsed:.2f} s {extra}")
+    print(f"  requests: {requests_made}")
+    if fetch_timings.values:
+        print(
+            f"  fetch latency: p50 {fetch_timings.percentile(50) * 1000:.1f} ms, "
+            f"p99 {fetch_timings.percentile(99) * 1000:.1f} ms over {len(fetch_timings.values)} responses"
+        )
+
+def run_benchmark(fixtures_dir, mode, max_pages, published_since, latency, jitter, error_rate, stages, throttle=None):
+    work_dir = tempfile.mkdtemp(prefix="benchmark_scraper_")
+    server = FixtureServer(fixtures_dir, latency=latency, jitter=jitter, error_rate=error_rate)
+    server.start()
+    os.environ["JOBUP_BASE_URL"] = server.base_url
+    try:
+        setup_django(work_dir)
+        fetch_timings = Timings()
+        write_timings = Timings()
+        instrument(fetch_timings, write_timings)
+
+        from backend.apps.job_scraping.models import Job
+        print(f"Replaying {fixtures_dir} from {server.base_url} (latency {latency * 1000:.0f} ms, jitter {jitter * 1000:.0f} ms, error rate {error_rate:.0%})")
+
+        if "scrape" in stages:
+            counts_before = dict(server.counts)
+            start = time.perf_counter()
+            run_scrape(mode, max_pages, published_since, throttle or {})
+            elapsed = time.perf_counter() - start
+            pages = server.counts.get("listing", 0) - counts_before.get("listing", 0)
+            jobs = Job.objects.count()
+            report(
+                f"Scrape ({mode})", elapsed, server, counts_before, fetch_timings,
+                f"- {pages / elapsed:.1f} listing pages/s, {jobs} jobs stored, {jobs / elapsed:.1f} jobs/s",
+            )
+            print(
+                f"  DB writes: {len(write_timings.values)} batches, {sum(write_timings.values):.3f} s total, "
+                f"p99 {write_timings.percentile(99) * 1000:.1f} ms per batch"
+            )
+
+        if "clean" in stages:
+            from backend.apps.job_scraping.clean_jobs_db import get_ids_to_delete_orm
+            fetch_timings.values.clear()
+            counts_before = dict(server.counts)
+            start = time.perf_counter()
+            ids_to_delete = get_ids_to_delete_orm()
+            elapsed = time.perf_counter() - start
+            checked = Job.objects.count()
+            report(
+                "Link check", elapsed, server, counts_before, fetch_timings,
+                f"- {checked / elapsed:.1f} jobs/s, {len(ids_to_delete)} of {checked} to delete",
+            )
+
+        if "industries" in stages:
+            from backend.apps.job_scraping.indentifiers_functions import get_industries
+            fetch_timings.values.clear()
+            counts_before = dict(server.counts)
+            start = time.perf_counter()
+            get_industries()
+            report("Industries", time.perf_counter() - start, server, counts_before, fetch_timings)
+    finally:
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraper end to end against a local fixture server, without network access.")
+    parser.add_argument("--fixtures", help="Fixture directory (see scripts/replay_server.py); synthetic fixtures are generated when omitted.")
+    parser.add_argument("--jobs", type=int, default=400, help="Number of synthetic jobs to generate.")
+    parser.add_argument("--mode", choices=["sequential", "concurrent", "sitemap"], default="sequential")
+    parser.add_argument("--stages", nargs="+", choices=["scrape", "clean", "industries"], default=["scrape", "clean", "industries"])
+    parser.add_argument("--max-pages", type=int, default=100)
+    parser.add_argument("--published-since", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=20, help="Fixed delay added to every response.")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="Maximum random delay added on top of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of responses replaced by a 503.")
+    parser.add_argument("--requests-per-second", type=float, help="Per-host request rate of the concurrent and sitemap modes.")
+    parser.add_argument("--concurrency", type=int, help="Per-host concurrency of the concurrent and sitemap modes.")
+    args = parser.parse_args()
+
+    fixtures_dir = args.fixtures
+    generated_dir = None
+    if not fixtures_dir:
+        fixtures_dir = generated_dir = tempfile.mkdtemp(prefix="scraper_fixtures_")
+        generate_fixtures(fixtures_dir, args.jobs)
+    try:
+        run_benchmark(
+            fixtures_dir, args.mode, args.max_pages, args.published_since,
+            args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, args.stages,
+            throttle={
+                key: value
+                for key, value in (("requests_per_second", args.requests_per_second), ("max_concurrency_per_host", args.concurrency))
+                if value is not None
+            },
+        )
+    finally:
+        if generated_dir:
+            shutil.rmtree(generated_dir, ignore_errors=True)
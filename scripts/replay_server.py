@@ -0,0 +1,323 @@
+import sys
+import os
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Add the root directory to PYTHONPATH
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if root_path not in sys.path:
+    sys.path.append(root_path)
+
+LIVE_BASE_URL = "https://www.jobup.ch"
+JOBS_PER_LISTING_PAGE = 20
+DETAIL_PATH_PATTERN = re.compile(r"^/[a-z]{2}/jobs/detail/([^/]+)/?$")
+LISTING_PATH_PATTERN = re.compile(r"^/[a-z]{2}/jobs/?$")
+EMPTY_LISTING_PAGE = b"<html><body><div>No results</div></body></html>"
+
+# Fixture directory layout:
+#   listing/<page>.html           search results pages (relative job links, as served by Jobup)
+#   detail/<job_id>.html          job detail pages
+#   sitemaps/<name>               sitemap index and child sitemaps (.xml or .xml.gz)
+#   industry/<id>-<lang>.html     industry pages listed in sitemaps/sitemap.industry.xml.gz
+#   dead_links.txt                optional, external URL paths (/ats/<id>) answered with 404
+
+def _gzip(data):
+    return gzip.compress(data, mtime=0)
+
+def _sitemap(urls):
+    entries = "".join(f"<url><loc>{url}</loc><lastmod>2026-10-01T08:00:00+00:00</lastmod></url>" for url in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'.encode()
+
+def generate_fixtures(out_dir, jobs=400, related=20, dead_rate=0.1, seed=1):
+    """
+    Write a synthetic fixture set shaped like the Jobup pages the scraper parses.
+
+    Detail pages carry a `__REACT_QUERY_STATE__` with the job and a related-jobs block,
+    listing pages link `JOBS_PER_LISTING_PAGE` jobs each (newest first, with publication
+    dates in their state), and external application URLs point at `/ats/<id>` on the
+    fixture server itself, a share `dead_rate` of them being dead.
+    """
+    rng = random.Random(seed)
+    for sub in ("listing", "detail", "sitemaps", "industry"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    job_ids = [f"{100000 + i}" for i in range(jobs)]
+    dead = []
+    for n, job_id in enumerate(job_ids):
+        published = f"2026-10-{1 + (jobs - n) * 14 // jobs:02d}T08:00:00+00:00"
+        external_url = "" if n % 10 == 0 else f"{LIVE_BASE_URL}/ats/{job_id}"
+        if external_url and rng.random() < dead_rate:
+            dead.append(f"/ats/{job_id}")
+        data = {
+            "id": job_id,
+            "title": f"Software Engineer {job_id}",
+            "company": {"id": 1000 + n % 50, "name": f"Company {n % 50}"},
+            "applicationOptions": {"externalUrl": external_url},
+            "contacts": [{"firstName": "Anna", "lastName": "Muster"}],
+            "locations": [{"postalCode": "1003", "city": "Lausanne", "cantonCode": "VD", "countryCode": "CH"}],
+            "template": {"lead": "<p>Join <b>our</b> team &amp; grow.</p>", "text": "<ul><li>Python</li><li>SQL</li></ul>" * 20},
+            "skills": ["python", "sql"],
+            "languageSkills": [{"language": "fr", "level": 4}],
+            "employmentGrades": [80, 100],
+            "employmentPositionIds": [3],
+            "employmentTypeIds": [5],
+            "industry": 1 + n % 5,
+            "regionId": 33,
+            "publicationDate": published,
+            "initialPublicationDate": published,
+            "publicationEndDate": "2026-12-31T08:00:00+00:00",
+            "isActive": True,
+            "isPaid": False,
+            "headhunterApplicationAllowed": False,
+            "synonym": "developer",
+            "logo": "",
+        }
+        related_jobs = [{"id": f"r{i}", "title": "Related job " * 5, "template": {"text": "Lorem ipsum " * 100}} for i in range(related)]
+        state = {"queries": [
+            {"state": {"data": data, "status": "success"}, "queryKey": ["vacancy", job_id]},
+            {"state": {"data": {"documents": related_jobs}}, "queryKey": ["related"]},
+        ]}
+        page = f"<html><head><title>{data['title']}</title></head><body><div id='app'></div><script>window.__REACT_QUERY_STATE__ = {json.dumps(state)};</script></body></html>"
+        with open(os.path.join(out_dir, "detail", f"{job_id}.html"), "w", encoding="utf-8") as f:
+            f.write(page)
+
+    # Listing pages, newest first.
+    for page_number, start in enumerate(range(0, jobs, JOBS_PER_LISTING_PAGE), start=1):
+        page_ids = list(reversed(job_ids))[start:start + JOBS_PER_LISTING_PAGE]
+        links = "".join(f'<a data-cy="job-link" href="/en/jobs/detail/{job_id}/?source=vacancy_search">Job</a>' for job_id in page_ids)
+        documents = [{"id": job_id, "publicationDate": f"2026-10-{1 + (jobs - int(job_id) + 100000) * 14 // jobs:02d}T08:00:00+00:00"} for job_id in page_ids]
+        state = json.dumps({"queries": [{"state": {"data": {"documents": documents}}}]})
+        with open(os.path.join(out_dir, "listing", f"{page_number}.html"), "w", encoding="utf-8") as f:
+            f.write(f"<html><body>{links}<script>window.__REACT_QUERY_STATE__ = {state};</script></body></html>")
+
+    # Sitemaps: an index with one job sitemap, and the industry sitemap.
+    job_sitemap = _sitemap(f"{LIVE_BASE_URL}/en/jobs/detail/{job_id}/" for job_id in job_ids)
+    with open(os.path.join(out_dir, "sitemaps", "sitemap.job.1.xml.gz"), "wb") as f:
+        f.write(_gzip(job_sitemap))
+    index = (
+        '<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"<sitemap><loc>{LIVE_BASE_URL}/sitemaps/sitemap.job.1.xml.gz</loc><lastmod>2026-10-01T08:00:00+00:00</lastmod></sitemap>"
+        "</sitemapindex>"
+    ).encode()
+    with open(os.path.join(out_dir, "sitemaps", "sitemap.xml.gz"), "wb") as f:
+        f.write(_gzip(index))
+
+    industry_urls = []
+    for industry_id in range(1, 6):
+        for lang in ("en", "fr"):
+            industry_urls.append(f"{LIVE_BASE_URL}/{lang}/jobs/?industry={industry_id}")
+            with open(os.path.join(out_dir, "industry", f"{industry_id}-{lang}.html"), "w", encoding="utf-8") as f:
+                f.write(f'<html><head><title>Jobs in "Industry {industry_id} {lang}" | jobup.ch</title></head><body></body></html>')
+    with open(os.path.join(out_dir, "sitemaps", "sitemap.industry.xml.gz"), "wb") as f:
+        f.write(_gzip(_sitemap(industry_urls)))
+
+    with open(os.path.join(out_dir, "dead_links.txt"), "w") as f:
+        f.write("\n".join(dead))
+    print(f"Generated {jobs} jobs, {len(range(0, jobs, JOBS_PER_LISTING_PAGE))} listing pages and {len(dead)} dead external links in {out_dir}")
+
+def record_fixtures(out_dir, pages=5, published_since=3):
+    """
+    Record live listing pages, their job detail pages and the sitemaps into `out_dir`.
+    """
+    from backend.apps.job_scraping.http_session import get_session
+
+    session = get_session()
+    for sub in ("listing", "detail", "sitemaps"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    for page_number in range(1, pages + 1):
+        url = (
+            f"{LIVE_BASE_URL}/en/jobs/?page={page_number}&publication-date={published_since}"
+            "&region=33&region=34&region=40&region=42&region=52&region=57&term="
+        )
+        response = session.get(url)
+        if response.status_code != 200:
+            break
+        with open(os.path.join(out_dir, "listing", f"{page_number}.html"), "wb") as f:
+            f.write(response.content)
+        for job_id in dict.fromkeys(re.findall(rb'href="/[a-z]{2}/jobs/detail/([^/"?]+)', response.content)):
+            detail = session.get(f"{LIVE_BASE_URL}/en/jobs/detail/{job_id.decode()}/")
+            if detail.status_code == 200:
+                with open(os.path.join(out_dir, "detail", f"{job_id.decode()}.html"), "wb") as f:
+                    f.write(detail.content)
+        time.sleep(5)
+
+    for name in ("sitemap.xml.gz", "sitemap.industry.xml.gz"):
+        response = session.get(f"{LIVE_BASE_URL}/sitemaps/{name}")
+        if response.status_code == 200:
+            with open(os.path.join(out_dir, "sitemaps", name), "wb") as f:
+                f.write(response.content)
+    print(f"Recorded fixtures to {out_dir}")
+
+class FixtureServer:
+    """
+    Local HTTP server replaying a fixture directory in place of Jobup, for offline benchmarks.
+
+    Absolute Jobup URLs inside the served bodies (sitemaps, external links) are rewritten
+    to the server's own base URL. Every response can be delayed by `latency` seconds plus up
+    to `jitter` seconds, and a share `error_rate` of responses is replaced by a 503.
+
+    Args:
+        fixtures_dir (str): The fixture directory (see the layout above).
+        latency (float): Fixed delay added to every response, in seconds.
+        jitter (float): Maximum random delay added on top of `latency`, in seconds.
+        error_rate (float): Share of requests answered with 503 Service Unavailable.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free port.
+    """
+    def __init__(self, fixtures_dir, latency=0.0, jitter=0.0, error_rate=0.0, host="127.0.0.1", port=0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+        self._bodies = {}
+
+        dead_path = os.path.join(fixtures_dir, "dead_links.txt")
+        self.dead_links = set()
+        if os.path.exists(dead_path):
+            with open(dead_path) as f:
+                self.dead_links = {line.strip() for line in f if line.strip()}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_HEAD(self):
+                self._respond(head=True)
+
+            def do_GET(self):
+                self._respond(head=False)
+
+            def _respond(self, head):
+                kind, status, body, content_type = server.resolve(self.path)
+                server.record(kind)
+                delay = server.latency + (server._random.random() * server.jitter if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                if server.error_rate and server._random.random() < server.error_rate:
+                    status, body, content_type = 503, b"Service Unavailable", "text/plain"
+                    server.record("error")
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+        return Handler
+
+    def record(self, kind):
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def _read(self, *parts):
+        """
+        Read a fixture file, with Jobup URLs rewritten to the server's base URL. Cached in memory.
+        """
+        path = os.path.join(self.fixtures_dir, *parts)
+        if path not in self._bodies:
+            if not os.path.isfile(path):
+                self._bodies[path] = None
+            else:
+                with open(path, "rb") as f:
+                    body = f.read()
+                if path.endswith(".gz"):
+                    body = _gzip(gzip.decompress(body).replace(LIVE_BASE_URL.encode(), self.base_url.encode()))
+                else:
+                    body = body.replace(LIVE_BASE_URL.encode(), self.base_url.encode())
+                self._bodies[path] = body
+        return self._bodies[path]
+
+    def resolve(self, raw_path):
+        """
+        Map a request path to `(kind, status, body, content_type)`.
+        """
+        url = urlparse(raw_path)
+        query = parse_qs(url.query)
+
+        match = DETAIL_PATH_PATTERN.match(url.path)
+        if match:
+            body = self._read("detail", f"{match.group(1)}.html")
+            return ("detail", 200, body, "text/html") if body is not None else ("detail", 404, b"Not Found", "text/html")
+
+        if LISTING_PATH_PATTERN.match(url.path):
+            if "industry" in query:
+                lang = url.path.strip("/").split("/")[0]
+                body = self._read("industry", f"{query['industry'][0]}-{lang}.html")
+                return ("industry", 200, body, "text/html") if body is not None else ("industry", 404, b"Not Found", "text/html")
+            page_number = query.get("page", ["1"])[0]
+            body = self._read("listing", f"{page_number}.html")
+            return "listing", 200, body if body is not None else EMPTY_LISTING_PAGE, "text/html"
+
+        if url.path.startswith("/sitemaps/"):
+            body = self._read("sitemaps", os.path.basename(url.path))
+            content_type = "application/gzip" if url.path.endswith(".gz") else "application/xml"
+            return ("sitemap", 200, body, content_type) if body is not None else ("sitemap", 404, b"Not Found", "text/plain")
+
+        if url.path.startswith("/ats/"):
+            status = 404 if url.path in self.dead_links else 200
+            return "external", status, b"<html></html>", "text/html"
+
+        return "other", 404, b"Not Found", "text/plain"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded or generated Jobup fixtures on a local HTTP server.")
+    parser.add_argument("fixtures_dir", help="Fixture directory (listing/, detail/, sitemaps/, industry/).")
+    parser.add_argument("--generate", type=int, default=0, help="Generate this many synthetic jobs into fixtures_dir first.")
+    parser.add_argument("--record", type=int, default=0, help="Record this many live listing pages (and their jobs) first.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fixed delay added to every response.")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Maximum random delay added on top of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of responses replaced by a 503.")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_fixtures(args.fixtures_dir, args.generate)
+    if args.record:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+        record_fixtures(args.fixtures_dir, args.record)
+
+    server = FixtureServer(args.fixtures_dir, args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, port=args.port)
+    print(f"Serving {args.fixtures_dir} on {server.base_url} (set JOBUP_BASE_URL={server.base_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()